@@ -0,0 +1,74 @@
+"""add priority to summaries
+
+Revision ID: 3b7c1d2e4f60
+Revises: 9e2f6f4a1a2b
+Create Date: 2026-10-19 10:00:00.000000
+"""
+
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "3b7c1d2e4f60"
+down_revision: Union[str, Sequence[str], None] = "9e2f6f4a1a2b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Scoring as of this revision (app.tasks.priority), frozen so later changes
+# there don't alter what this migration does; legacy Chinese labels included
+_CATEGORY_BONUS_HOURS = {
+    "AI/ML": 12, "AI/机器学习": 12, "Security": 12, "安全": 12,
+    "Engineering": 6, "工程": 6, "Systems": 6, "系统": 6, "Web": 6, "Web开发": 6,
+    "Science": 3, "科学": 3, "Business": 3, "商业": 3,
+}
+_SOURCE_TYPE_BONUS_HOURS = {
+    "Company Tech Blog": 6, "公司技术博客": 6,
+    "Research Institution": 6, "研究机构": 6,
+    "Personal Blog": 3, "个人博客": 3,
+}
+
+
+def _bonus_case(column: str, bonuses: dict, prefix: str) -> tuple[str, dict]:
+    whens, params = [], {}
+    for i, (label, hours) in enumerate(bonuses.items()):
+        whens.append(f"WHEN :{prefix}_label_{i} THEN {hours}")
+        params[f"{prefix}_label_{i}"] = label
+    return f"(CASE {column} {' '.join(whens)} ELSE 0 END)", params
+
+
+def upgrade() -> None:
+    op.add_column(
+        "summaries",
+        sa.Column("priority", sa.Float(), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_summaries_status_priority", "summaries", ["status", "priority"])
+
+    # Score the existing backlog so it drains newest-first: hours since epoch
+    # of the publish (else ingest) time, clamped to now, plus bonuses
+    conn = op.get_bind()
+    reference = "COALESCE(a.published_at, a.created_at)"
+    if conn.dialect.name == "postgresql":
+        hours = f"LEAST(EXTRACT(EPOCH FROM {reference}) / 3600, :now_hours)"
+    else:
+        hours = f"MIN((julianday({reference}) - 2440587.5) * 24, :now_hours)"
+    category, category_params = _bonus_case("f.category", _CATEGORY_BONUS_HOURS, "category")
+    source_type, source_params = _bonus_case("f.source_type", _SOURCE_TYPE_BONUS_HOURS, "source")
+    now_hours = (datetime.utcnow() - datetime(1970, 1, 1)).total_seconds() / 3600
+    conn.execute(sa.text(f"""
+        UPDATE summaries SET priority = (
+            SELECT COALESCE({hours}, :now_hours) + {category} + {source_type}
+            FROM articles a JOIN feeds f ON f.id = a.feed_id
+            WHERE a.id = summaries.article_id
+        )
+        WHERE status = 'pending'
+          AND EXISTS (SELECT 1 FROM articles a WHERE a.id = summaries.article_id)
+    """), {"now_hours": now_hours, **category_params, **source_params})
+
+
+def downgrade() -> None:
+    op.drop_index("ix_summaries_status_priority", table_name="summaries")
+    op.drop_column("summaries", "priority")
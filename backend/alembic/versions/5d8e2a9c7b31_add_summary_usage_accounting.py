@@ -0,0 +1,42 @@
+"""add usage accounting to summaries
+
+Revision ID: 5d8e2a9c7b31
+Revises: 3b7c1d2e4f60
+Create Date: 2026-10-19 11:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "5d8e2a9c7b31"
+down_revision: Union[str, Sequence[str], None] = "3b7c1d2e4f60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INTEGER_COLUMNS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_read_tokens",
+    "cache_write_tokens",
+    "latency_ms",
+    "attempts",
+)
+
+
+def upgrade() -> None:
+    for name in INTEGER_COLUMNS:
+        op.add_column("summaries", sa.Column(name, sa.Integer(), nullable=True))
+    op.add_column("summaries", sa.Column("cost_usd", sa.Float(), nullable=True))
+    op.add_column("summaries", sa.Column("processed_at", sa.DateTime(), nullable=True))
+    op.create_index(op.f("ix_summaries_processed_at"), "summaries", ["processed_at"])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_summaries_processed_at"), table_name="summaries")
+    op.drop_column("summaries", "processed_at")
+    op.drop_column("summaries", "cost_usd")
+    for name in reversed(INTEGER_COLUMNS):
+        op.drop_column("summaries", name)
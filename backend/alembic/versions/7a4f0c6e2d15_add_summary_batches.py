@@ -0,0 +1,53 @@
+"""add summary_batches for provider batch backfill
+
+Revision ID: 7a4f0c6e2d15
+Revises: 5d8e2a9c7b31
+Create Date: 2026-10-19 12:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "7a4f0c6e2d15"
+down_revision: Union[str, Sequence[str], None] = "5d8e2a9c7b31"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "summary_batches",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("provider_batch_id", sa.String(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("request_count", sa.Integer(), nullable=True),
+        sa.Column("succeeded", sa.Integer(), nullable=True),
+        sa.Column("errored", sa.Integer(), nullable=True),
+        sa.Column("error", sa.Text(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("submitted_at", sa.DateTime(), nullable=True),
+        sa.Column("collected_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("provider_batch_id"),
+    )
+    op.create_index(op.f("ix_summary_batches_status"), "summary_batches", ["status"])
+
+    with op.batch_alter_table("summaries") as batch_op:
+        batch_op.add_column(sa.Column("batch_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key(
+            "fk_summaries_batch_id", "summary_batches", ["batch_id"], ["id"]
+        )
+        batch_op.create_index(op.f("ix_summaries_batch_id"), ["batch_id"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("summaries") as batch_op:
+        batch_op.drop_index(op.f("ix_summaries_batch_id"))
+        batch_op.drop_constraint("fk_summaries_batch_id", type_="foreignkey")
+        batch_op.drop_column("batch_id")
+
+    op.drop_index(op.f("ix_summary_batches_status"), table_name="summary_batches")
+    op.drop_table("summary_batches")
@@ -0,0 +1,282 @@
+"""move article content into compressed article_bodies
+
+Revision ID: a7c3e9f1b5d4
+Revises: f2b6d8e4a0c3
+Create Date: 2026-10-19 17:00:00.000000
+"""
+
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "a7c3e9f1b5d4"
+down_revision: Union[str, Sequence[str], None] = "f2b6d8e4a0c3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COPY_CHUNK = 500
+ZLIB_LEVEL = 6
+
+articles = sa.table("articles", sa.column("id", sa.Integer), sa.column("content", sa.Text))
+article_bodies = sa.table(
+    "article_bodies", sa.column("article_id", sa.Integer), sa.column("codec", sa.String),
+    sa.column("data", sa.LargeBinary), sa.column("size", sa.Integer),
+)
+
+# app.utils.compression and the search index (app.core.fts) as of this
+# revision, frozen here so later changes to either don't alter the migration
+
+_SQLITE_KEYWORDS = (
+    "CASE WHEN json_valid({ref}.keywords) "
+    "THEN (SELECT group_concat(value, ' ') FROM json_each({ref}.keywords)) END"
+)
+
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    "title, content, summary_cn, one_liner, keywords, tokenize='trigram')",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title) VALUES (new.id, new.title);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title ON articles BEGIN
+        UPDATE articles_fts SET title = new.title WHERE rowid = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        DELETE FROM articles_fts WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS summaries_fts_ai AFTER INSERT ON summaries BEGIN
+        UPDATE articles_fts SET summary_cn = new.summary_cn, one_liner = new.one_liner,
+            keywords = {_SQLITE_KEYWORDS.format(ref="new")}
+        WHERE rowid = new.article_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS summaries_fts_au AFTER UPDATE OF summary_cn, one_liner, keywords ON summaries BEGIN
+        UPDATE articles_fts SET summary_cn = new.summary_cn, one_liner = new.one_liner,
+            keywords = {_SQLITE_KEYWORDS.format(ref="new")}
+        WHERE rowid = new.article_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS summaries_fts_ad AFTER DELETE ON summaries BEGIN
+        UPDATE articles_fts SET summary_cn = NULL, one_liner = NULL, keywords = NULL
+        WHERE rowid = old.article_id;
+    END""",
+]
+
+SQLITE_FTS_BACKFILL = f"""
+INSERT INTO articles_fts(rowid, title, summary_cn, one_liner, keywords)
+SELECT a.id, a.title, s.summary_cn, s.one_liner, {_SQLITE_KEYWORDS.format(ref="s")}
+FROM articles a LEFT JOIN summaries s ON s.article_id = a.id
+"""
+
+SQLITE_FTS_INDEX_BODY = "UPDATE articles_fts SET content = :content WHERE rowid = :article_id"
+
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS summaries_fts_ad",
+    "DROP TRIGGER IF EXISTS summaries_fts_au",
+    "DROP TRIGGER IF EXISTS summaries_fts_ai",
+    "DROP TRIGGER IF EXISTS articles_fts_ad",
+    "DROP TRIGGER IF EXISTS articles_fts_au",
+    "DROP TRIGGER IF EXISTS articles_fts_ai",
+    "DROP TABLE IF EXISTS articles_fts",
+]
+
+# Hiragana/katakana, CJK ideographs and Hangul; each character becomes a token
+CJK_CLASS = r"[぀-ヿ㐀-䶿一-鿿가-힯]"
+
+_PG_ARTICLE_TRIGGER = """CREATE OR REPLACE FUNCTION articles_search_vector_trigger() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        summary_text text;
+        one_liner_text text;
+        keyword_list json;
+        body_vector tsvector;
+    BEGIN
+        SELECT summary_cn, one_liner, keywords INTO summary_text, one_liner_text, keyword_list
+        FROM summaries WHERE article_id = NEW.id;
+        {body_lookup}
+        NEW.search_vector := article_search_vector(NEW.title, summary_text, one_liner_text, keyword_list)
+            || coalesce(body_vector, ''::tsvector);
+        RETURN NEW;
+    END $$"""
+
+POSTGRES_FTS_DDL = [
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    f"""CREATE OR REPLACE FUNCTION cjk_spaced(value text) RETURNS text
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT regexp_replace(coalesce(value, ''), '({CJK_CLASS})', ' \\1 ', 'g')
+        $$""",
+    """CREATE OR REPLACE FUNCTION article_search_vector(
+            title text, summary_cn text, one_liner text, keywords json
+        ) RETURNS tsvector LANGUAGE sql IMMUTABLE AS $$
+            SELECT setweight(to_tsvector('simple', cjk_spaced(title)), 'A')
+                || setweight(to_tsvector('simple', cjk_spaced(
+                    (SELECT string_agg(k, ' ') FROM json_array_elements_text(keywords) AS k))), 'A')
+                || setweight(to_tsvector('simple', cjk_spaced(summary_cn)), 'B')
+                || setweight(to_tsvector('simple', cjk_spaced(one_liner)), 'B')
+        $$""",
+    _PG_ARTICLE_TRIGGER.format(body_lookup=""),
+    """CREATE OR REPLACE FUNCTION summaries_search_vector_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE target integer;
+        BEGIN
+            target := CASE WHEN TG_OP = 'DELETE' THEN OLD.article_id ELSE NEW.article_id END;
+            -- Re-running the articles trigger recomputes the vector with the new summary
+            UPDATE articles SET title = title WHERE id = target;
+            RETURN NULL;
+        END $$""",
+    "DROP TRIGGER IF EXISTS articles_search_vector_update ON articles",
+    """CREATE TRIGGER articles_search_vector_update
+        BEFORE INSERT OR UPDATE OF title ON articles
+        FOR EACH ROW EXECUTE FUNCTION articles_search_vector_trigger()""",
+    "DROP TRIGGER IF EXISTS summaries_search_vector_update ON summaries",
+    """CREATE TRIGGER summaries_search_vector_update
+        AFTER INSERT OR DELETE OR UPDATE OF summary_cn, one_liner, keywords ON summaries
+        FOR EACH ROW EXECUTE FUNCTION summaries_search_vector_trigger()""",
+    "CREATE INDEX IF NOT EXISTS ix_articles_search_vector ON articles USING gin (search_vector)",
+]
+
+# Once article_bodies exists: its own vector, set by index_body(), joins the article's
+POSTGRES_BODY_FTS_DDL = [
+    "ALTER TABLE article_bodies ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    _PG_ARTICLE_TRIGGER.format(
+        body_lookup="SELECT search_vector INTO body_vector FROM article_bodies WHERE article_id = NEW.id;"
+    ),
+    """CREATE OR REPLACE FUNCTION bodies_search_vector_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE target integer;
+        BEGIN
+            target := CASE WHEN TG_OP = 'DELETE' THEN OLD.article_id ELSE NEW.article_id END;
+            UPDATE articles SET title = title WHERE id = target;
+            RETURN NULL;
+        END $$""",
+    "DROP TRIGGER IF EXISTS bodies_search_vector_update ON article_bodies",
+    """CREATE TRIGGER bodies_search_vector_update
+        AFTER DELETE OR UPDATE OF search_vector ON article_bodies
+        FOR EACH ROW EXECUTE FUNCTION bodies_search_vector_trigger()""",
+]
+
+POSTGRES_FTS_INDEX_BODY = (
+    "UPDATE article_bodies SET search_vector = "
+    "setweight(to_tsvector('simple', cjk_spaced(left(:content, 100000))), 'D') "
+    "WHERE article_id = :article_id"
+)
+
+# Touching title fires the BEFORE UPDATE trigger, which computes the vector
+POSTGRES_FTS_BACKFILL = "UPDATE articles SET title = title"
+
+POSTGRES_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS bodies_search_vector_update ON article_bodies",
+    "DROP TRIGGER IF EXISTS summaries_search_vector_update ON summaries",
+    "DROP TRIGGER IF EXISTS articles_search_vector_update ON articles",
+    "DROP FUNCTION IF EXISTS bodies_search_vector_trigger()",
+    "DROP FUNCTION IF EXISTS summaries_search_vector_trigger()",
+    "DROP FUNCTION IF EXISTS articles_search_vector_trigger()",
+    "DROP INDEX IF EXISTS ix_articles_search_vector",
+    "ALTER TABLE articles DROP COLUMN IF EXISTS search_vector",
+    "ALTER TABLE IF EXISTS article_bodies DROP COLUMN IF EXISTS search_vector",
+    "DROP FUNCTION IF EXISTS article_search_vector(text, text, text, json)",
+    "DROP FUNCTION IF EXISTS cjk_spaced(text)",
+]
+
+
+def _compress(text: str) -> tuple[str, bytes]:
+    raw = text.encode("utf-8")
+    packed = zlib.compress(raw, ZLIB_LEVEL)
+    if len(packed) < len(raw):
+        return "zlib", packed
+    return "raw", raw
+
+
+def _decompress(codec: str, payload: bytes) -> str:
+    if codec == "zlib":
+        return zlib.decompress(payload).decode("utf-8")
+    return bytes(payload).decode("utf-8")
+
+
+def _drop_index(conn) -> None:
+    for ddl in {"sqlite": SQLITE_FTS_DROP, "postgresql": POSTGRES_FTS_DROP}.get(conn.dialect.name, []):
+        conn.exec_driver_sql(ddl)
+
+
+def _install_index(conn, with_bodies: bool) -> None:
+    """Create the index and fill it from existing rows, bodies decompressed here"""
+    dialect = conn.dialect.name
+    if dialect == "sqlite":
+        statements = SQLITE_FTS_DDL + [SQLITE_FTS_BACKFILL]
+        index_body = SQLITE_FTS_INDEX_BODY
+    elif dialect == "postgresql":
+        statements = POSTGRES_FTS_DDL + (POSTGRES_BODY_FTS_DDL if with_bodies else []) + [POSTGRES_FTS_BACKFILL]
+        index_body = POSTGRES_FTS_INDEX_BODY
+    else:
+        return
+    for ddl in statements:
+        conn.exec_driver_sql(ddl)
+    if not with_bodies:
+        return
+    result = conn.execute(sa.select(article_bodies.c.article_id, article_bodies.c.codec, article_bodies.c.data))
+    while chunk := result.fetchmany(COPY_CHUNK):
+        for article_id, codec, data in chunk:
+            conn.execute(sa.text(index_body), {"article_id": article_id, "content": _decompress(codec, data)})
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # The search triggers read articles.content; rebuilt from the bodies below
+    _drop_index(conn)
+    if conn.dialect.name == "postgresql":
+        # Signature used before bodies existed (content was an argument)
+        op.execute("DROP FUNCTION IF EXISTS article_search_vector(text, text, text, text, json)")
+
+    op.create_table(
+        "article_bodies",
+        sa.Column("article_id", sa.Integer(), nullable=False),
+        sa.Column("codec", sa.String(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("size", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["article_id"], ["articles.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("article_id"),
+    )
+    if conn.dialect.name == "postgresql":
+        # Already compressed; TOAST compressing it again only costs CPU
+        op.execute("ALTER TABLE article_bodies ALTER COLUMN data SET STORAGE EXTERNAL")
+
+    result = conn.execute(
+        sa.select(articles.c.id, articles.c.content).where(articles.c.content.isnot(None))
+    )
+    while chunk := result.fetchmany(COPY_CHUNK):
+        rows = []
+        for article_id, content in chunk:
+            codec, data = _compress(content)
+            rows.append({"article_id": article_id, "codec": codec, "data": data,
+                         "size": len(content.encode("utf-8"))})
+        conn.execute(article_bodies.insert(), rows)
+
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.drop_column("content")
+
+    _install_index(conn, with_bodies=True)
+
+    if conn.dialect.name == "sqlite":
+        # Give the freed pages back to the filesystem
+        with op.get_context().autocommit_block():
+            op.execute("VACUUM")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    _drop_index(conn)
+
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.add_column(sa.Column("content", sa.Text(), nullable=True))
+
+    result = conn.execute(sa.select(article_bodies.c.article_id, article_bodies.c.codec, article_bodies.c.data))
+    while chunk := result.fetchmany(COPY_CHUNK):
+        for article_id, codec, data in chunk:
+            conn.execute(
+                articles.update().where(articles.c.id == article_id)
+                .values(content=_decompress(codec, data))
+            )
+
+    op.drop_table("article_bodies")
+    # Titles, summaries and keywords only: this index has no article-text trigger
+    _install_index(conn, with_bodies=False)
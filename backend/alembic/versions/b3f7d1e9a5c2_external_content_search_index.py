@@ -0,0 +1,191 @@
+"""make the SQLite search index external-content over the compressed bodies
+
+The FTS5 table kept its own uncompressed copy of every body, several times
+the size of article_bodies. It now indexes the view articles_fts_source,
+which decompresses bodies through the article_body_text() SQL function
+(a Python function every SQLite connection registers, see app.core.fts).
+PostgreSQL only stores a tsvector and is left alone.
+
+Revision ID: b3f7d1e9a5c2
+Revises: f3b9d5e7a1c6
+Create Date: 2026-10-20 09:00:00.000000
+"""
+
+import json
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b3f7d1e9a5c2"
+down_revision: Union[str, Sequence[str], None] = "f3b9d5e7a1c6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COPY_CHUNK = 500
+
+# The index as of app.core.fts at this revision, frozen here
+
+# SQL functions the view reads through, registered in upgrade()
+SQLITE_BODY_FUNCTION = "article_body_text"
+SQLITE_KEYWORDS_FUNCTION = "article_keywords_text"
+
+# What articles_fts indexes, one row per article; read back for snippets
+SQLITE_FTS_SOURCE = f"""CREATE VIEW IF NOT EXISTS articles_fts_source AS
+SELECT a.id AS id, a.title AS title, {SQLITE_BODY_FUNCTION}(b.codec, b.data) AS content,
+    s.summary_cn AS summary_cn, s.one_liner AS one_liner, {SQLITE_KEYWORDS_FUNCTION}(s.keywords) AS keywords
+FROM articles a
+LEFT JOIN article_bodies b ON b.article_id = a.id
+LEFT JOIN summaries s ON s.article_id = a.id"""
+
+_SQLITE_FTS_INSERT = (
+    "INSERT INTO articles_fts(rowid, title, content, summary_cn, one_liner, keywords) "
+    "SELECT id, title, content, summary_cn, one_liner, keywords FROM articles_fts_source WHERE id = {ref};"
+)
+# External content: removing a row takes the values it was indexed with
+_SQLITE_FTS_DELETE = (
+    "INSERT INTO articles_fts(articles_fts, rowid, title, content, summary_cn, one_liner, keywords) "
+    "SELECT 'delete', id, title, content, summary_cn, one_liner, keywords FROM articles_fts_source WHERE id = {ref};"
+)
+
+# (trigger name, timing and event, statement) for every write that changes a source row
+_SQLITE_FTS_TRIGGERS = [
+    ("articles_fts_ai", "AFTER INSERT ON articles", _SQLITE_FTS_INSERT.format(ref="new.id")),
+    ("articles_fts_bu", "BEFORE UPDATE OF title ON articles", _SQLITE_FTS_DELETE.format(ref="old.id")),
+    ("articles_fts_au", "AFTER UPDATE OF title ON articles", _SQLITE_FTS_INSERT.format(ref="new.id")),
+    ("articles_fts_bd", "BEFORE DELETE ON articles", _SQLITE_FTS_DELETE.format(ref="old.id")),
+    ("bodies_fts_bi", "BEFORE INSERT ON article_bodies", _SQLITE_FTS_DELETE.format(ref="new.article_id")),
+    ("bodies_fts_ai", "AFTER INSERT ON article_bodies", _SQLITE_FTS_INSERT.format(ref="new.article_id")),
+    ("bodies_fts_bu", "BEFORE UPDATE OF codec, data ON article_bodies", _SQLITE_FTS_DELETE.format(ref="old.article_id")),
+    ("bodies_fts_au", "AFTER UPDATE OF codec, data ON article_bodies", _SQLITE_FTS_INSERT.format(ref="new.article_id")),
+    ("bodies_fts_bd", "BEFORE DELETE ON article_bodies", _SQLITE_FTS_DELETE.format(ref="old.article_id")),
+    ("bodies_fts_ad", "AFTER DELETE ON article_bodies", _SQLITE_FTS_INSERT.format(ref="old.article_id")),
+    ("summaries_fts_bi", "BEFORE INSERT ON summaries", _SQLITE_FTS_DELETE.format(ref="new.article_id")),
+    ("summaries_fts_ai", "AFTER INSERT ON summaries", _SQLITE_FTS_INSERT.format(ref="new.article_id")),
+    ("summaries_fts_bu", "BEFORE UPDATE OF summary_cn, one_liner, keywords ON summaries",
+     _SQLITE_FTS_DELETE.format(ref="old.article_id")),
+    ("summaries_fts_au", "AFTER UPDATE OF summary_cn, one_liner, keywords ON summaries",
+     _SQLITE_FTS_INSERT.format(ref="new.article_id")),
+    ("summaries_fts_bd", "BEFORE DELETE ON summaries", _SQLITE_FTS_DELETE.format(ref="old.article_id")),
+    ("summaries_fts_ad", "AFTER DELETE ON summaries", _SQLITE_FTS_INSERT.format(ref="old.article_id")),
+]
+
+SQLITE_FTS_DDL = [
+    SQLITE_FTS_SOURCE,
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    "title, content, summary_cn, one_liner, keywords, "
+    "content='articles_fts_source', content_rowid='id', tokenize='trigram')",
+] + [
+    f"CREATE TRIGGER IF NOT EXISTS {name} {when} BEGIN\n    {statement}\nEND"
+    for name, when, statement in _SQLITE_FTS_TRIGGERS
+]
+
+SQLITE_FTS_BACKFILL = "INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')"
+
+SQLITE_FTS_DROP = [f"DROP TRIGGER IF EXISTS {name}" for name, _, _ in reversed(_SQLITE_FTS_TRIGGERS)] + [
+    "DROP TABLE IF EXISTS articles_fts",
+    "DROP VIEW IF EXISTS articles_fts_source",
+]
+
+# The previous revision's index, an ordinary FTS5 table fed bodies from Python
+
+_SQLITE_KEYWORDS = (
+    "CASE WHEN json_valid({ref}.keywords) "
+    "THEN (SELECT group_concat(value, ' ') FROM json_each({ref}.keywords)) END"
+)
+
+OLD_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    "title, content, summary_cn, one_liner, keywords, tokenize='trigram')",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title) VALUES (new.id, new.title);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title ON articles BEGIN
+        UPDATE articles_fts SET title = new.title WHERE rowid = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        DELETE FROM articles_fts WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS summaries_fts_ai AFTER INSERT ON summaries BEGIN
+        UPDATE articles_fts SET summary_cn = new.summary_cn, one_liner = new.one_liner,
+            keywords = {_SQLITE_KEYWORDS.format(ref="new")}
+        WHERE rowid = new.article_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS summaries_fts_au AFTER UPDATE OF summary_cn, one_liner, keywords ON summaries BEGIN
+        UPDATE articles_fts SET summary_cn = new.summary_cn, one_liner = new.one_liner,
+            keywords = {_SQLITE_KEYWORDS.format(ref="new")}
+        WHERE rowid = new.article_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS summaries_fts_ad AFTER DELETE ON summaries BEGIN
+        UPDATE articles_fts SET summary_cn = NULL, one_liner = NULL, keywords = NULL
+        WHERE rowid = old.article_id;
+    END""",
+]
+
+OLD_FTS_BACKFILL = f"""
+INSERT INTO articles_fts(rowid, title, summary_cn, one_liner, keywords)
+SELECT a.id, a.title, s.summary_cn, s.one_liner, {_SQLITE_KEYWORDS.format(ref="s")}
+FROM articles a LEFT JOIN summaries s ON s.article_id = a.id
+"""
+
+OLD_FTS_INDEX_BODY = "UPDATE articles_fts SET content = :content WHERE rowid = :article_id"
+
+OLD_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS summaries_fts_ad",
+    "DROP TRIGGER IF EXISTS summaries_fts_au",
+    "DROP TRIGGER IF EXISTS summaries_fts_ai",
+    "DROP TRIGGER IF EXISTS articles_fts_ad",
+    "DROP TRIGGER IF EXISTS articles_fts_au",
+    "DROP TRIGGER IF EXISTS articles_fts_ai",
+    "DROP TABLE IF EXISTS articles_fts",
+]
+
+
+def _body_text(codec, data):
+    if data is None:
+        return None
+    if codec == "zlib":
+        return zlib.decompress(data).decode("utf-8")
+    return bytes(data).decode("utf-8")
+
+
+def _keywords_text(value):
+    try:
+        keywords = json.loads(value) if value else None
+    except ValueError:
+        return None
+    return " ".join(map(str, keywords)) if isinstance(keywords, list) else None
+
+
+def _execute_all(conn, statements) -> None:
+    for ddl in statements:
+        conn.exec_driver_sql(ddl)
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "sqlite":
+        return
+    # alembic/env.py registers them too; the triggers below can't run without them
+    driver = conn.connection.driver_connection
+    driver.create_function(SQLITE_BODY_FUNCTION, 2, _body_text, deterministic=True)
+    driver.create_function(SQLITE_KEYWORDS_FUNCTION, 1, _keywords_text, deterministic=True)
+    _execute_all(conn, OLD_FTS_DROP)
+    _execute_all(conn, SQLITE_FTS_DDL + [SQLITE_FTS_BACKFILL])
+    # Give the dropped copy's pages back to the filesystem
+    with op.get_context().autocommit_block():
+        op.execute("VACUUM")
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    if conn.dialect.name != "sqlite":
+        return
+    _execute_all(conn, SQLITE_FTS_DROP)
+    _execute_all(conn, OLD_FTS_DDL + [OLD_FTS_BACKFILL])
+    result = conn.execute(sa.text("SELECT article_id, codec, data FROM article_bodies"))
+    while chunk := result.fetchmany(COPY_CHUNK):
+        for article_id, codec, data in chunk:
+            conn.execute(sa.text(OLD_FTS_INDEX_BODY), {"article_id": article_id, "content": _body_text(codec, data)})
@@ -0,0 +1,70 @@
+"""add archive tables for retention and switch SQLite to incremental auto_vacuum
+
+Revision ID: b8d4f0a2c6e1
+Revises: a7c3e9f1b5d4
+Create Date: 2026-10-19 18:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "b8d4f0a2c6e1"
+down_revision: Union[str, Sequence[str], None] = "a7c3e9f1b5d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "archived_articles",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("content_hash", sa.String(), nullable=False),
+        sa.Column("url", sa.String(), nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("author", sa.String(), nullable=True),
+        sa.Column("language", sa.String(), nullable=True),
+        sa.Column("published_at", sa.DateTime(), nullable=True),
+        sa.Column("feed_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("body_codec", sa.String(), nullable=True),
+        sa.Column("body_data", sa.LargeBinary(), nullable=True),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(op.f("ix_archived_articles_content_hash"), "archived_articles", ["content_hash"])
+    op.create_table(
+        "archived_summaries",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("article_id", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("triage", sa.String(), nullable=True),
+        sa.Column("triage_reason", sa.String(), nullable=True),
+        sa.Column("summary_cn", sa.Text(), nullable=True),
+        sa.Column("one_liner", sa.String(), nullable=True),
+        sa.Column("keywords", sa.JSON(), nullable=True),
+        sa.Column("model_version", sa.String(), nullable=True),
+        sa.Column("input_tokens", sa.Integer(), nullable=True),
+        sa.Column("output_tokens", sa.Integer(), nullable=True),
+        sa.Column("cost_usd", sa.Float(), nullable=True),
+        sa.Column("processed_at", sa.DateTime(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("article_id"),
+    )
+
+    conn = op.get_bind()
+    if conn.dialect.name == "sqlite" and conn.exec_driver_sql("PRAGMA auto_vacuum").scalar() != 2:
+        # auto_vacuum only changes through a full VACUUM; after this one,
+        # retention releases pages with incremental_vacuum instead
+        with op.get_context().autocommit_block():
+            op.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            op.execute("VACUUM")
+
+
+def downgrade() -> None:
+    op.drop_table("archived_summaries")
+    op.drop_index(op.f("ix_archived_articles_content_hash"), table_name="archived_articles")
+    op.drop_table("archived_articles")
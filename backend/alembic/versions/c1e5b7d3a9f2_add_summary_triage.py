@@ -0,0 +1,33 @@
+"""add ingest triage route to summaries
+
+Revision ID: c1e5b7d3a9f2
+Revises: 7a4f0c6e2d15
+Create Date: 2026-10-19 13:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c1e5b7d3a9f2"
+down_revision: Union[str, Sequence[str], None] = "7a4f0c6e2d15"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "summaries",
+        sa.Column("triage", sa.String(), nullable=True, server_default="summarize"),
+    )
+    op.add_column("summaries", sa.Column("triage_reason", sa.String(), nullable=True))
+    # Duplicate-URL lookup during triage
+    op.create_index(op.f("ix_articles_url"), "articles", ["url"])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_articles_url"), table_name="articles")
+    op.drop_column("summaries", "triage_reason")
+    op.drop_column("summaries", "triage")
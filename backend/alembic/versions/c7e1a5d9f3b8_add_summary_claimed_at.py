@@ -0,0 +1,79 @@
+"""track realtime claims in summaries.claimed_at, and stop bumping the generation on claims
+
+Revision ID: c7e1a5d9f3b8
+Revises: b3f7d1e9a5c2
+Create Date: 2026-10-20 09:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c7e1a5d9f3b8"
+down_revision: Union[str, Sequence[str], None] = "b3f7d1e9a5c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BUMP = "UPDATE stats_counters SET ingest_generation = ingest_generation + 1 WHERE id = 1"
+_IN_FLIGHT = "'pending', 'batched'"
+
+# Frozen copies of app.core.counters at this revision and the previous one
+_SQLITE_TRIGGER = f"""CREATE TRIGGER stats_generation_summaries_au AFTER UPDATE OF status ON summaries
+    WHEN old.status IS NOT new.status
+        AND NOT (old.status IN ({_IN_FLIGHT}) AND new.status IN ({_IN_FLIGHT})) BEGIN
+    {_BUMP};
+END"""
+_SQLITE_PREVIOUS_TRIGGER = f"""CREATE TRIGGER stats_generation_summaries_au AFTER UPDATE OF status ON summaries
+    WHEN old.status IS NOT new.status BEGIN
+    {_BUMP};
+END"""
+
+_POSTGRES_FUNCTION = f"""CREATE OR REPLACE FUNCTION stats_generation_summaries_trigger() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM old_rows JOIN new_rows ON new_rows.id = old_rows.id
+            WHERE old_rows.status IS DISTINCT FROM new_rows.status
+              AND NOT (old_rows.status IN ({_IN_FLIGHT}) AND new_rows.status IN ({_IN_FLIGHT}))
+        ) THEN
+            {_BUMP};
+        END IF;
+        RETURN NULL;
+    END $$"""
+_POSTGRES_TRIGGER = """CREATE TRIGGER stats_generation_summaries AFTER UPDATE ON summaries
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_generation_summaries_trigger()"""
+_POSTGRES_PREVIOUS_TRIGGER = """CREATE TRIGGER stats_generation_summaries AFTER UPDATE OF status ON summaries
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_generation_trigger()"""
+
+# Realtime claims in flight: status "batched" without a provider batch
+_REALTIME_CLAIMS = "status = 'batched' AND batch_id IS NULL"
+
+
+def _replace_trigger(sqlite_trigger: str, postgres_trigger: str, postgres_function: str = None) -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "sqlite":
+        op.execute("DROP TRIGGER IF EXISTS stats_generation_summaries_au")
+        op.execute(sqlite_trigger)
+    elif dialect == "postgresql":
+        if postgres_function:
+            op.execute(postgres_function)
+        op.execute("DROP TRIGGER IF EXISTS stats_generation_summaries ON summaries")
+        op.execute(postgres_trigger)
+
+
+def upgrade() -> None:
+    op.add_column("summaries", sa.Column("claimed_at", sa.DateTime(), nullable=True))
+    # Claims used to be stamped in processed_at, counting them as processed
+    op.execute(f"UPDATE summaries SET claimed_at = processed_at, processed_at = NULL WHERE {_REALTIME_CLAIMS}")
+    _replace_trigger(_SQLITE_TRIGGER, _POSTGRES_TRIGGER, _POSTGRES_FUNCTION)
+
+
+def downgrade() -> None:
+    _replace_trigger(_SQLITE_PREVIOUS_TRIGGER, _POSTGRES_PREVIOUS_TRIGGER)
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("DROP FUNCTION IF EXISTS stats_generation_summaries_trigger()")
+    op.execute(f"UPDATE summaries SET processed_at = claimed_at WHERE {_REALTIME_CLAIMS}")
+    op.drop_column("summaries", "claimed_at")
@@ -0,0 +1,53 @@
+"""add trigger-maintained stats counters and hourly article buckets
+
+Revision ID: c9e5a1b3d7f2
+Revises: b8d4f0a2c6e1
+Create Date: 2026-10-19 19:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "c9e5a1b3d7f2"
+down_revision: Union[str, Sequence[str], None] = "b8d4f0a2c6e1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    from app.core.counters import install_counters
+
+    op.create_table(
+        "stats_counters",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("total_feeds", sa.Integer(), nullable=False),
+        sa.Column("active_feeds", sa.Integer(), nullable=False),
+        sa.Column("total_articles", sa.Integer(), nullable=False),
+        sa.Column("summaries_pending", sa.Integer(), nullable=False),
+        sa.Column("summaries_batched", sa.Integer(), nullable=False),
+        sa.Column("summaries_completed", sa.Integer(), nullable=False),
+        sa.Column("summaries_failed", sa.Integer(), nullable=False),
+        sa.Column("summaries_skipped", sa.Integer(), nullable=False),
+        sa.Column("last_fetch_at", sa.DateTime(), nullable=True),
+        sa.Column("reconciled_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_table(
+        "article_hourly_counts",
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("hour"),
+    )
+    # Creates the triggers and seeds both tables from existing rows
+    install_counters(op.get_bind())
+
+
+def downgrade() -> None:
+    from app.core.counters import drop_counters
+
+    drop_counters(op.get_bind())
+    op.drop_table("article_hourly_counts")
+    op.drop_table("stats_counters")
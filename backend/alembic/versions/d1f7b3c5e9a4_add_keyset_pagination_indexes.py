@@ -0,0 +1,32 @@
+"""extend the published_at indexes with id for keyset pagination
+
+Revision ID: d1f7b3c5e9a4
+Revises: c9e5a1b3d7f2
+Create Date: 2026-10-19 20:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d1f7b3c5e9a4"
+down_revision: Union[str, Sequence[str], None] = "c9e5a1b3d7f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # (published_at, id) seeks need id in the key; SQLite has it as the rowid, PostgreSQL does not
+    op.create_index("ix_articles_published_at_id", "articles", ["published_at", "id"])
+    op.create_index("ix_articles_feed_id_published_at_id", "articles", ["feed_id", "published_at", "id"])
+    op.drop_index("ix_articles_feed_id_published_at", table_name="articles")
+    op.drop_index("ix_articles_published_at", table_name="articles")
+
+
+def downgrade() -> None:
+    op.create_index("ix_articles_published_at", "articles", ["published_at"])
+    op.create_index("ix_articles_feed_id_published_at", "articles", ["feed_id", "published_at"])
+    op.drop_index("ix_articles_feed_id_published_at_id", table_name="articles")
+    op.drop_index("ix_articles_published_at_id", table_name="articles")
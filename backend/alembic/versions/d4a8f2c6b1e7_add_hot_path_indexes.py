@@ -0,0 +1,48 @@
+"""add indexes for article listing, latest, stats and the pending queue
+
+Revision ID: d4a8f2c6b1e7
+Revises: c1e5b7d3a9f2
+Create Date: 2026-10-19 14:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "d4a8f2c6b1e7"
+down_revision: Union[str, Sequence[str], None] = "c1e5b7d3a9f2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING = sa.text("status = 'pending'")
+
+
+def upgrade() -> None:
+    op.create_index(op.f("ix_articles_published_at"), "articles", ["published_at"])
+    op.create_index("ix_articles_feed_id_published_at", "articles", ["feed_id", "published_at"])
+    op.create_index(op.f("ix_feeds_category"), "feeds", ["category"])
+    op.create_index(op.f("ix_summaries_status"), "summaries", ["status"])
+
+    # Replaced by a partial index that only holds the pending queue
+    op.drop_index("ix_summaries_status_priority", table_name="summaries")
+    op.create_index(
+        "ix_summaries_pending_priority",
+        "summaries",
+        [sa.text("priority DESC"), "id"],
+        sqlite_where=PENDING,
+        postgresql_where=PENDING,
+    )
+
+    # Without statistics SQLite prefers the plain status index over the partial one
+    op.execute("ANALYZE")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_summaries_pending_priority", table_name="summaries")
+    op.create_index("ix_summaries_status_priority", "summaries", ["status", "priority"])
+    op.drop_index(op.f("ix_summaries_status"), table_name="summaries")
+    op.drop_index(op.f("ix_feeds_category"), table_name="feeds")
+    op.drop_index("ix_articles_feed_id_published_at", table_name="articles")
+    op.drop_index(op.f("ix_articles_published_at"), table_name="articles")
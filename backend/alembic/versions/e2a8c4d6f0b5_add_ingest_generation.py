@@ -0,0 +1,39 @@
+"""add ingest_generation to stats_counters for cached listing totals
+
+Revision ID: e2a8c4d6f0b5
+Revises: d1f7b3c5e9a4
+Create Date: 2026-10-19 21:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "e2a8c4d6f0b5"
+down_revision: Union[str, Sequence[str], None] = "d1f7b3c5e9a4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    from app.core.counters import install_generation
+
+    op.add_column(
+        "stats_counters",
+        sa.Column("ingest_generation", sa.BigInteger(), server_default="0", nullable=False),
+    )
+    install_generation(op.get_bind())
+
+
+def downgrade() -> None:
+    from app.core.counters import drop_counters, drop_generation, install_counters
+
+    bind = op.get_bind()
+    drop_generation(bind)
+    # SQLite rebuilds the table, which its triggers reference
+    drop_counters(bind)
+    with op.batch_alter_table("stats_counters") as batch_op:
+        batch_op.drop_column("ingest_generation")
+    install_counters(bind, reconcile=False)
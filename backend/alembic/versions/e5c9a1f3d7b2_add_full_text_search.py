@@ -0,0 +1,151 @@
+"""add full-text search index (FTS5 on SQLite, tsvector + GIN on PostgreSQL)
+
+Revision ID: e5c9a1f3d7b2
+Revises: d4a8f2c6b1e7
+Create Date: 2026-10-19 15:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "e5c9a1f3d7b2"
+down_revision: Union[str, Sequence[str], None] = "d4a8f2c6b1e7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The index as of this revision (articles.content still exists); frozen here
+# because app.core.fts has moved on since
+
+_SQLITE_KEYWORDS = (
+    "CASE WHEN json_valid({ref}.keywords) "
+    "THEN (SELECT group_concat(value, ' ') FROM json_each({ref}.keywords)) END"
+)
+
+SQLITE_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    "title, content, summary_cn, one_liner, keywords, tokenize='trigram')",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, content) VALUES (new.id, new.title, new.content);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE OF title, content ON articles BEGIN
+        UPDATE articles_fts SET title = new.title, content = new.content WHERE rowid = new.id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        DELETE FROM articles_fts WHERE rowid = old.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS summaries_fts_ai AFTER INSERT ON summaries BEGIN
+        UPDATE articles_fts SET summary_cn = new.summary_cn, one_liner = new.one_liner,
+            keywords = {_SQLITE_KEYWORDS.format(ref="new")}
+        WHERE rowid = new.article_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS summaries_fts_au AFTER UPDATE OF summary_cn, one_liner, keywords ON summaries BEGIN
+        UPDATE articles_fts SET summary_cn = new.summary_cn, one_liner = new.one_liner,
+            keywords = {_SQLITE_KEYWORDS.format(ref="new")}
+        WHERE rowid = new.article_id;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS summaries_fts_ad AFTER DELETE ON summaries BEGIN
+        UPDATE articles_fts SET summary_cn = NULL, one_liner = NULL, keywords = NULL
+        WHERE rowid = old.article_id;
+    END""",
+]
+
+SQLITE_FTS_BACKFILL = f"""
+INSERT INTO articles_fts(rowid, title, content, summary_cn, one_liner, keywords)
+SELECT a.id, a.title, a.content, s.summary_cn, s.one_liner, {_SQLITE_KEYWORDS.format(ref="s")}
+FROM articles a LEFT JOIN summaries s ON s.article_id = a.id
+"""
+
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS summaries_fts_ad",
+    "DROP TRIGGER IF EXISTS summaries_fts_au",
+    "DROP TRIGGER IF EXISTS summaries_fts_ai",
+    "DROP TRIGGER IF EXISTS articles_fts_ad",
+    "DROP TRIGGER IF EXISTS articles_fts_au",
+    "DROP TRIGGER IF EXISTS articles_fts_ai",
+    "DROP TABLE IF EXISTS articles_fts",
+]
+
+# Hiragana/katakana, CJK ideographs and Hangul; each character becomes a token
+CJK_CLASS = r"[぀-ヿ㐀-䶿一-鿿가-힯]"
+
+POSTGRES_FTS_DDL = [
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    f"""CREATE OR REPLACE FUNCTION cjk_spaced(value text) RETURNS text
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT regexp_replace(coalesce(value, ''), '({CJK_CLASS})', ' \\1 ', 'g')
+        $$""",
+    """CREATE OR REPLACE FUNCTION article_search_vector(
+            title text, content text, summary_cn text, one_liner text, keywords json
+        ) RETURNS tsvector LANGUAGE sql IMMUTABLE AS $$
+            SELECT setweight(to_tsvector('simple', cjk_spaced(title)), 'A')
+                || setweight(to_tsvector('simple', cjk_spaced(
+                    (SELECT string_agg(k, ' ') FROM json_array_elements_text(keywords) AS k))), 'A')
+                || setweight(to_tsvector('simple', cjk_spaced(summary_cn)), 'B')
+                || setweight(to_tsvector('simple', cjk_spaced(one_liner)), 'B')
+                || setweight(to_tsvector('simple', cjk_spaced(left(content, 100000))), 'D')
+        $$""",
+    """CREATE OR REPLACE FUNCTION articles_search_vector_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            summary_text text;
+            one_liner_text text;
+            keyword_list json;
+        BEGIN
+            SELECT summary_cn, one_liner, keywords INTO summary_text, one_liner_text, keyword_list
+            FROM summaries WHERE article_id = NEW.id;
+            NEW.search_vector := article_search_vector(
+                NEW.title, NEW.content, summary_text, one_liner_text, keyword_list);
+            RETURN NEW;
+        END $$""",
+    """CREATE OR REPLACE FUNCTION summaries_search_vector_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE target integer;
+        BEGIN
+            target := CASE WHEN TG_OP = 'DELETE' THEN OLD.article_id ELSE NEW.article_id END;
+            -- Re-running the articles trigger recomputes the vector with the new summary
+            UPDATE articles SET title = title WHERE id = target;
+            RETURN NULL;
+        END $$""",
+    "DROP TRIGGER IF EXISTS articles_search_vector_update ON articles",
+    """CREATE TRIGGER articles_search_vector_update
+        BEFORE INSERT OR UPDATE OF title, content ON articles
+        FOR EACH ROW EXECUTE FUNCTION articles_search_vector_trigger()""",
+    "DROP TRIGGER IF EXISTS summaries_search_vector_update ON summaries",
+    """CREATE TRIGGER summaries_search_vector_update
+        AFTER INSERT OR DELETE OR UPDATE OF summary_cn, one_liner, keywords ON summaries
+        FOR EACH ROW EXECUTE FUNCTION summaries_search_vector_trigger()""",
+    "CREATE INDEX IF NOT EXISTS ix_articles_search_vector ON articles USING gin (search_vector)",
+]
+
+# Touching title fires the BEFORE UPDATE trigger, which computes the vector
+POSTGRES_FTS_BACKFILL = "UPDATE articles SET title = title"
+
+POSTGRES_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS summaries_search_vector_update ON summaries",
+    "DROP TRIGGER IF EXISTS articles_search_vector_update ON articles",
+    "DROP FUNCTION IF EXISTS summaries_search_vector_trigger()",
+    "DROP FUNCTION IF EXISTS articles_search_vector_trigger()",
+    "DROP INDEX IF EXISTS ix_articles_search_vector",
+    "ALTER TABLE articles DROP COLUMN IF EXISTS search_vector",
+    "DROP FUNCTION IF EXISTS article_search_vector(text, text, text, text, json)",
+    "DROP FUNCTION IF EXISTS cjk_spaced(text)",
+]
+
+
+def upgrade() -> None:
+    conn = op.get_bind()
+    # Creates the index, its triggers, and fills it from existing rows
+    statements = {
+        "sqlite": SQLITE_FTS_DDL + [SQLITE_FTS_BACKFILL],
+        "postgresql": POSTGRES_FTS_DDL + [POSTGRES_FTS_BACKFILL],
+    }.get(conn.dialect.name, [])
+    for ddl in statements:
+        conn.exec_driver_sql(ddl)
+
+
+def downgrade() -> None:
+    conn = op.get_bind()
+    for ddl in {"sqlite": SQLITE_FTS_DROP, "postgresql": POSTGRES_FTS_DROP}.get(conn.dialect.name, []):
+        conn.exec_driver_sql(ddl)
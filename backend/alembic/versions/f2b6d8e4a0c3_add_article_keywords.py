@@ -0,0 +1,75 @@
+"""add normalized article_keywords table and backfill it from summaries
+
+Revision ID: f2b6d8e4a0c3
+Revises: e5c9a1f3d7b2
+Create Date: 2026-10-19 16:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "f2b6d8e4a0c3"
+down_revision: Union[str, Sequence[str], None] = "e5c9a1f3d7b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK = 1000
+
+
+def upgrade() -> None:
+    from app.services.keywords import keyword_rows
+
+    article_keywords = op.create_table(
+        "article_keywords",
+        sa.Column("article_id", sa.Integer(), nullable=False),
+        sa.Column("keyword", sa.String(), nullable=False),
+        sa.Column("feed_id", sa.Integer(), nullable=False),
+        sa.Column("published_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["article_id"], ["articles.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["feed_id"], ["feeds.id"]),
+        sa.PrimaryKeyConstraint("article_id", "keyword"),
+    )
+    op.create_index(
+        "ix_article_keywords_keyword_published_at", "article_keywords", ["keyword", "published_at"]
+    )
+    op.create_index(
+        "ix_article_keywords_published_at_feed_id_keyword",
+        "article_keywords",
+        ["published_at", "feed_id", "keyword"],
+    )
+
+    # Index the keywords of every summary completed so far
+    articles = sa.table(
+        "articles", sa.column("id", sa.Integer), sa.column("feed_id", sa.Integer),
+        sa.column("published_at", sa.DateTime), sa.column("created_at", sa.DateTime),
+    )
+    summaries = sa.table(
+        "summaries", sa.column("article_id", sa.Integer), sa.column("status", sa.String),
+        sa.column("keywords", sa.JSON),
+    )
+
+    conn = op.get_bind()
+    result = conn.execute(
+        sa.select(
+            articles.c.id, articles.c.feed_id, articles.c.published_at, articles.c.created_at,
+            summaries.c.keywords,
+        )
+        .select_from(summaries)
+        .join(articles, articles.c.id == summaries.c.article_id)
+        .where(summaries.c.status == "completed")
+    )
+    while chunk := result.fetchmany(BACKFILL_CHUNK):
+        rows = [row for source in chunk for row in keyword_rows(*source)]
+        if rows:
+            conn.execute(article_keywords.insert(), rows)
+
+    op.execute("ANALYZE")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_article_keywords_published_at_feed_id_keyword", table_name="article_keywords")
+    op.drop_index("ix_article_keywords_keyword_published_at", table_name="article_keywords")
+    op.drop_table("article_keywords")
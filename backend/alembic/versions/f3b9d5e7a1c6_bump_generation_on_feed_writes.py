@@ -0,0 +1,45 @@
+"""bump ingest_generation on every feed write, for HTTP cache validators
+
+Revision ID: f3b9d5e7a1c6
+Revises: e2a8c4d6f0b5
+Create Date: 2026-10-19 22:00:00.000000
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+revision: str = "f3b9d5e7a1c6"
+down_revision: Union[str, Sequence[str], None] = "e2a8c4d6f0b5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# The previous revision's feed trigger: only a category change bumped the generation
+_SQLITE_CATEGORY_TRIGGER = """CREATE TRIGGER stats_generation_feeds_au AFTER UPDATE OF category ON feeds
+    WHEN old.category IS NOT new.category BEGIN
+    UPDATE stats_counters SET ingest_generation = ingest_generation + 1 WHERE id = 1;
+END"""
+_POSTGRES_CATEGORY_TRIGGER = """CREATE TRIGGER stats_generation_feeds AFTER UPDATE OF category ON feeds
+    FOR EACH STATEMENT EXECUTE FUNCTION stats_generation_trigger()"""
+
+
+def upgrade() -> None:
+    from app.core.counters import install_generation
+
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        # Same name, wider event; CREATE ... IF NOT EXISTS would keep the old one
+        op.execute("DROP TRIGGER IF EXISTS stats_generation_feeds_au")
+    install_generation(bind)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if bind.dialect.name == "sqlite":
+        for name in ("stats_generation_feeds_ai", "stats_generation_feeds_au", "stats_generation_feeds_ad"):
+            op.execute(f"DROP TRIGGER IF EXISTS {name}")
+        op.execute(_SQLITE_CATEGORY_TRIGGER)
+    elif bind.dialect.name == "postgresql":
+        op.execute("DROP TRIGGER IF EXISTS stats_generation_feeds ON feeds")
+        op.execute(_POSTGRES_CATEGORY_TRIGGER)
@@ -1,134 +1,391 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import case, desc, func, or_, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import cached_endpoint
+from app.core.config import get_settings
 from app.core.db import get_db
-from app.models import Article, Feed, Summary
-from app.schemas.article import ArticleListItem, ArticleDetail, PaginatedArticlesResponse
-from typing import Optional
+from app.core.http_cache import conditional
+from app.models import Article, ArticleBody, ArticleKeyword, ArchivedArticle, ArchivedSummary, Feed, Summary
+from app.schemas.article import (
+    ArticleListItem, ArticleDetail, PaginatedArticlesResponse, SearchHit, SearchResponse,
+    KeywordFacet, KeywordFacetsResponse,
+)
+from app.services.export import FORMATS as EXPORT_FORMATS, export_chunks, head_id, head_summary_at
+from app.services.hot_window import hot_window
+from app.services.keywords import normalize_keyword
+from app.utils.compression import decompress_text
+from app.utils.cursor import ArticleCursor, decode_cursor, encode_cursor
+from app.services.search import matching_article_ids, search_articles
+from app.services.stream import broadcaster, decode_position
+from app.services.totals import article_total
+from typing import List, Optional
 from datetime import datetime, timedelta
 
 router = APIRouter()
+settings = get_settings()
 
-@router.get("/", response_model=PaginatedArticlesResponse)
+# Only what the list view renders, labelled as ArticleListItem fields; the
+# page is validated in one TypeAdapter call rather than a model per row
+_LIST_COLUMNS = (
+    Article.id, Article.title, Article.url, Summary.one_liner, Summary.keywords,
+    Article.published_at, Article.created_at,
+    Feed.title.label("feed_title"), Feed.category.label("feed_category"),
+)
+_list_items = TypeAdapter(list[ArticleListItem])
+
+@router.get("/", response_model=PaginatedArticlesResponse, dependencies=[Depends(conditional())])
+@cached_endpoint("articles")
 async def list_articles(
     page: int = Query(1, ge=1),
     page_size: int = Query(20, ge=1, le=100),
     feed_id: Optional[int] = None,
     category: Optional[str] = None,
     keyword: Optional[str] = None,
-    db: Session = Depends(get_db)
+    tag: Optional[str] = None,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db)
 ):
     """Get paginated article list
 
-    NOTE: keyword search only searches titles for MVP.
-    Full-text search including keywords requires PostgreSQL.
+    `keyword` filters through the full-text index (title, content, summary,
+    one-liner and keywords); use /search for ranked results with snippets.
+    `tag` is an exact (case-insensitive) summary keyword, see /keywords.
+
+    Passing `cursor` (empty for the first page) switches to keyset paging:
+    `page` is ignored and `next_cursor` fetches the following page at the
+    same cost however deep it is.
+
+    `total` is cached per filter until the next ingest; past
+    ARTICLES_TOTAL_EXACT_LIMIT it is an estimate and `total_approximate` is set.
+
+    Pages inside the hot window (see app.services.hot_window) come from memory.
     """
-    query = db.query(
-        Article,
-        Feed.title.label("feed_title"),
-        Feed.category.label("feed_category"),
-        Summary.status.label("summary_status"),
-        Summary.one_liner,
-        Summary.keywords
-    ).join(Feed).outerjoin(Summary)
+    position = None
+    if cursor:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    key = (feed_id, category, keyword, tag)
+
+    hot = None
+    if not (keyword or tag) and await hot_window.current(db):
+        hot = hot_window.list_page(feed_id, category, page_size, offset=(page - 1) * page_size,
+                                   position=position, keyset=cursor is not None)
+    query = select(*_LIST_COLUMNS).join(Feed).outerjoin(Summary)
 
     if feed_id:
-        query = query.filter(Article.feed_id == feed_id)
+        query = query.where(Article.feed_id == feed_id)
 
     if category:
-        query = query.filter(Feed.category == category)
+        query = query.where(Feed.category == category)
 
     if keyword:
-        # MVP: title-only search (SQLite compatible)
-        query = query.filter(Article.title.ilike(f"%{keyword}%"))
+        query = query.where(Article.id.in_(matching_article_ids(db.get_bind().dialect.name, keyword)))
 
-    total = query.count()
-    # Order by: completed summaries first, then by published date (NULL=last)
-    from sqlalchemy import case, desc
-    articles = query.order_by(
-        case((Summary.status == 'completed', 0), else_=1).label('has_summary'),
-        desc(Article.published_at)
-    ).offset((page - 1) * page_size).limit(page_size).all()
+    if tag:
+        query = query.where(Article.id.in_(
+            select(ArticleKeyword.article_id).where(ArticleKeyword.keyword == normalize_keyword(tag))
+        ))
 
-    items = [
-        ArticleListItem(
-            id=a.Article.id,
-            title=a.Article.title,
-            url=a.Article.url,
-            one_liner=a.one_liner,
-            keywords=a.keywords or [],
-            published_at=a.Article.published_at,
-            created_at=a.Article.created_at,
-            feed_title=a.feed_title,
-            feed_category=a.feed_category,
+    if hot is not None:
+        items, next_position = hot
+        total = hot_window.total(key) or await article_total(db, query, key)
+        return PaginatedArticlesResponse(
+            items=_list_items.validate_python(items),
+            total=total.value,
+            total_approximate=total.approximate,
+            page=page,
+            page_size=page_size,
+            has_next=True,
+            next_cursor=encode_cursor(next_position) if next_position else None,
         )
-        for a in articles
-    ]
+
+    total = await article_total(db, query, key)
+    if cursor is not None:
+        articles, next_cursor = await _keyset_page(db, query, position, page_size)
+        has_next = next_cursor is not None
+    else:
+        next_cursor = None
+        # Order by: completed summaries first, then by published date (NULL=last)
+        articles = (await db.execute(query.order_by(
+            case((Summary.status == 'completed', 0), else_=1).label('has_summary'),
+            desc(Article.published_at)
+        ).offset((page - 1) * page_size).limit(page_size + 1))).all()
+        # The total may be an estimate, so the extra row decides has_next
+        has_next = len(articles) > page_size
+        articles = articles[:page_size]
 
     return PaginatedArticlesResponse(
-        items=items,
-        total=total,
+        items=_list_items.validate_python([row._asdict() for row in articles]),
+        total=total.value,
+        total_approximate=total.approximate,
         page=page,
         page_size=page_size,
-        has_next=page * page_size < total,
+        has_next=has_next,
+        next_cursor=next_cursor,
     )
 
-@router.get("/latest", response_model=list[ArticleListItem])
+
+# Keyset order: the list order split into segments that each walk
+# (published_at, id) descending on an index. (has_summary, undated)
+_KEYSET_SEGMENTS = [(0, False), (0, True), (1, False), (1, True)]
+
+
+async def _keyset_page(db: AsyncSession, query, position: Optional[ArticleCursor], page_size: int):
+    """Rows after `position` in list order, plus the cursor of the next page (or None)
+
+    Completed summaries come first, then the rest; within each, newest
+    published first with undated articles last and id breaking ties. Every
+    segment is a seek on (published_at, id), so later pages cost the same
+    as the first.
+    """
+    rows = []
+    for has_summary, undated in _KEYSET_SEGMENTS:
+        if position and (has_summary, undated) < (position.has_summary, position.published_at is None):
+            continue
+        completed = Summary.status == 'completed'
+        segment = query.where(completed if has_summary == 0 else or_(Summary.status.is_(None), ~completed))
+        at_position = position and (has_summary, undated) == (position.has_summary, position.published_at is None)
+        if undated:
+            segment = segment.where(Article.published_at.is_(None)).order_by(Article.id.desc())
+            if at_position:
+                segment = segment.where(Article.id < position.id)
+        else:
+            segment = segment.where(Article.published_at.isnot(None)).order_by(
+                Article.published_at.desc(), Article.id.desc()
+            )
+            if at_position:
+                segment = segment.where(
+                    tuple_(Article.published_at, Article.id) < tuple_(position.published_at, position.id)
+                )
+        # One extra row tells whether a next page exists
+        rows += [(has_summary, row) for row in (await db.execute(segment.limit(page_size + 1 - len(rows)))).all()]
+        if len(rows) > page_size:
+            break
+
+    if len(rows) <= page_size:
+        return [row for _, row in rows], None
+    has_summary, last = rows[page_size - 1]
+    next_cursor = encode_cursor(ArticleCursor(has_summary, last.published_at, last.id))
+    return [row for _, row in rows[:page_size]], next_cursor
+
+# The 24 h window slides, so tags also turn over every 5 minutes
+@router.get("/latest", response_model=list[ArticleListItem],
+            dependencies=[Depends(conditional(window_seconds=300))])
+@cached_endpoint("articles")
 async def get_latest_articles(
     limit: int = Query(20, ge=1, le=50),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Get articles from last 24 hours"""
+    if await hot_window.current(db):
+        latest = hot_window.latest(limit)
+        if latest is not None:
+            return _list_items.validate_python(latest)
+
     yesterday = datetime.utcnow() - timedelta(hours=24)
 
-    articles = db.query(
-        Article,
-        Feed.title.label("feed_title"),
-        Feed.category.label("feed_category"),
-        Summary.one_liner,
-        Summary.keywords
-    ).join(Feed).outerjoin(Summary).filter(
+    articles = (await db.execute(select(*_LIST_COLUMNS).join(Feed).outerjoin(Summary).where(
         Article.published_at >= yesterday
-    ).order_by(Article.published_at.desc()).limit(limit).all()
-
-    return [
-        ArticleListItem(
-            id=a.Article.id,
-            title=a.Article.title,
-            url=a.Article.url,
-            one_liner=a.one_liner,
-            keywords=a.keywords or [],
-            published_at=a.Article.published_at,
-            created_at=a.Article.created_at,
-            feed_title=a.feed_title,
-            feed_category=a.feed_category,
+    ).order_by(Article.published_at.desc()).limit(limit))).all()
+
+    return _list_items.validate_python([row._asdict() for row in articles])
+
+@router.get("/keywords", response_model=KeywordFacetsResponse)
+async def keyword_facets(
+    hours: int = Query(24 * 7, ge=1, le=24 * 365),
+    category: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    db: AsyncSession = Depends(get_db)
+):
+    """Most common summary keywords in the window, with per-category counts"""
+    since = datetime.utcnow() - timedelta(hours=hours)
+    query = select(
+        ArticleKeyword.keyword,
+        Feed.category,
+        func.count().label("count"),
+    ).join(Feed, Feed.id == ArticleKeyword.feed_id).where(
+        ArticleKeyword.published_at >= since
+    ).group_by(ArticleKeyword.keyword, Feed.category)
+    if category:
+        query = query.where(Feed.category == category)
+
+    facets: dict[str, KeywordFacet] = {}
+    for keyword, feed_category, count in (await db.execute(query)).all():
+        facet = facets.setdefault(keyword, KeywordFacet(keyword=keyword, count=0))
+        facet.count += count
+        facet.categories[feed_category or ""] = count
+
+    items = sorted(facets.values(), key=lambda f: (-f.count, f.keyword))[:limit]
+    return KeywordFacetsResponse(window_hours=hours, category=category, items=items)
+
+@router.get("/search", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    category: Optional[str] = None,
+    feed_id: Optional[int] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """Full-text search, best matches first, with highlighted snippets"""
+    hits, total = await search_articles(db, q, page=page, page_size=page_size,
+                                        category=category, feed_id=feed_id)
+
+    items = [
+        SearchHit(
+            id=hit.row.Article.id,
+            title=hit.row.Article.title,
+            url=hit.row.Article.url,
+            one_liner=hit.row.one_liner,
+            keywords=hit.row.keywords or [],
+            published_at=hit.row.Article.published_at,
+            created_at=hit.row.Article.created_at,
+            feed_title=hit.row.feed_title,
+            feed_category=hit.row.feed_category,
+            snippet=hit.snippet,
+            rank=hit.rank,
         )
-        for a in articles
+        for hit in hits
     ]
 
+    return SearchResponse(
+        query=q,
+        items=items,
+        total=total,
+        page=page,
+        page_size=page_size,
+        has_next=page * page_size < total,
+    )
+
+@router.get("/stream")
+async def stream(last_event_id: Optional[str] = Header(None)):
+    """Server-Sent Events: `article` when one is fetched, `summary` when its summary completes
+
+    Browsers reconnect with Last-Event-ID and get what they missed replayed
+    (up to STREAM_REPLAY_LIMIT events per kind).
+    """
+    resume = None
+    if last_event_id:
+        try:
+            resume = decode_position(last_event_id)
+        except ValueError:
+            pass
+    return StreamingResponse(
+        broadcaster.events(resume, settings.stream_heartbeat_seconds),
+        media_type="text/event-stream",
+        # X-Accel-Buffering: nginx passes events through instead of buffering them
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/export")
+async def export_articles(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    since_id: int = Query(0, ge=0, description="Watermark: only articles with a greater id"),
+    created_after: Optional[datetime] = None,
+    summarized_after: Optional[datetime] = Query(
+        None, description="Watermark: also re-export older articles whose summary was processed since"
+    ),
+    gzip: bool = Query(False, description="Send a .gz file rather than plain text"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Stream every article with its summary, oldest id first, as NDJSON or CSV
+
+    For mirrors: one server-side cursor instead of paging through /. The
+    export stops at the newest id when it starts, sent as X-Export-Watermark,
+    and the newest summary processed_at, sent as X-Export-Summary-Watermark.
+    Pass them as `since_id` and `summarized_after` next time to fetch new
+    articles and those whose summary changed in between.
+    """
+    watermark = await head_id(db)
+    summary_watermark = await head_summary_at(db)
+    filename = f"articles-{since_id}-{watermark}.{format}" + (".gz" if gzip else "")
+    headers = {
+        "X-Export-Watermark": str(watermark),
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Cache-Control": "no-store",
+        "X-Accel-Buffering": "no",
+    }
+    if summary_watermark is not None:
+        headers["X-Export-Summary-Watermark"] = summary_watermark.isoformat()
+    return StreamingResponse(
+        export_chunks(format, since_id, watermark, created_after, compress=gzip, summarized_after=summarized_after),
+        media_type="application/gzip" if gzip else EXPORT_FORMATS[format],
+        headers=headers,
+    )
+
+# Enough for the largest list page
+BATCH_MAX_IDS = 100
+
+
+@router.get("/batch", response_model=list[ArticleDetail], dependencies=[Depends(conditional())])
+async def get_articles_batch(
+    ids: List[str] = Query(..., description="Comma-separated and/or repeated article ids"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Details of many articles in one query, in the order asked; unknown ids are left out
+
+    Lets the list prefetch every card's detail in one round-trip instead of
+    one /{id} call per card.
+    """
+    try:
+        wanted = list(dict.fromkeys(int(part) for value in ids for part in value.split(",") if part.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="ids must be integers")
+    if len(wanted) > BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_IDS} ids per request")
+    if not wanted:
+        return []
+
+    details = {
+        row.Article.id: _detail(row)
+        for row in await db.execute(_detail_query().where(Article.id.in_(wanted)))
+    }
+    missing = [id for id in wanted if id not in details]
+    if missing:
+        details.update(
+            (row.ArchivedArticle.id, _archived_detail(row))
+            for row in await db.execute(_archived_query().where(ArchivedArticle.id.in_(missing)))
+        )
+    return [details[id] for id in wanted if id in details]
+
 @router.get("/{id}", response_model=ArticleDetail)
-async def get_article(id: int, db: Session = Depends(get_db)):
+async def get_article(id: int, db: AsyncSession = Depends(get_db)):
     """Get article detail with summary"""
-    article = db.query(
+    row = (await db.execute(_detail_query().where(Article.id == id))).first()
+    if row:
+        return _detail(row)
+    row = (await db.execute(_archived_query().where(ArchivedArticle.id == id))).first()
+    if row:
+        return _archived_detail(row)
+    raise HTTPException(status_code=404, detail="Article not found")
+
+
+def _detail_query():
+    return select(
         Article,
         Feed.title.label("feed_title"),
         Feed.source_type.label("source_type"),
         Summary,
+        ArticleBody,
     ).join(
         Feed).outerjoin(
         Summary, Summary.article_id == Article.id
-    ).filter(Article.id == id).first()
-
-    if not article:
-        from fastapi import HTTPException
-        raise HTTPException(status_code=404, detail="Article not found")
+    ).outerjoin(
+        ArticleBody, ArticleBody.article_id == Article.id
+    )
 
-    a, feed_title, source_type, summary = article
 
+def _detail(row) -> ArticleDetail:
+    a, feed_title, source_type, summary, body = row
     return ArticleDetail(
         id=a.id,
         title=a.title,
         url=a.url,
-        content=a.content or "",
+        content=body.text if body else "",
         content_hash=a.content_hash,
         author=a.author,
         language=a.language,
@@ -140,3 +397,37 @@ async def get_article(id: int, db: Session = Depends(get_db)):
         keywords=summary.keywords if summary else [],
         summary_status=summary.status if summary else "pending",
     )
+
+
+def _archived_query():
+    """Articles retention moved to the archive tables"""
+    return select(
+        ArchivedArticle,
+        Feed.title.label("feed_title"),
+        Feed.source_type.label("source_type"),
+        ArchivedSummary,
+    ).outerjoin(
+        Feed, Feed.id == ArchivedArticle.feed_id
+    ).outerjoin(
+        ArchivedSummary, ArchivedSummary.article_id == ArchivedArticle.id
+    )
+
+
+def _archived_detail(row) -> ArticleDetail:
+    a, feed_title, source_type, summary = row
+    return ArticleDetail(
+        id=a.id,
+        title=a.title,
+        url=a.url,
+        content=decompress_text(a.body_codec, a.body_data) if a.body_data is not None else "",
+        content_hash=a.content_hash,
+        author=a.author,
+        published_at=a.published_at,
+        feed_title=feed_title or "",
+        source_type=source_type,
+        summary_cn=summary.summary_cn if summary else None,
+        one_liner=summary.one_liner if summary else None,
+        keywords=(summary.keywords or []) if summary else [],
+        summary_status=summary.status if summary else "pending",
+        archived=True,
+    )
@@ -1,16 +1,20 @@
 from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import cached_endpoint
 from app.core.db import get_db
+from app.core.http_cache import conditional
 from app.models import Feed
 from app.schemas.feed import FeedResponse
 from typing import List
 
 router = APIRouter()
 
-@router.get("/", response_model=List[FeedResponse])
-async def list_feeds(db: Session = Depends(get_db)):
+@router.get("/", response_model=List[FeedResponse], dependencies=[Depends(conditional())])
+@cached_endpoint("feeds")
+async def list_feeds(db: AsyncSession = Depends(get_db)):
     """Get all feeds"""
-    feeds = db.query(Feed).order_by(Feed.title).all()
+    feeds = (await db.scalars(select(Feed).order_by(Feed.title))).all()
     return [
         FeedResponse(
             id=f.id,
@@ -27,10 +31,11 @@ async def list_feeds(db: Session = Depends(get_db)):
         for f in feeds
     ]
 
-@router.get("/categories", response_model=List[str])
-async def list_categories(db: Session = Depends(get_db)):
+@router.get("/categories", response_model=List[str], dependencies=[Depends(conditional())])
+@cached_endpoint("feeds")
+async def list_categories(db: AsyncSession = Depends(get_db)):
     """Get all unique categories"""
-    categories = db.query(Feed.category).filter(
+    categories = (await db.execute(select(Feed.category).where(
         Feed.category.isnot(None)
-    ).distinct().all()
+    ).distinct())).all()
     return [c[0] for c in categories if c[0]]
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.db import get_db
 from app.models import Recommendation
 from app.schemas.recommendation import RecommendationCreate, RecommendationResponse
@@ -11,13 +12,13 @@ router = APIRouter()
 @router.post("/", response_model=dict)
 async def create_recommendation(
     recommendation: RecommendationCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """Submit a new RSS feed recommendation"""
     # Check if URL already recommended
-    existing = db.query(Recommendation).filter(
+    existing = await db.scalar(select(Recommendation).where(
         Recommendation.feed_url == recommendation.feed_url
-    ).first()
+    ).limit(1))
 
     if existing:
         return {
@@ -33,7 +34,7 @@ async def create_recommendation(
         contact=recommendation.contact,
     )
     db.add(db_rec)
-    db.commit()
+    await db.commit()
 
     return {
         "success": True,
@@ -45,10 +46,10 @@ async def create_recommendation(
 async def list_recommendations(
     skip: int = 0,
     limit: int = 50,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     """List all recommendations (for admin use)"""
-    recommendations = db.query(Recommendation).order_by(
+    recommendations = (await db.scalars(select(Recommendation).order_by(
         Recommendation.created_at.desc()
-    ).offset(skip).limit(limit).all()
+    ).offset(skip).limit(limit))).all()
     return recommendations
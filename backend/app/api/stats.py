@@ -1,42 +1,103 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import all_metrics, cached_endpoint
 from app.core.db import get_db
-from app.models import Feed, Article, Summary
-from app.schemas.summary import StatsResponse
+from app.core.http_cache import conditional
+from app.models import Summary
+from app.schemas.summary import CacheMetrics, StatsResponse, UsageStatsResponse
+from app.core.config import get_settings
+from app.tasks import budget
+from app.tasks.counters import read_stats, reconcile
 from datetime import datetime, timedelta
 
 router = APIRouter()
 
-@router.get("/", response_model=StatsResponse)
-async def get_stats(db: Session = Depends(get_db)):
-    """Get site statistics"""
-    total_feeds = db.query(Feed).count()
-    active_feeds = db.query(Feed).filter(Feed.is_active == True).count()
-    total_articles = db.query(Article).count()
+# articles_today slides with the clock, so tags also turn over every 5 minutes
+@router.get("/", response_model=StatsResponse, dependencies=[Depends(conditional(window_seconds=300))])
+@cached_endpoint("stats")
+async def get_stats(db: AsyncSession = Depends(get_db)):
+    """Get site statistics from the trigger-maintained counters row"""
+    counters, articles_today = await read_stats(db)
+    if counters is None:
+        # Table created without its seed row (e.g. restored dump); rebuild it once
+        await reconcile(db)
+        counters, articles_today = await read_stats(db)
 
-    yesterday = datetime.utcnow() - timedelta(hours=24)
-    articles_today = db.query(Article).filter(Article.created_at >= yesterday).count()
-
-    summaries_pending = db.query(Summary).filter(Summary.status == "pending").count()
-    summaries_failed = db.query(Summary).filter(Summary.status == "failed").count()
-    summaries_completed = db.query(Summary).filter(Summary.status == "completed").count()
+    # Rows in flight in a provider batch are still pending from the reader's view
+    summaries_pending = counters.summaries_pending + counters.summaries_batched
+    summaries_failed = counters.summaries_failed
+    summaries_completed = counters.summaries_completed
+    # Triaged out at ingest; never sent to the provider, so not part of the rate
+    summaries_skipped = counters.summaries_skipped
 
     total_summaries = summaries_pending + summaries_failed + summaries_completed
     completion_rate = summaries_completed / total_summaries if total_summaries > 0 else 0
 
-    last_fetch = db.query(Feed).filter(
-        Feed.last_fetched_at.isnot(None)
-    ).order_by(Feed.last_fetched_at.desc()).first()
-
     return StatsResponse(
-        total_feeds=total_feeds,
-        active_feeds=active_feeds,
-        total_articles=total_articles,
+        total_feeds=counters.total_feeds,
+        active_feeds=counters.active_feeds,
+        total_articles=counters.total_articles,
         articles_today=articles_today,
         summaries_pending=summaries_pending,
         summaries_failed=summaries_failed,
         summaries_completed=summaries_completed,
-        last_fetch_at=last_fetch.last_fetched_at.isoformat() if last_fetch else None,
+        summaries_skipped=summaries_skipped,
+        last_fetch_at=counters.last_fetch_at.isoformat() if counters.last_fetch_at else None,
         completion_rate=completion_rate,
     )
+
+
+@router.get("/usage", response_model=UsageStatsResponse)
+async def get_usage_stats(
+    hours: int = Query(24, ge=1, le=24 * 90),
+    db: AsyncSession = Depends(get_db)
+):
+    """Provider token, latency and cost totals for summaries processed in the window"""
+    since = datetime.utcnow() - timedelta(hours=hours)
+    # Finished calls only, never rows still in flight
+    in_window = and_(Summary.processed_at >= since, Summary.status.in_(("completed", "failed")))
+
+    row = (await db.execute(select(
+        func.count(Summary.id),
+        func.coalesce(func.sum(Summary.input_tokens), 0),
+        func.coalesce(func.sum(Summary.output_tokens), 0),
+        func.coalesce(func.sum(Summary.cache_read_tokens), 0),
+        func.coalesce(func.sum(Summary.cache_write_tokens), 0),
+        func.coalesce(func.sum(Summary.cost_usd), 0.0),
+        func.avg(Summary.latency_ms),
+        func.avg(Summary.attempts),
+    ).where(in_window))).one()
+    processed, input_tokens, output_tokens, cache_read, cache_write, cost, avg_latency, avg_attempts = row
+
+    # p95 via a single ordered seek rather than loading every latency
+    timed = select(Summary.latency_ms).where(in_window, Summary.latency_ms.isnot(None))
+    timed_count = await db.scalar(select(func.count()).select_from(timed.subquery()))
+    p95 = None
+    if timed_count:
+        p95 = await db.scalar(timed.order_by(Summary.latency_ms).offset(int(timed_count * 0.95)).limit(1))
+
+    daily_budget = get_settings().ai_daily_token_budget
+    used_today = await budget.tokens_used_today(db)
+
+    return UsageStatsResponse(
+        window_hours=hours,
+        summaries_processed=processed,
+        input_tokens=input_tokens,
+        output_tokens=output_tokens,
+        cache_read_tokens=cache_read,
+        cache_write_tokens=cache_write,
+        estimated_cost_usd=round(float(cost), 6),
+        avg_latency_ms=float(avg_latency) if avg_latency is not None else None,
+        p95_latency_ms=p95,
+        avg_attempts=float(avg_attempts) if avg_attempts is not None else None,
+        daily_token_budget=daily_budget,
+        tokens_used_today=used_today,
+        budget_exhausted=daily_budget > 0 and used_today >= daily_budget,
+    )
+
+
+@router.get("/cache", response_model=list[CacheMetrics])
+async def get_cache_stats():
+    """Hit, miss and coalesce counts of the in-process read cache since startup"""
+    return all_metrics()
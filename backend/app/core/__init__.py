@@ -1,5 +1,5 @@
 from app.core.config import get_settings
-from app.core.db import Base, engine, get_db
+from app.core.db import AsyncSessionLocal, Base, async_engine, engine, get_db
 from app.core.logging import logger
 
-__all__ = ["get_settings", "Base", "engine", "get_db", "logger"]
+__all__ = ["get_settings", "AsyncSessionLocal", "Base", "async_engine", "engine", "get_db", "logger"]
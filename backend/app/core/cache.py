@@ -0,0 +1,151 @@
+"""
+In-process cache for hot read endpoints.
+
+AsyncTTLCache holds up to `max_entries` results for `ttl` seconds, evicting
+the least recently used first. Concurrent misses on one key are coalesced
+(single flight): the first caller runs the loader, the rest await the same
+future, so a burst of identical requests costs one query. Failures are
+shared with the waiters but never cached.
+
+`cached_endpoint` wraps a router function and keys entries on its
+arguments plus the data generation (app.core.http_cache), so writes from
+other processes retire entries within the generation TTL. Writers in this
+process call `data_changed()` after committing (fetcher, processor, batch
+backfill) to drop everything at once.
+"""
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+from app.core.config import get_settings
+from app.core.http_cache import generation
+
+settings = get_settings()
+
+
+class AsyncTTLCache:
+    def __init__(self, name: str, max_entries: int, ttl: float):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._in_flight: dict[Hashable, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def _lookup(self, key: Hashable):
+        entry = self._entries.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key]
+            return False, None
+        self._entries.move_to_end(key)
+        return True, value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        if self.max_entries <= 0 or self.ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]]) -> Any:
+        found, value = self._lookup(key)
+        if found:
+            self.hits += 1
+            return value
+
+        pending = self._in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            # shield: one waiter's cancellation must not cancel the shared load
+            return await asyncio.shield(pending)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+                # Mark retrieved so an unawaited failure doesn't log "exception never retrieved"
+                future.exception()
+            raise
+        else:
+            self._store(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            self._in_flight.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def metrics(self) -> dict:
+        return {
+            "name": self.name,
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+        }
+
+
+_caches: dict[str, AsyncTTLCache] = {}
+_listeners: list[Callable[[], None]] = []
+
+
+def get_cache(name: str) -> AsyncTTLCache:
+    if name not in _caches:
+        _caches[name] = AsyncTTLCache(name, settings.api_cache_max_entries, settings.api_cache_ttl_seconds)
+    return _caches[name]
+
+
+def all_metrics() -> list[dict]:
+    return [cache.metrics() for cache in _caches.values()]
+
+
+def on_data_changed(listener: Callable[[], None]) -> None:
+    """Also call `listener` whenever data_changed() runs"""
+    _listeners.append(listener)
+
+
+def data_changed() -> None:
+    """Invalidation hook for writers in this process; call after committing"""
+    for cache in _caches.values():
+        cache.clear()
+    generation.invalidate()
+    for listener in _listeners:
+        listener()
+
+
+def cached_endpoint(cache_name: str):
+    """Serve a router function from the named cache
+
+    The function must take its session as `db`; every other argument is
+    part of the key.
+    """
+    def decorator(endpoint):
+        cache = get_cache(cache_name)
+
+        @functools.wraps(endpoint)
+        async def wrapper(**kwargs):
+            data_generation = await generation.current(kwargs["db"])
+            arguments = tuple(sorted((name, value) for name, value in kwargs.items() if name != "db"))
+            key = (endpoint.__name__, data_generation, arguments)
+            return await cache.get_or_load(key, lambda: endpoint(**kwargs))
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,178 @@
+"""
+Response compression middleware: brotli when installed and accepted, else gzip.
+
+Bodies under `compression_minimum_size` bytes, responses that already carry
+a Content-Encoding, and event streams go out untouched. Streaming bodies
+are compressed chunk by chunk and flushed, so each chunk still reaches the
+client as soon as it is produced.
+
+A strong ETag names exactly one byte sequence, so compressed responses get
+the encoding appended to their tag ("abc" -> "abc-gzip"). The suffix is
+stripped from If-None-Match on the way in, so app.core.http_cache keeps
+comparing its own tags, and a 304 echoes back the variant the client holds.
+"""
+import zlib
+from typing import Optional
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.core.logging import logger
+
+try:
+    import brotli
+except ImportError:  # Optional; `pip install brotli` to offer br
+    brotli = None
+
+EXCLUDED_CONTENT_TYPES = ("text/event-stream", "application/gzip", "application/zip", "image/")
+
+
+def _accepted(accept_encoding: str) -> set[str]:
+    """Codings from Accept-Encoding, minus those refused with q=0"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        coding, *params = (p.strip() for p in part.split(";"))
+        q = next((p[2:] for p in params if p.startswith("q=")), "1")
+        try:
+            if float(q) > 0:
+                accepted.add(coding)
+        except ValueError:
+            pass
+    return accepted
+
+
+class _Compressor:
+    def __init__(self, encoding: str, gzip_level: int, brotli_level: int):
+        self.encoding = encoding
+        if encoding == "br":
+            self._br = brotli.Compressor(quality=brotli_level)
+        else:
+            # wbits 31: gzip container
+            self._gz = zlib.compressobj(gzip_level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, final: bool) -> bytes:
+        if self.encoding == "br":
+            out = self._br.process(data)
+            return out + (self._br.finish() if final else self._br.flush())
+        out = self._gz.compress(data)
+        return out + self._gz.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+
+def _strip_encoding(tag: str) -> str:
+    for encoding in ("gzip", "br"):
+        suffix = f'-{encoding}"'
+        if tag.endswith(suffix):
+            return tag[: -len(suffix)] + '"'
+    return tag
+
+
+def _with_encoding(etag: str, encoding: str) -> str:
+    if etag.endswith('"'):
+        return f'{etag[:-1]}-{encoding}"'
+    return etag
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = 1024, gzip_level: int = 6, brotli_level: int = 4,
+                 brotli_enabled: bool = True):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_level = brotli_level
+        self.encodings = ["gzip"]
+        if brotli_enabled:
+            if brotli is not None:
+                self.encodings.insert(0, "br")
+            else:
+                logger.info("compression_brotli_unavailable", reason="brotli package not installed")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = Headers(scope=scope)
+        accepted = _accepted(headers.get("accept-encoding", ""))
+        encoding = next((e for e in self.encodings if e in accepted), None)
+
+        # Hand the app the tags it issued; remember which variant the client holds
+        held_variants = {}
+        if_none_match = headers.get("if-none-match")
+        if if_none_match:
+            tags = []
+            for tag in if_none_match.split(","):
+                tag = tag.strip()
+                plain = _strip_encoding(tag)
+                held_variants[plain.removeprefix("W/")] = tag.removeprefix("W/")
+                tags.append(plain)
+            raw = [(k, v) for k, v in scope["headers"] if k != b"if-none-match"]
+            raw.append((b"if-none-match", ", ".join(tags).encode("latin-1")))
+            scope = dict(scope, headers=raw)
+
+        await _Responder(self, encoding, held_variants, send)(scope, receive)
+
+
+class _Responder:
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], held_variants: dict, send: Send):
+        self.middleware = middleware
+        self.encoding = encoding
+        self.held_variants = held_variants
+        self.send = send
+        self.start: Optional[Message] = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, scope: Scope, receive: Receive) -> None:
+        await self.middleware.app(scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(raw=message["headers"])
+            etag = headers.get("etag")
+            if message["status"] == 304 and etag and etag in self.held_variants:
+                headers["etag"] = self.held_variants[etag]
+            self.passthrough = (
+                message["status"] in (204, 206, 304)
+                or "content-encoding" in headers
+                or headers.get("content-type", "").startswith(EXCLUDED_CONTENT_TYPES)
+            )
+            if not self.passthrough:
+                # Shared caches must key on the encoding, whichever one this client gets
+                headers.add_vary_header("Accept-Encoding")
+                self.passthrough = self.encoding is None
+            if self.passthrough:
+                await self.send(message)
+            else:
+                self.start = message
+            return
+
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+            if not more_body and len(body) < self.middleware.minimum_size:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+            self.compressor = _Compressor(self.encoding, self.middleware.gzip_level, self.middleware.brotli_level)
+            headers["content-encoding"] = self.encoding
+            if "etag" in headers:
+                headers["etag"] = _with_encoding(headers["etag"], self.encoding)
+            if more_body:
+                del headers["content-length"]
+            else:
+                body = self.compressor.compress(body, final=True)
+                headers["content-length"] = str(len(body))
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body})
+                return
+            await self.send(start)
+
+        await self.send({
+            "type": "http.response.body",
+            "body": self.compressor.compress(body, final=not more_body),
+            "more_body": more_body,
+        })
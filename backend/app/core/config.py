@@ -12,6 +12,54 @@ class Settings(BaseSettings):
     fetch_interval_minutes: int = 30
     claude_max_concurrency: int = 3
     claude_max_content_length: int = 3000
+    claude_prompt_cache: bool = True  # Send cache_control on the static system prompt; Anthropic caches only prefixes of 1024+ tokens
+    ai_daily_token_budget: int = 0  # Tokens per UTC day before low-priority work pauses; 0 = unlimited
+    ai_budget_priority_hours: int = 24  # Over budget, only work at most this many hours "old" proceeds
+    # SQLite connection profile, applied to every new connection (see app.core.db)
+    sqlite_journal_mode: str = "WAL"  # Readers no longer block the writer
+    sqlite_synchronous: str = "NORMAL"  # Safe with WAL; fsync at checkpoints only
+    sqlite_busy_timeout_ms: int = 5000  # Wait for the write lock instead of "database is locked"
+    sqlite_mmap_size: int = 256 * 1024 * 1024
+    sqlite_cache_size: int = -64000  # Negative = KiB, so ~64 MB of page cache per connection
+    sqlite_temp_store: str = "MEMORY"
+    sqlite_auto_vacuum: str = "INCREMENTAL"  # New databases only; the retention migration converts old ones
+    # PostgreSQL connection pool (ignored for SQLite)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800  # Seconds; drop connections before server/proxy idle limits
+    db_pool_pre_ping: bool = True
+    # Retention: move old articles to the archive tables (see app.tasks.retention); 0 = off
+    retention_days: int = 0
+    retention_max_per_feed: int = 0
+    retention_batch_size: int = 500  # Articles moved per transaction
+    retention_vacuum_pages: int = 256  # Free pages released per incremental_vacuum step
+    # Filtered listing totals (see app.services.totals)
+    articles_total_exact_limit: int = 10000  # Count up to this many rows, estimate beyond; 0 = always exact
+    articles_total_cache_entries: int = 1024  # Filter combinations cached per process
+    # HTTP caching of read endpoints (see app.core.http_cache)
+    http_cache_max_age: int = 10  # Seconds browsers/nginx may reuse a response; 0 = always revalidate
+    http_cache_generation_ttl: float = 2.0  # Seconds the API trusts its last read of the data generation
+    # In-process cache of hot read endpoints (see app.core.cache)
+    api_cache_ttl_seconds: float = 5.0  # 0 = off (concurrent identical requests are still coalesced)
+    api_cache_max_entries: int = 512  # Per endpoint group, least recently used evicted first
+    # Response encoding (see app.core.compression, app.core.responses)
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024  # Bytes; smaller bodies are sent as-is; 0 = compress everything
+    compression_gzip_level: int = 6
+    compression_brotli: bool = True  # Prefer br when the client accepts it and `brotli` is installed
+    compression_brotli_level: int = 4
+    json_response: str = "pydantic"  # "pydantic" (FastAPI's direct dump) or "orjson" (needs `orjson`)
+    # In-memory index of the newest articles (see app.services.hot_window)
+    hot_window_hours: int = 48  # Articles published this recently are served from memory; 0 = off
+    hot_window_rebuild_minutes: float = 30  # Full rebuild interval; between rebuilds it catches up incrementally
+    # Live events at /api/articles/stream (see app.services.stream)
+    stream_poll_seconds: float = 2.0  # How often the per-process producer checks for new data
+    stream_client_buffer: int = 256  # Events queued per client before it is dropped (it resumes)
+    stream_heartbeat_seconds: float = 15.0  # Keep-alive comment interval for idle connections
+    stream_replay_limit: int = 500  # Events replayed to a client reconnecting with Last-Event-ID
+    # Bulk export (see app.services.export)
+    export_batch_size: int = 1000  # Rows fetched from the server-side cursor and encoded per chunk
     log_level: str = "INFO"
     sentry_dsn: str = ""
     frontend_url: str = "http://localhost:3000"  # Frontend URL for CORS
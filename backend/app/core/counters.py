@@ -0,0 +1,360 @@
+"""
+Running totals behind /api/stats, kept outside the request path.
+
+`stats_counters` holds one row (id = 1) with the feed, article and
+per-status summary counts; `article_hourly_counts` holds articles created
+per UTC hour, so the rolling 24 h count is a sum over at most 25 buckets.
+
+Triggers on feeds, articles and summaries adjust both tables inside the
+writing transaction, so every path that inserts, deletes or changes a
+status (fetcher, processor, batch backfill, retention, feed API, scripts)
+is covered without touching its code. reconcile_statements() recomputes
+everything from the base tables; app.tasks.counters runs it hourly to
+correct any drift and prune old buckets.
+
+A second set of triggers bumps `ingest_generation`, the global data
+generation, on every write the read API can observe: articles added or
+removed (fetcher, retention), a summary status change (processor, batch
+backfill) other than a claim or its release (pending <-> batched, which
+readers see as pending either way) and any feed change (including last_fetched_at after each fetch).
+app.services.totals drops cached totals from older generations and
+app.core.http_cache derives ETags from it.
+
+Every such write therefore updates the same row, and on PostgreSQL
+concurrent writers queue on its lock until they commit; see "Stats
+Counters" in docs/DEPLOYMENT.md for the trade-off.
+
+Installed by the Alembic migrations and by metadata.create_all() (tests,
+scratch databases).
+"""
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import event, inspect, text
+
+SUMMARY_STATUSES = ("pending", "batched", "completed", "failed", "skipped")
+
+# Hourly buckets older than this are dropped by reconciliation
+BUCKET_RETENTION_HOURS = 48
+
+# Same text form SQLAlchemy writes for DateTime, so bucket keys compare with bound datetimes
+_SQLITE_HOUR = "strftime('%Y-%m-%d %H:00:00.000000', {column})"
+_POSTGRES_HOUR = "date_trunc('hour', {column})"
+
+_COUNTER_COLUMNS = (
+    "total_feeds", "active_feeds", "total_articles", *(f"summaries_{s}" for s in SUMMARY_STATUSES),
+)
+
+SEED_COUNTERS = (
+    f"INSERT INTO stats_counters (id, {', '.join(_COUNTER_COLUMNS)}) "
+    f"VALUES (1, {', '.join('0' for _ in _COUNTER_COLUMNS)}) ON CONFLICT (id) DO NOTHING"
+)
+
+_SQLITE_STATUS_DELTAS = ",\n            ".join(
+    f"summaries_{s} = summaries_{s} + ({{new}} IS '{s}') - ({{old}} IS '{s}')" for s in SUMMARY_STATUSES
+)
+
+SQLITE_COUNTERS_DDL = [
+    """CREATE TRIGGER IF NOT EXISTS stats_feeds_ai AFTER INSERT ON feeds BEGIN
+        UPDATE stats_counters SET total_feeds = total_feeds + 1,
+            active_feeds = active_feeds + (coalesce(new.is_active, 0) != 0)
+        WHERE id = 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS stats_feeds_au AFTER UPDATE OF is_active, last_fetched_at ON feeds BEGIN
+        UPDATE stats_counters SET
+            active_feeds = active_feeds + (coalesce(new.is_active, 0) != 0) - (coalesce(old.is_active, 0) != 0),
+            last_fetch_at = CASE WHEN new.last_fetched_at > coalesce(last_fetch_at, '')
+                THEN new.last_fetched_at ELSE last_fetch_at END
+        WHERE id = 1;
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS stats_feeds_ad AFTER DELETE ON feeds BEGIN
+        UPDATE stats_counters SET total_feeds = total_feeds - 1,
+            active_feeds = active_feeds - (coalesce(old.is_active, 0) != 0)
+        WHERE id = 1;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS stats_articles_ai AFTER INSERT ON articles BEGIN
+        UPDATE stats_counters SET total_articles = total_articles + 1 WHERE id = 1;
+        INSERT INTO article_hourly_counts (hour, count)
+        SELECT {_SQLITE_HOUR.format(column="new.created_at")}, 1 WHERE new.created_at IS NOT NULL
+        ON CONFLICT (hour) DO UPDATE SET count = count + 1;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS stats_articles_ad AFTER DELETE ON articles BEGIN
+        UPDATE stats_counters SET total_articles = total_articles - 1 WHERE id = 1;
+        UPDATE article_hourly_counts SET count = count - 1
+        WHERE hour = {_SQLITE_HOUR.format(column="old.created_at")};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS stats_summaries_ai AFTER INSERT ON summaries BEGIN
+        UPDATE stats_counters SET
+            {_SQLITE_STATUS_DELTAS.format(new="new.status", old="NULL")}
+        WHERE id = 1;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS stats_summaries_au AFTER UPDATE OF status ON summaries
+        WHEN old.status IS NOT new.status BEGIN
+        UPDATE stats_counters SET
+            {_SQLITE_STATUS_DELTAS.format(new="new.status", old="old.status")}
+        WHERE id = 1;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS stats_summaries_ad AFTER DELETE ON summaries BEGIN
+        UPDATE stats_counters SET
+            {_SQLITE_STATUS_DELTAS.format(new="NULL", old="old.status")}
+        WHERE id = 1;
+    END""",
+]
+
+SQLITE_COUNTERS_DROP = [
+    f"DROP TRIGGER IF EXISTS stats_{table}_{op}"
+    for table in ("summaries", "articles", "feeds") for op in ("ad", "au", "ai")
+]
+
+_POSTGRES_STATUS_DELTAS = ",\n                ".join(
+    f"summaries_{s} = summaries_{s} + (new_status IS NOT DISTINCT FROM '{s}')::int"
+    f" - (old_status IS NOT DISTINCT FROM '{s}')::int"
+    for s in SUMMARY_STATUSES
+)
+
+POSTGRES_COUNTERS_DDL = [
+    """CREATE OR REPLACE FUNCTION stats_feeds_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            feeds_delta integer := 0;
+            old_active integer := 0;
+            new_active integer := 0;
+            fetched_at timestamp;
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN old_active := coalesce(OLD.is_active, false)::int; END IF;
+            IF TG_OP <> 'DELETE' THEN
+                new_active := coalesce(NEW.is_active, false)::int;
+                fetched_at := NEW.last_fetched_at;
+            END IF;
+            feeds_delta := CASE TG_OP WHEN 'INSERT' THEN 1 WHEN 'DELETE' THEN -1 ELSE 0 END;
+            UPDATE stats_counters SET total_feeds = total_feeds + feeds_delta,
+                active_feeds = active_feeds + new_active - old_active,
+                last_fetch_at = greatest(last_fetch_at, fetched_at)
+            WHERE id = 1;
+            RETURN NULL;
+        END $$""",
+    f"""CREATE OR REPLACE FUNCTION stats_articles_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                UPDATE stats_counters SET total_articles = total_articles + 1 WHERE id = 1;
+                IF NEW.created_at IS NOT NULL THEN
+                    INSERT INTO article_hourly_counts (hour, count)
+                    VALUES ({_POSTGRES_HOUR.format(column="NEW.created_at")}, 1)
+                    ON CONFLICT (hour) DO UPDATE SET count = article_hourly_counts.count + 1;
+                END IF;
+            ELSE
+                UPDATE stats_counters SET total_articles = total_articles - 1 WHERE id = 1;
+                UPDATE article_hourly_counts SET count = count - 1
+                WHERE hour = {_POSTGRES_HOUR.format(column="OLD.created_at")};
+            END IF;
+            RETURN NULL;
+        END $$""",
+    f"""CREATE OR REPLACE FUNCTION stats_summaries_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE
+            old_status text;
+            new_status text;
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN old_status := OLD.status; END IF;
+            IF TG_OP <> 'DELETE' THEN new_status := NEW.status; END IF;
+            IF old_status IS NOT DISTINCT FROM new_status THEN RETURN NULL; END IF;
+            UPDATE stats_counters SET
+                {_POSTGRES_STATUS_DELTAS}
+            WHERE id = 1;
+            RETURN NULL;
+        END $$""",
+    "DROP TRIGGER IF EXISTS stats_feeds_update ON feeds",
+    """CREATE TRIGGER stats_feeds_update
+        AFTER INSERT OR DELETE OR UPDATE OF is_active, last_fetched_at ON feeds
+        FOR EACH ROW EXECUTE FUNCTION stats_feeds_trigger()""",
+    "DROP TRIGGER IF EXISTS stats_articles_update ON articles",
+    """CREATE TRIGGER stats_articles_update
+        AFTER INSERT OR DELETE ON articles
+        FOR EACH ROW EXECUTE FUNCTION stats_articles_trigger()""",
+    "DROP TRIGGER IF EXISTS stats_summaries_update ON summaries",
+    """CREATE TRIGGER stats_summaries_update
+        AFTER INSERT OR DELETE OR UPDATE OF status ON summaries
+        FOR EACH ROW EXECUTE FUNCTION stats_summaries_trigger()""",
+]
+
+POSTGRES_COUNTERS_DROP = [
+    "DROP TRIGGER IF EXISTS stats_summaries_update ON summaries",
+    "DROP TRIGGER IF EXISTS stats_articles_update ON articles",
+    "DROP TRIGGER IF EXISTS stats_feeds_update ON feeds",
+    "DROP FUNCTION IF EXISTS stats_summaries_trigger()",
+    "DROP FUNCTION IF EXISTS stats_articles_trigger()",
+    "DROP FUNCTION IF EXISTS stats_feeds_trigger()",
+]
+
+BUMP_GENERATION = "UPDATE stats_counters SET ingest_generation = ingest_generation + 1 WHERE id = 1"
+
+# Claiming a row for a call (or releasing it) is bookkeeping, not new data
+IN_FLIGHT_STATUSES = ("pending", "batched")
+_IN_FLIGHT = ", ".join(f"'{s}'" for s in IN_FLIGHT_STATUSES)
+
+SQLITE_GENERATION_DDL = [
+    f"""CREATE TRIGGER IF NOT EXISTS stats_generation_articles_ai AFTER INSERT ON articles BEGIN
+        {BUMP_GENERATION};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS stats_generation_articles_ad AFTER DELETE ON articles BEGIN
+        {BUMP_GENERATION};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS stats_generation_summaries_au AFTER UPDATE OF status ON summaries
+        WHEN old.status IS NOT new.status
+            AND NOT (old.status IN ({_IN_FLIGHT}) AND new.status IN ({_IN_FLIGHT})) BEGIN
+        {BUMP_GENERATION};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS stats_generation_feeds_ai AFTER INSERT ON feeds BEGIN
+        {BUMP_GENERATION};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS stats_generation_feeds_au AFTER UPDATE ON feeds BEGIN
+        {BUMP_GENERATION};
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS stats_generation_feeds_ad AFTER DELETE ON feeds BEGIN
+        {BUMP_GENERATION};
+    END""",
+]
+
+SQLITE_GENERATION_DROP = [
+    "DROP TRIGGER IF EXISTS stats_generation_feeds_ad",
+    "DROP TRIGGER IF EXISTS stats_generation_feeds_au",
+    "DROP TRIGGER IF EXISTS stats_generation_feeds_ai",
+    "DROP TRIGGER IF EXISTS stats_generation_summaries_au",
+    "DROP TRIGGER IF EXISTS stats_generation_articles_ad",
+    "DROP TRIGGER IF EXISTS stats_generation_articles_ai",
+]
+
+# Statement-level: a bulk insert, delete or status update bumps once. The
+# summaries one compares the statement's transition tables, which PostgreSQL
+# only allows without a column list, so it fires on every update and skips
+# the bump when no status changed beyond a claim or release.
+POSTGRES_GENERATION_DDL = [
+    f"""CREATE OR REPLACE FUNCTION stats_generation_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            {BUMP_GENERATION};
+            RETURN NULL;
+        END $$""",
+    f"""CREATE OR REPLACE FUNCTION stats_generation_summaries_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM old_rows JOIN new_rows ON new_rows.id = old_rows.id
+                WHERE old_rows.status IS DISTINCT FROM new_rows.status
+                  AND NOT (old_rows.status IN ({_IN_FLIGHT}) AND new_rows.status IN ({_IN_FLIGHT}))
+            ) THEN
+                {BUMP_GENERATION};
+            END IF;
+            RETURN NULL;
+        END $$""",
+    "DROP TRIGGER IF EXISTS stats_generation_articles ON articles",
+    """CREATE TRIGGER stats_generation_articles AFTER INSERT OR DELETE ON articles
+        FOR EACH STATEMENT EXECUTE FUNCTION stats_generation_trigger()""",
+    "DROP TRIGGER IF EXISTS stats_generation_summaries ON summaries",
+    """CREATE TRIGGER stats_generation_summaries AFTER UPDATE ON summaries
+        REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+        FOR EACH STATEMENT EXECUTE FUNCTION stats_generation_summaries_trigger()""",
+    "DROP TRIGGER IF EXISTS stats_generation_feeds ON feeds",
+    """CREATE TRIGGER stats_generation_feeds AFTER INSERT OR DELETE OR UPDATE ON feeds
+        FOR EACH STATEMENT EXECUTE FUNCTION stats_generation_trigger()""",
+]
+
+POSTGRES_GENERATION_DROP = [
+    "DROP TRIGGER IF EXISTS stats_generation_feeds ON feeds",
+    "DROP TRIGGER IF EXISTS stats_generation_summaries ON summaries",
+    "DROP TRIGGER IF EXISTS stats_generation_articles ON articles",
+    "DROP FUNCTION IF EXISTS stats_generation_summaries_trigger()",
+    "DROP FUNCTION IF EXISTS stats_generation_trigger()",
+]
+
+# One statement, so on PostgreSQL a concurrent trigger update waits for it and applies on top
+_RECONCILE_COUNTERS = "UPDATE stats_counters SET {assignments} WHERE id = 1"
+_RECONCILE_ASSIGNMENTS = [
+    "total_feeds = (SELECT count(*) FROM feeds)",
+    "active_feeds = (SELECT count(*) FROM feeds WHERE is_active)",
+    "total_articles = (SELECT count(*) FROM articles)",
+    *(f"summaries_{s} = (SELECT count(*) FROM summaries WHERE status = '{s}')" for s in SUMMARY_STATUSES),
+    "last_fetch_at = (SELECT max(last_fetched_at) FROM feeds)",
+    "reconciled_at = :now",
+]
+_RECONCILE_BUCKETS = [
+    "DELETE FROM article_hourly_counts",
+    "INSERT INTO article_hourly_counts (hour, count) "
+    "SELECT {hour}, count(*) FROM articles WHERE created_at >= :since GROUP BY {hour}",
+]
+
+
+def floor_hour(moment: datetime) -> datetime:
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def reconcile_statements(dialect: str, now: Optional[datetime] = None) -> list:
+    """(statement, params) pairs that recompute both tables from feeds, articles and summaries"""
+    now = now or datetime.utcnow()
+    hour = (_SQLITE_HOUR if dialect == "sqlite" else _POSTGRES_HOUR).format(column="created_at")
+    since = floor_hour(now - timedelta(hours=BUCKET_RETENTION_HOURS))
+    return [
+        (text(SEED_COUNTERS), {}),
+        (text(_RECONCILE_COUNTERS.format(assignments=", ".join(_RECONCILE_ASSIGNMENTS))), {"now": now}),
+        *((text(sql.format(hour=hour)), {"since": since}) for sql in _RECONCILE_BUCKETS),
+    ]
+
+
+def install_counters(connection, reconcile: bool = True) -> None:
+    """Create the triggers for the connection's dialect and fill the counters from existing rows"""
+    dialect = connection.dialect.name
+    if not inspect(connection).has_table("stats_counters"):
+        return
+    if dialect == "sqlite":
+        for ddl in SQLITE_COUNTERS_DDL:
+            connection.execute(text(ddl))
+    elif dialect == "postgresql":
+        for ddl in POSTGRES_COUNTERS_DDL:
+            connection.exec_driver_sql(ddl)
+    else:
+        return
+    if reconcile:
+        for statement, params in reconcile_statements(dialect):
+            connection.execute(statement, params)
+
+
+def install_generation(connection) -> None:
+    """Create the ingest_generation triggers (the column arrived after the counters)"""
+    if not inspect(connection).has_table("stats_counters"):
+        return
+    columns = {column["name"] for column in inspect(connection).get_columns("stats_counters")}
+    if "ingest_generation" not in columns:
+        return
+    statements = {"sqlite": SQLITE_GENERATION_DDL, "postgresql": POSTGRES_GENERATION_DDL}.get(
+        connection.dialect.name, []
+    )
+    for ddl in statements:
+        connection.exec_driver_sql(ddl)
+
+
+def drop_generation(connection) -> None:
+    statements = {"sqlite": SQLITE_GENERATION_DROP, "postgresql": POSTGRES_GENERATION_DROP}.get(
+        connection.dialect.name, []
+    )
+    for ddl in statements:
+        connection.exec_driver_sql(ddl)
+
+
+def drop_counters(connection) -> None:
+    dialect = connection.dialect.name
+    statements = {"sqlite": SQLITE_COUNTERS_DROP, "postgresql": POSTGRES_COUNTERS_DROP}.get(dialect, [])
+    for ddl in statements:
+        connection.exec_driver_sql(ddl)
+
+
+def register(metadata) -> None:
+    """Keep the triggers in step with metadata.create_all() / drop_all()"""
+    @event.listens_for(metadata, "after_create")
+    def _after_create(target, connection, **kw):
+        install_counters(connection)
+        install_generation(connection)
+
+    @event.listens_for(metadata, "before_drop")
+    def _before_drop(target, connection, **kw):
+        drop_generation(connection)
+        drop_counters(connection)
@@ -1,46 +1,134 @@
-from sqlalchemy import create_engine, text
+from typing import Optional
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
-from app.core.config import get_settings
+from app.core.config import Settings, get_settings
+from app.core import counters, fts
+from app.core.logging import logger
 
 settings = get_settings()
-# NOTE: MVP uses sync SQLAlchemy for simplicity. Future migration to async:
-# - Replace create_engine with create_async_engine
-# - Replace SessionLocal with AsyncSession (async_sessionmaker)
-# - Replace aiosqlite driver for SQLite: sqlite+aiosqlite:///
+
+
+def async_database_url(url: str) -> str:
+    """Swap the sync driver in DATABASE_URL for its asyncio counterpart"""
+    if url.startswith("sqlite:"):
+        return "sqlite+aiosqlite:" + url[len("sqlite:"):]
+    for prefix in ("postgresql+psycopg2:", "postgresql:", "postgres:"):
+        if url.startswith(prefix):
+            return "postgresql+asyncpg:" + url[len(prefix):]
+    return url
+
+
+def sqlite_pragmas(config: Optional[Settings] = None) -> dict:
+    """PRAGMA name -> value for the configured SQLite profile; empty values are skipped"""
+    config = config or settings
+    pragmas = {
+        # Only takes effect before the first table exists (or at the next VACUUM)
+        "auto_vacuum": config.sqlite_auto_vacuum,
+        # journal_mode next: it is persistent and other pragmas don't depend on it
+        "journal_mode": config.sqlite_journal_mode,
+        "synchronous": config.sqlite_synchronous,
+        "busy_timeout": config.sqlite_busy_timeout_ms,
+        "mmap_size": config.sqlite_mmap_size,
+        "cache_size": config.sqlite_cache_size,
+        "temp_store": config.sqlite_temp_store,
+    }
+    return {name: value for name, value in pragmas.items() if value not in ("", None)}
+
+
+def apply_sqlite_pragmas(target: Engine, pragmas: dict) -> None:
+    """Run the PRAGMAs on every new DBAPI connection of a (sync or async) engine"""
+    @event.listens_for(target, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+def pool_options(url: str, config: Optional[Settings] = None) -> dict:
+    """Connection pool sizing for server databases; SQLite keeps SQLAlchemy's defaults"""
+    if url.startswith("sqlite"):
+        return {}
+    config = config or settings
+    return {
+        "pool_size": config.db_pool_size,
+        "max_overflow": config.db_max_overflow,
+        "pool_timeout": config.db_pool_timeout,
+        "pool_recycle": config.db_pool_recycle,
+        "pool_pre_ping": config.db_pool_pre_ping,
+    }
+
+
+_is_sqlite = settings.database_url.startswith("sqlite")
+
+# Sync engine: Alembic, the schema patch below and one-off CLI scripts
 engine = create_engine(
     settings.database_url,
-    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {}
+    connect_args={"check_same_thread": False} if _is_sqlite else {},
+    **pool_options(settings.database_url),
 )
 SessionLocal = sessionmaker(bind=engine)
+
+# Async engine: API routes and background tasks, so queries never block the event loop
+async_engine = create_async_engine(
+    async_database_url(settings.database_url),
+    **pool_options(settings.database_url),
+)
+# Objects stay readable after commit; async sessions can't lazy-load expired attributes
+AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
+if _is_sqlite:
+    apply_sqlite_pragmas(engine, sqlite_pragmas())
+    apply_sqlite_pragmas(async_engine.sync_engine, sqlite_pragmas())
+    fts.register_sqlite_functions(engine)
+    fts.register_sqlite_functions(async_engine.sync_engine)
+
 Base = declarative_base()
+fts.register(Base.metadata)
+counters.register(Base.metadata)
+
 
+# The revision whose schema matches a database created before Alembic tracking
+# plus the source_type column this patch adds; `alembic upgrade head` goes on from there
+LEGACY_SQLITE_REVISION = "9e2f6f4a1a2b"
 
-def _ensure_sqlite_source_type_column() -> None:
+
+def _ensure_sqlite_columns() -> None:
     """
     Backward-compatible schema patch for existing SQLite databases.
-    Existing local DBs were created before Alembic tracking.
+    Existing local DBs were created before Alembic tracking: add the one
+    column they lack and stamp them, so the migrations (not this patch)
+    create everything newer.
     """
-    if not settings.database_url.startswith("sqlite"):
+    if not _is_sqlite:
         return
 
     with engine.begin() as conn:
-        table_exists = conn.execute(
-            text("SELECT name FROM sqlite_master WHERE type='table' AND name='feeds'")
-        ).fetchone()
-        if not table_exists:
+        tables = {
+            row[0] for row in conn.execute(text("SELECT name FROM sqlite_master WHERE type='table'"))
+        }
+        if "alembic_version" in tables or not {"feeds", "articles", "summaries"} <= tables:
+            # Migrations own the schema (or there is none yet for them to build on)
+            return
+        if "priority" in {row[1] for row in conn.execute(text("PRAGMA table_info(summaries)"))}:
+            # Built by metadata.create_all() (scripts, tests): already the current schema
             return
 
         columns = {row[1] for row in conn.execute(text("PRAGMA table_info(feeds)"))}
         if "source_type" not in columns:
             conn.execute(text("ALTER TABLE feeds ADD COLUMN source_type VARCHAR"))
+        conn.execute(text("CREATE TABLE alembic_version (version_num VARCHAR(32) NOT NULL PRIMARY KEY)"))
+        conn.execute(text("INSERT INTO alembic_version VALUES (:revision)"), {"revision": LEGACY_SQLITE_REVISION})
+    logger.warning("legacy_sqlite_stamped", revision=LEGACY_SQLITE_REVISION, next_step="alembic upgrade head")
 
 
-_ensure_sqlite_source_type_column()
+_ensure_sqlite_columns()
 
 # Centralized get_db for all API routes - import from here, don't redefine
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,265 @@
+"""
+Full-text search index DDL, kept outside the ORM models.
+
+SQLite: an FTS5 table `articles_fts` (rowid = articles.id) with the trigram
+tokenizer, so Chinese summaries match on substrings without a segmenter.
+It is an external-content table over the view `articles_fts_source`, so it
+holds only the index, not a second copy of every body. The view reads
+article text and keywords through Python functions every SQLite connection
+must register (register_sqlite_functions()); snippet() and column reads go
+through them too. Triggers on articles, article_bodies and summaries keep
+the index in sync.
+
+PostgreSQL: a weighted `articles.search_vector` tsvector with a GIN index,
+maintained by triggers. CJK characters are spaced out before to_tsvector
+so each becomes a token; queries match them as phrases (see
+app.services.search). Article text is stored compressed in article_bodies,
+which PostgreSQL can't read, so its vector is fed from Python by
+index_body() whenever a body is written (the ArticleBody model does this on
+flush).
+
+Installed by metadata.create_all() (tests, scratch databases); the Alembic
+migrations carry their own copies.
+"""
+import json
+from sqlalchemy import event, text
+from app.utils.compression import decompress_text
+
+# Column order of articles_fts; bm25() weights in app.services.search follow it
+FTS_COLUMNS = ("title", "content", "summary_cn", "one_liner", "keywords")
+
+# SQL functions the view reads through; see register_sqlite_functions(). (SQLite
+# can't rebuild an external-content index over a view that calls json_each.)
+SQLITE_BODY_FUNCTION = "article_body_text"
+SQLITE_KEYWORDS_FUNCTION = "article_keywords_text"
+
+# What articles_fts indexes, one row per article; read back for snippets
+SQLITE_FTS_SOURCE = f"""CREATE VIEW IF NOT EXISTS articles_fts_source AS
+SELECT a.id AS id, a.title AS title, {SQLITE_BODY_FUNCTION}(b.codec, b.data) AS content,
+    s.summary_cn AS summary_cn, s.one_liner AS one_liner, {SQLITE_KEYWORDS_FUNCTION}(s.keywords) AS keywords
+FROM articles a
+LEFT JOIN article_bodies b ON b.article_id = a.id
+LEFT JOIN summaries s ON s.article_id = a.id"""
+
+_SQLITE_FTS_INSERT = (
+    "INSERT INTO articles_fts(rowid, title, content, summary_cn, one_liner, keywords) "
+    "SELECT id, title, content, summary_cn, one_liner, keywords FROM articles_fts_source WHERE id = {ref};"
+)
+# External content: removing a row takes the values it was indexed with
+_SQLITE_FTS_DELETE = (
+    "INSERT INTO articles_fts(articles_fts, rowid, title, content, summary_cn, one_liner, keywords) "
+    "SELECT 'delete', id, title, content, summary_cn, one_liner, keywords FROM articles_fts_source WHERE id = {ref};"
+)
+
+# (trigger name, timing and event, statement) for every write that changes a source row
+_SQLITE_FTS_TRIGGERS = [
+    ("articles_fts_ai", "AFTER INSERT ON articles", _SQLITE_FTS_INSERT.format(ref="new.id")),
+    ("articles_fts_bu", "BEFORE UPDATE OF title ON articles", _SQLITE_FTS_DELETE.format(ref="old.id")),
+    ("articles_fts_au", "AFTER UPDATE OF title ON articles", _SQLITE_FTS_INSERT.format(ref="new.id")),
+    ("articles_fts_bd", "BEFORE DELETE ON articles", _SQLITE_FTS_DELETE.format(ref="old.id")),
+    ("bodies_fts_bi", "BEFORE INSERT ON article_bodies", _SQLITE_FTS_DELETE.format(ref="new.article_id")),
+    ("bodies_fts_ai", "AFTER INSERT ON article_bodies", _SQLITE_FTS_INSERT.format(ref="new.article_id")),
+    ("bodies_fts_bu", "BEFORE UPDATE OF codec, data ON article_bodies", _SQLITE_FTS_DELETE.format(ref="old.article_id")),
+    ("bodies_fts_au", "AFTER UPDATE OF codec, data ON article_bodies", _SQLITE_FTS_INSERT.format(ref="new.article_id")),
+    ("bodies_fts_bd", "BEFORE DELETE ON article_bodies", _SQLITE_FTS_DELETE.format(ref="old.article_id")),
+    ("bodies_fts_ad", "AFTER DELETE ON article_bodies", _SQLITE_FTS_INSERT.format(ref="old.article_id")),
+    ("summaries_fts_bi", "BEFORE INSERT ON summaries", _SQLITE_FTS_DELETE.format(ref="new.article_id")),
+    ("summaries_fts_ai", "AFTER INSERT ON summaries", _SQLITE_FTS_INSERT.format(ref="new.article_id")),
+    ("summaries_fts_bu", "BEFORE UPDATE OF summary_cn, one_liner, keywords ON summaries",
+     _SQLITE_FTS_DELETE.format(ref="old.article_id")),
+    ("summaries_fts_au", "AFTER UPDATE OF summary_cn, one_liner, keywords ON summaries",
+     _SQLITE_FTS_INSERT.format(ref="new.article_id")),
+    ("summaries_fts_bd", "BEFORE DELETE ON summaries", _SQLITE_FTS_DELETE.format(ref="old.article_id")),
+    ("summaries_fts_ad", "AFTER DELETE ON summaries", _SQLITE_FTS_INSERT.format(ref="old.article_id")),
+]
+
+SQLITE_FTS_DDL = [
+    SQLITE_FTS_SOURCE,
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    "title, content, summary_cn, one_liner, keywords, "
+    "content='articles_fts_source', content_rowid='id', tokenize='trigram')",
+] + [
+    f"CREATE TRIGGER IF NOT EXISTS {name} {when} BEGIN\n    {statement}\nEND"
+    for name, when, statement in _SQLITE_FTS_TRIGGERS
+]
+
+SQLITE_FTS_BACKFILL = "INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')"
+
+SQLITE_FTS_DROP = [f"DROP TRIGGER IF EXISTS {name}" for name, _, _ in reversed(_SQLITE_FTS_TRIGGERS)] + [
+    "DROP TABLE IF EXISTS articles_fts",
+    "DROP VIEW IF EXISTS articles_fts_source",
+]
+
+# Hiragana/katakana, CJK ideographs and Hangul; each character becomes a token
+CJK_CLASS = r"[぀-ヿ㐀-䶿一-鿿가-힯]"
+
+_PG_ARTICLE_TRIGGER = """CREATE OR REPLACE FUNCTION articles_search_vector_trigger() RETURNS trigger
+    LANGUAGE plpgsql AS $$
+    DECLARE
+        summary_text text;
+        one_liner_text text;
+        keyword_list json;
+        body_vector tsvector;
+    BEGIN
+        SELECT summary_cn, one_liner, keywords INTO summary_text, one_liner_text, keyword_list
+        FROM summaries WHERE article_id = NEW.id;
+        {body_lookup}
+        NEW.search_vector := article_search_vector(NEW.title, summary_text, one_liner_text, keyword_list)
+            || coalesce(body_vector, ''::tsvector);
+        RETURN NEW;
+    END $$"""
+
+POSTGRES_FTS_DDL = [
+    "ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    f"""CREATE OR REPLACE FUNCTION cjk_spaced(value text) RETURNS text
+        LANGUAGE sql IMMUTABLE AS $$
+            SELECT regexp_replace(coalesce(value, ''), '({CJK_CLASS})', ' \\1 ', 'g')
+        $$""",
+    """CREATE OR REPLACE FUNCTION article_search_vector(
+            title text, summary_cn text, one_liner text, keywords json
+        ) RETURNS tsvector LANGUAGE sql IMMUTABLE AS $$
+            SELECT setweight(to_tsvector('simple', cjk_spaced(title)), 'A')
+                || setweight(to_tsvector('simple', cjk_spaced(
+                    (SELECT string_agg(k, ' ') FROM json_array_elements_text(keywords) AS k))), 'A')
+                || setweight(to_tsvector('simple', cjk_spaced(summary_cn)), 'B')
+                || setweight(to_tsvector('simple', cjk_spaced(one_liner)), 'B')
+        $$""",
+    _PG_ARTICLE_TRIGGER.format(body_lookup=""),
+    """CREATE OR REPLACE FUNCTION summaries_search_vector_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE target integer;
+        BEGIN
+            target := CASE WHEN TG_OP = 'DELETE' THEN OLD.article_id ELSE NEW.article_id END;
+            -- Re-running the articles trigger recomputes the vector with the new summary
+            UPDATE articles SET title = title WHERE id = target;
+            RETURN NULL;
+        END $$""",
+    "DROP TRIGGER IF EXISTS articles_search_vector_update ON articles",
+    """CREATE TRIGGER articles_search_vector_update
+        BEFORE INSERT OR UPDATE OF title ON articles
+        FOR EACH ROW EXECUTE FUNCTION articles_search_vector_trigger()""",
+    "DROP TRIGGER IF EXISTS summaries_search_vector_update ON summaries",
+    """CREATE TRIGGER summaries_search_vector_update
+        AFTER INSERT OR DELETE OR UPDATE OF summary_cn, one_liner, keywords ON summaries
+        FOR EACH ROW EXECUTE FUNCTION summaries_search_vector_trigger()""",
+    "CREATE INDEX IF NOT EXISTS ix_articles_search_vector ON articles USING gin (search_vector)",
+]
+
+# article_bodies' own vector, set by index_body(), joins the article's
+POSTGRES_BODY_FTS_DDL = [
+    "ALTER TABLE article_bodies ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    _PG_ARTICLE_TRIGGER.format(
+        body_lookup="SELECT search_vector INTO body_vector FROM article_bodies WHERE article_id = NEW.id;"
+    ),
+    """CREATE OR REPLACE FUNCTION bodies_search_vector_trigger() RETURNS trigger
+        LANGUAGE plpgsql AS $$
+        DECLARE target integer;
+        BEGIN
+            target := CASE WHEN TG_OP = 'DELETE' THEN OLD.article_id ELSE NEW.article_id END;
+            UPDATE articles SET title = title WHERE id = target;
+            RETURN NULL;
+        END $$""",
+    "DROP TRIGGER IF EXISTS bodies_search_vector_update ON article_bodies",
+    """CREATE TRIGGER bodies_search_vector_update
+        AFTER DELETE OR UPDATE OF search_vector ON article_bodies
+        FOR EACH ROW EXECUTE FUNCTION bodies_search_vector_trigger()""",
+]
+
+POSTGRES_FTS_INDEX_BODY = (
+    "UPDATE article_bodies SET search_vector = "
+    "setweight(to_tsvector('simple', cjk_spaced(left(:content, 100000))), 'D') "
+    "WHERE article_id = :article_id"
+)
+
+# Touching title fires the BEFORE UPDATE trigger, which computes the vector
+POSTGRES_FTS_BACKFILL = "UPDATE articles SET title = title"
+
+POSTGRES_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS bodies_search_vector_update ON article_bodies",
+    "DROP TRIGGER IF EXISTS summaries_search_vector_update ON summaries",
+    "DROP TRIGGER IF EXISTS articles_search_vector_update ON articles",
+    "DROP FUNCTION IF EXISTS bodies_search_vector_trigger()",
+    "DROP FUNCTION IF EXISTS summaries_search_vector_trigger()",
+    "DROP FUNCTION IF EXISTS articles_search_vector_trigger()",
+    "DROP INDEX IF EXISTS ix_articles_search_vector",
+    "ALTER TABLE articles DROP COLUMN IF EXISTS search_vector",
+    "ALTER TABLE IF EXISTS article_bodies DROP COLUMN IF EXISTS search_vector",
+    "DROP FUNCTION IF EXISTS article_search_vector(text, text, text, json)",
+    "DROP FUNCTION IF EXISTS cjk_spaced(text)",
+]
+
+BODY_BACKFILL_CHUNK = 500
+
+
+def index_body(connection, article_id: int, content: str) -> None:
+    """Put an article's (uncompressed) text into the search index
+
+    SQLite's triggers index bodies themselves; only PostgreSQL needs this.
+    """
+    if connection.dialect.name == "postgresql":
+        connection.execute(text(POSTGRES_FTS_INDEX_BODY), {"article_id": article_id, "content": content})
+
+
+def _backfill_bodies(connection) -> None:
+    result = connection.execute(text("SELECT article_id, codec, data FROM article_bodies"))
+    while chunk := result.fetchmany(BODY_BACKFILL_CHUNK):
+        for article_id, codec, data in chunk:
+            index_body(connection, article_id, decompress_text(codec, data))
+
+
+def _body_text(codec, data):
+    return None if data is None else decompress_text(codec, data)
+
+
+def _keywords_text(value):
+    """A summary's keyword list as space-separated text"""
+    try:
+        keywords = json.loads(value) if value else None
+    except ValueError:
+        return None
+    return " ".join(map(str, keywords)) if isinstance(keywords, list) else None
+
+
+def register_sqlite_functions(target) -> None:
+    """Give every new SQLite connection of an engine the functions the index reads through"""
+    @event.listens_for(target, "connect")
+    def _create_functions(dbapi_connection, connection_record):
+        dbapi_connection.create_function(SQLITE_BODY_FUNCTION, 2, _body_text, deterministic=True)
+        dbapi_connection.create_function(SQLITE_KEYWORDS_FUNCTION, 1, _keywords_text, deterministic=True)
+
+
+def install_fts(connection, backfill: bool = True) -> None:
+    """Create the search index for the connection's dialect and fill it from existing rows"""
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'")
+        ).first()
+        for ddl in SQLITE_FTS_DDL:
+            connection.exec_driver_sql(ddl)
+        if backfill and not exists:
+            connection.exec_driver_sql(SQLITE_FTS_BACKFILL)
+    elif dialect == "postgresql":
+        for ddl in POSTGRES_FTS_DDL + POSTGRES_BODY_FTS_DDL:
+            connection.exec_driver_sql(ddl)
+        if backfill:
+            connection.exec_driver_sql(POSTGRES_FTS_BACKFILL)
+            _backfill_bodies(connection)
+
+
+def drop_fts(connection) -> None:
+    dialect = connection.dialect.name
+    statements = {"sqlite": SQLITE_FTS_DROP, "postgresql": POSTGRES_FTS_DROP}.get(dialect, [])
+    for ddl in statements:
+        connection.exec_driver_sql(ddl)
+
+
+def register(metadata) -> None:
+    """Keep the index in step with metadata.create_all() / drop_all()"""
+    @event.listens_for(metadata, "after_create")
+    def _after_create(target, connection, **kw):
+        install_fts(connection)
+
+    @event.listens_for(metadata, "before_drop")
+    def _before_drop(target, connection, **kw):
+        drop_fts(connection)
@@ -0,0 +1,94 @@
+"""
+Conditional GET for read endpoints, validated by the data generation.
+
+Every write the read API can observe bumps stats_counters.ingest_generation
+(triggers, see app.core.counters), whichever process makes it. The API keeps
+the last value it read for `http_cache_generation_ttl` seconds, so a
+request whose If-None-Match still matches is answered 304 before the
+endpoint runs and without a query.
+
+The strong ETag covers the generation, the path and query string, and for
+endpoints whose answer slides with the clock (`window_seconds`) the current
+time bucket. Cache-Control lets the browser and nginx reuse a response for
+`http_cache_max_age` seconds and revalidate it cheaply afterwards.
+"""
+import hashlib
+import time
+from typing import Optional
+from fastapi import Depends, HTTPException, Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.core.db import get_db
+from app.models import StatsCounters
+
+settings = get_settings()
+
+# Part of every tag, so a deploy that changes response shapes can't revalidate old bodies
+REPRESENTATION_VERSION = "1"
+
+
+class DataGeneration:
+    """Process-local copy of the data generation, re-read at most once per `ttl` seconds"""
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._value: Optional[tuple] = None
+        self._read_at = 0.0
+
+    async def current(self, db: AsyncSession) -> Optional[tuple]:
+        if self._value is not None and time.monotonic() - self._read_at < self.ttl:
+            return self._value
+        row = (await db.execute(
+            select(StatsCounters.ingest_generation, StatsCounters.reconciled_at).where(StatsCounters.id == 1)
+        )).first()
+        # reconciled_at tells a recreated or restored database (generation back at 0) apart
+        self._value = (row.ingest_generation, str(row.reconciled_at)) if row else None
+        self._read_at = time.monotonic()
+        return self._value
+
+    def invalidate(self) -> None:
+        self._value = None
+
+
+generation = DataGeneration(settings.http_cache_generation_ttl)
+
+
+def make_etag(data_generation: tuple, request: Request, window_seconds: Optional[int] = None) -> str:
+    parts = [REPRESENTATION_VERSION, *map(str, data_generation), request.url.path, str(request.query_params)]
+    if window_seconds:
+        parts.append(str(int(time.time() // window_seconds)))
+    return '"' + hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest()[:20] + '"'
+
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag in candidates
+
+
+def cache_control() -> str:
+    max_age = settings.http_cache_max_age
+    return f"public, max-age={max_age}, must-revalidate" if max_age > 0 else "no-cache"
+
+
+def conditional(window_seconds: Optional[int] = None):
+    """Route dependency: set ETag/Cache-Control, or end the request with 304 Not Modified
+
+    Add it through `dependencies=[...]` on the route so it runs before the
+    endpoint's own parameters.
+    """
+    async def check(request: Request, response: Response, db: AsyncSession = Depends(get_db)) -> None:
+        data_generation = await generation.current(db)
+        if data_generation is None:
+            return
+        etag = make_etag(data_generation, request, window_seconds)
+        headers = {"ETag": etag, "Cache-Control": cache_control()}
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers=headers)
+        response.headers.update(headers)
+
+    return check
@@ -0,0 +1,30 @@
+"""
+orjson-backed JSON response class, the app's default when JSON_RESPONSE=orjson.
+
+Routes with a response_model are already written to bytes by pydantic-core
+under the stock default; setting a response class routes them through
+jsonable data and this encoder instead. Measure with
+scripts/benchmark_responses.py before switching.
+"""
+from typing import Any
+from fastapi.responses import JSONResponse
+from app.core.logging import logger
+
+try:
+    import orjson
+except ImportError:  # Optional; `pip install orjson`
+    orjson = None
+
+
+class ORJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+def default_response_class(name: str):
+    """Response class for JSON_RESPONSE, or None for FastAPI's pydantic-core path"""
+    if name == "orjson":
+        if orjson is not None:
+            return ORJSONResponse
+        logger.warning("json_response_fallback", requested="orjson", reason="orjson package not installed")
+    return None
@@ -3,17 +3,21 @@ RSS Web Reader API - Main FastAPI Application
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.compression import CompressionMiddleware
 from app.core.config import get_settings
+from app.core.responses import default_response_class
 from app.api import health, articles, feeds, stats, recommendations
 
 def create_app() -> FastAPI:
     """Create and configure FastAPI application"""
     settings = get_settings()
 
+    response_class = default_response_class(settings.json_response)
     app = FastAPI(
         title="RSS Web Reader API",
         description="AI-powered RSS feed aggregator with Chinese summaries",
-        version="1.0.0"
+        version="1.0.0",
+        **({"default_response_class": response_class} if response_class else {}),
     )
 
     # CORS middleware for frontend - allow localhost ports for development
@@ -34,6 +38,15 @@ def create_app() -> FastAPI:
         allow_headers=["*"],
     )
 
+    if settings.compression_enabled:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.compression_minimum_size,
+            gzip_level=settings.compression_gzip_level,
+            brotli_enabled=settings.compression_brotli,
+            brotli_level=settings.compression_brotli_level,
+        )
+
     # Register routers
     app.include_router(health.router, tags=["health"])
     app.include_router(articles.router, prefix="/api/articles", tags=["articles"])
@@ -1,6 +1,14 @@
 from app.models.feed import Feed
 from app.models.article import Article
+from app.models.article_body import ArticleBody
 from app.models.summary import Summary
+from app.models.summary_batch import SummaryBatch
 from app.models.recommendation import Recommendation
+from app.models.article_keyword import ArticleKeyword
+from app.models.archive import ArchivedArticle, ArchivedSummary
+from app.models.stats import StatsCounters, ArticleHourlyCount
 
-__all__ = ["Feed", "Article", "Summary", "Recommendation"]
+__all__ = [
+    "Feed", "Article", "ArticleBody", "Summary", "SummaryBatch", "Recommendation", "ArticleKeyword",
+    "ArchivedArticle", "ArchivedSummary", "StatsCounters", "ArticleHourlyCount",
+]
@@ -0,0 +1,44 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Float, LargeBinary
+from datetime import datetime
+from app.core.db import Base
+
+
+class ArchivedArticle(Base):
+    """Article moved out of the live tables by retention (app.tasks.retention)
+
+    Keeps its original id so /api/articles/{id} still resolves, and the
+    compressed body inline since the archive is only read one row at a time.
+    """
+    __tablename__ = "archived_articles"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    content_hash = Column(String, nullable=False, index=True)  # Fetcher dedup, see RSSFetcher
+    url = Column(String, nullable=False)
+    title = Column(String, nullable=False)
+    author = Column(String, nullable=True)
+    language = Column(String, nullable=True)
+    published_at = Column(DateTime, nullable=True)
+    feed_id = Column(Integer, nullable=False)  # No FK: feeds may be deleted after archiving
+    created_at = Column(DateTime, nullable=True)
+    body_codec = Column(String, nullable=True)
+    body_data = Column(LargeBinary, nullable=True)
+    archived_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ArchivedSummary(Base):
+    __tablename__ = "archived_summaries"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    article_id = Column(Integer, nullable=False, unique=True)
+    status = Column(String, nullable=True)
+    triage = Column(String, nullable=True)
+    triage_reason = Column(String, nullable=True)
+    summary_cn = Column(Text, nullable=True)
+    one_liner = Column(String, nullable=True)
+    keywords = Column(JSON, nullable=True)
+    model_version = Column(String, nullable=True)
+    input_tokens = Column(Integer, nullable=True)
+    output_tokens = Column(Integer, nullable=True)
+    cost_usd = Column(Float, nullable=True)
+    processed_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, nullable=True)
@@ -1,17 +1,28 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.core.db import Base
 
 class Article(Base):
     __tablename__ = "articles"
+    __table_args__ = (
+        # /latest range scan and keyset paging; id breaks published_at ties
+        Index("ix_articles_published_at_id", "published_at", "id"),
+        # Per-feed listing, newest first
+        Index("ix_articles_feed_id_published_at_id", "feed_id", "published_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
     content_hash = Column(String, unique=True, nullable=False, index=True)
-    url = Column(String, nullable=False)
+    url = Column(String, nullable=False, index=True)  # Duplicate lookups during triage
     title = Column(String, nullable=False)
-    content = Column(Text, nullable=True)
     author = Column(String, nullable=True)
-    language = Column(String, default="en")
+    language = Column(String, default="en")  # Detected at ingest, see app.utils.language
     published_at = Column(DateTime, nullable=True)
     feed_id = Column(Integer, ForeignKey("feeds.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+    # Text lives in article_bodies; never lazy-loaded so list queries can't drag it in
+    body = relationship(
+        "ArticleBody", uselist=False, lazy="raise", cascade="all, delete-orphan", passive_deletes=True
+    )
@@ -0,0 +1,37 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, LargeBinary, event
+from app.core import fts
+from app.core.db import Base
+from app.utils.compression import compress_text, decompress_text
+
+
+class ArticleBody(Base):
+    """Article text, compressed and kept out of the hot `articles` rows
+
+    Only the detail endpoint and the AI paths load it; set `text` and the
+    codec/payload follow. On PostgreSQL, writing a body also feeds the search
+    index, which cannot read the compressed payload itself (see app.core.fts).
+    """
+    __tablename__ = "article_bodies"
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    codec = Column(String, nullable=False)  # zlib/raw, see app.utils.compression
+    data = Column(LargeBinary, nullable=False)
+    size = Column(Integer, nullable=False)  # Uncompressed UTF-8 bytes
+
+    @property
+    def text(self) -> str:
+        if self.data is None:
+            return ""
+        return decompress_text(self.codec, self.data)
+
+    @text.setter
+    def text(self, value: str) -> None:
+        value = value or ""
+        self.codec, self.data = compress_text(value)
+        self.size = len(value.encode("utf-8"))
+
+
+@event.listens_for(ArticleBody, "after_insert")
+@event.listens_for(ArticleBody, "after_update")
+def _index_body(mapper, connection, target: ArticleBody) -> None:
+    fts.index_body(connection, target.article_id, target.text)
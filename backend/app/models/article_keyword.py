@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from app.core.db import Base
+
+
+class ArticleKeyword(Base):
+    """One row per (article, keyword) of a completed summary; see app.services.keywords
+
+    feed_id and published_at are copied from the article so tag filters and
+    facet counts are answered from this table's indexes alone.
+    """
+    __tablename__ = "article_keywords"
+    __table_args__ = (
+        # ?tag= filter, newest first
+        Index("ix_article_keywords_keyword_published_at", "keyword", "published_at"),
+        # Facet counts: range scan on the window, covering feed_id + keyword
+        Index("ix_article_keywords_published_at_feed_id_keyword", "published_at", "feed_id", "keyword"),
+    )
+
+    article_id = Column(Integer, ForeignKey("articles.id", ondelete="CASCADE"), primary_key=True)
+    keyword = Column(String, primary_key=True)  # Normalized, see normalize_keyword()
+    feed_id = Column(Integer, ForeignKey("feeds.id"), nullable=False)
+    published_at = Column(DateTime, nullable=False)  # Article published_at, else created_at
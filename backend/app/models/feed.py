@@ -9,7 +9,7 @@ class Feed(Base):
     url = Column(String, unique=True, nullable=False)
     title = Column(String, nullable=False)
     description = Column(String, nullable=True)
-    category = Column(String, nullable=True)
+    category = Column(String, nullable=True, index=True)
     source_type = Column(String, nullable=True)
     is_active = Column(Boolean, default=True)
     skip_ssl_verification = Column(Boolean, default=False)  # Per-feed SSL bypass for problematic feeds
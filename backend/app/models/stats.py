@@ -0,0 +1,42 @@
+from sqlalchemy import BigInteger, Column, Integer, DateTime
+from app.core.db import Base
+
+
+class StatsCounters(Base):
+    """Single row (id=1) of running totals behind /api/stats
+
+    Kept current by triggers on feeds, articles and summaries (app.core.counters)
+    and corrected by app.tasks.counters.reconcile.
+    """
+    __tablename__ = "stats_counters"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    # Bumped whenever a filtered listing total may have changed
+    ingest_generation = Column(BigInteger, nullable=False, default=0, server_default="0")
+    total_feeds = Column(Integer, nullable=False, default=0)
+    active_feeds = Column(Integer, nullable=False, default=0)
+    total_articles = Column(Integer, nullable=False, default=0)
+    summaries_pending = Column(Integer, nullable=False, default=0)
+    summaries_batched = Column(Integer, nullable=False, default=0)
+    summaries_completed = Column(Integer, nullable=False, default=0)
+    summaries_failed = Column(Integer, nullable=False, default=0)
+    summaries_skipped = Column(Integer, nullable=False, default=0)
+    last_fetch_at = Column(DateTime, nullable=True)
+    reconciled_at = Column(DateTime, nullable=True)
+
+    def summaries_by_status(self) -> dict:
+        return {
+            "pending": self.summaries_pending,
+            "batched": self.summaries_batched,
+            "completed": self.summaries_completed,
+            "failed": self.summaries_failed,
+            "skipped": self.summaries_skipped,
+        }
+
+
+class ArticleHourlyCount(Base):
+    """Articles created per UTC hour; the rolling 24 h count sums the last buckets"""
+    __tablename__ = "article_hourly_counts"
+
+    hour = Column(DateTime, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
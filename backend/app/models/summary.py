@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, JSON, Float, Index
 from datetime import datetime
 from app.core.db import Base
 
@@ -7,11 +7,39 @@ class Summary(Base):
 
     id = Column(Integer, primary_key=True)
     article_id = Column(Integer, ForeignKey("articles.id"), unique=True, nullable=False)
-    status = Column(String, default="pending")  # pending/completed/failed
+    status = Column(String, default="pending", index=True)  # pending/batched/completed/failed/skipped
+    # Ingest triage route (summarize/one_liner/skipped) and why; see app.tasks.triage
+    triage = Column(String, default="summarize", nullable=True)
+    triage_reason = Column(String, nullable=True)
+    priority = Column(Float, default=0.0, nullable=False)  # Hours-since-epoch score, higher first
     summary_cn = Column(Text, nullable=True)
     one_liner = Column(String, nullable=True)
     # JSON type works with both SQLite and PostgreSQL (no migration needed)
     keywords = Column(JSON, nullable=True)  # Stores ["kw1", "kw2", ...]
     model_version = Column(String, nullable=True)
     error = Column(Text, nullable=True)
+    # Provider accounting for the call that produced (or failed) this summary
+    input_tokens = Column(Integer, nullable=True)
+    output_tokens = Column(Integer, nullable=True)
+    cache_read_tokens = Column(Integer, nullable=True)
+    cache_write_tokens = Column(Integer, nullable=True)
+    latency_ms = Column(Integer, nullable=True)
+    attempts = Column(Integer, nullable=True)
+    cost_usd = Column(Float, nullable=True)
+    processed_at = Column(DateTime, nullable=True, index=True)
+    # Set while the summary is in flight in a provider batch (status "batched");
+    # a realtime call in flight is "batched" with no batch_id, claimed at claimed_at
+    batch_id = Column(Integer, ForeignKey("summary_batches.id"), nullable=True, index=True)
+    claimed_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+
+
+# Processor drains pending rows by priority (see app.tasks.priority); the
+# partial index only holds the queue, not the much larger completed history
+Index(
+    "ix_summaries_pending_priority",
+    Summary.priority.desc(),
+    Summary.id,
+    sqlite_where=Summary.status == "pending",
+    postgresql_where=Summary.status == "pending",
+)
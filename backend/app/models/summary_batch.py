@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text
+from datetime import datetime
+from app.core.db import Base
+
+
+class SummaryBatch(Base):
+    """Provider-side batch job summarizing many pending articles (backfill mode)"""
+    __tablename__ = "summary_batches"
+
+    id = Column(Integer, primary_key=True)
+    provider_batch_id = Column(String, unique=True, nullable=True)  # Set once the provider accepts it
+    status = Column(String, default="submitting", index=True)  # submitting/submitted/collected/abandoned
+    request_count = Column(Integer, default=0)
+    succeeded = Column(Integer, default=0)
+    errored = Column(Integer, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    submitted_at = Column(DateTime, nullable=True)
+    collected_at = Column(DateTime, nullable=True)
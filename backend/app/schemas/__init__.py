@@ -2,12 +2,17 @@ from app.schemas.feed import FeedCreate, FeedResponse
 from app.schemas.article import (
     ArticleListItem,
     ArticleDetail,
-    PaginatedArticlesResponse
+    PaginatedArticlesResponse,
+    SearchHit,
+    SearchResponse,
+    KeywordFacet,
+    KeywordFacetsResponse,
 )
-from app.schemas.summary import SummaryResponse, StatsResponse
+from app.schemas.summary import SummaryResponse, StatsResponse, UsageStatsResponse
 
 __all__ = [
     "FeedCreate", "FeedResponse",
     "ArticleListItem", "ArticleDetail", "PaginatedArticlesResponse",
-    "SummaryResponse", "StatsResponse",
+    "SearchHit", "SearchResponse", "KeywordFacet", "KeywordFacetsResponse",
+    "SummaryResponse", "StatsResponse", "UsageStatsResponse",
 ]
@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from datetime import datetime
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 class ArticleListItem(BaseModel):
     id: int
@@ -13,6 +13,12 @@ class ArticleListItem(BaseModel):
     feed_title: str
     feed_category: Optional[str] = None
 
+    @field_validator("keywords", mode="before")
+    @classmethod
+    def _no_keywords(cls, value):
+        # Straight from an outer join: NULL until the summary exists
+        return value if value is not None else []
+
 class ArticleDetail(BaseModel):
     id: int
     title: str
@@ -27,10 +33,35 @@ class ArticleDetail(BaseModel):
     feed_title: str
     source_type: Optional[str] = None
     author: Optional[str] = None
+    archived: bool = False  # Moved out of the live tables by retention
 
 class PaginatedArticlesResponse(BaseModel):
     items: List[ArticleListItem]
     total: int
+    total_approximate: bool = False  # Estimated past ARTICLES_TOTAL_EXACT_LIMIT
     page: int
     page_size: int
     has_next: bool
+    next_cursor: Optional[str] = None
+
+class SearchHit(ArticleListItem):
+    snippet: Optional[str] = None  # HTML-escaped; matches wrapped in <mark>
+    rank: float = 0.0
+
+class SearchResponse(BaseModel):
+    query: str
+    items: List[SearchHit]
+    total: int
+    page: int
+    page_size: int
+    has_next: bool
+
+class KeywordFacet(BaseModel):
+    keyword: str  # Normalized (case-folded); pass back as ?tag=
+    count: int
+    categories: Dict[str, int] = {}  # Per feed category; uncategorized feeds under ""
+
+class KeywordFacetsResponse(BaseModel):
+    window_hours: int
+    category: Optional[str] = None
+    items: List[KeywordFacet]
@@ -20,5 +20,31 @@ class StatsResponse(BaseModel):
     summaries_pending: int
     summaries_failed: int
     summaries_completed: int
+    summaries_skipped: int = 0
     last_fetch_at: Optional[str] = None
     completion_rate: float
+
+class UsageStatsResponse(BaseModel):
+    window_hours: int
+    summaries_processed: int
+    input_tokens: int
+    output_tokens: int
+    cache_read_tokens: int
+    cache_write_tokens: int
+    estimated_cost_usd: float
+    avg_latency_ms: Optional[float] = None
+    p95_latency_ms: Optional[int] = None
+    avg_attempts: Optional[float] = None
+    daily_token_budget: int
+    tokens_used_today: int
+    budget_exhausted: bool
+
+class CacheMetrics(BaseModel):
+    name: str
+    entries: int
+    max_entries: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    coalesced: int
+    evictions: int
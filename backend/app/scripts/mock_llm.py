@@ -0,0 +1,370 @@
+"""
+Local stand-in for the Anthropic-compatible and Zhipu chat endpoints,
+including the Message Batches create/retrieve/results endpoints.
+
+Used by tests and scripts/benchmark_processor.py to exercise AIProcessor
+without spending money. Latency, 429/500 injection and malformed-JSON rates
+are configurable, and a prompt cache is simulated for system blocks marked
+with cache_control.
+
+    python -m app.scripts.mock_llm --port 8900 --latency-ms 800 --rate-429 0.05
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+MOCK_SUMMARY = {
+    "summary": "这是一段由本地模拟服务生成的中文摘要，用于压测与测试。",
+    "one_liner": "本地模拟摘要，无需真实调用",
+    "keywords": ["模拟", "压测", "摘要"],
+}
+
+
+@dataclass
+class MockLLMConfig:
+    latency_ms: float = 0.0
+    # "fixed", "uniform" (latency_ms ± jitter_ms) or "lognormal" (median latency_ms)
+    latency_distribution: str = "fixed"
+    jitter_ms: float = 0.0
+    rate_429: float = 0.0
+    rate_500: float = 0.0
+    # Repairable defects (fences, trailing comma, prose) in a text answer
+    malformed_rate: float = 0.0
+    # Prose with no JSON at all - cannot be repaired
+    unparseable_rate: float = 0.0
+    # Message Batches stay "in_progress" this long after creation
+    batch_processing_seconds: float = 0.0
+    seed: Optional[int] = None
+
+
+@dataclass
+class MockLLMCounters:
+    requests: int = 0
+    ok: int = 0
+    rate_limited: int = 0
+    server_errors: int = 0
+    malformed: int = 0
+    unparseable: int = 0
+    cache_hits: int = 0
+    batches: int = 0
+    by_path: dict = field(default_factory=dict)
+
+
+def _estimate_tokens(text: str) -> int:
+    # Rough mix of CJK (~1 token/char) and English (~4 chars/token)
+    return max(1, len(text) // 3)
+
+
+class MockLLMServer:
+    """Threaded HTTP server; each request sleeps on its own thread"""
+
+    def __init__(self, config: Optional[MockLLMConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or MockLLMConfig()
+        self.counters = MockLLMCounters()
+        self._lock = threading.Lock()
+        self._random = random.Random(self.config.seed)
+        self._cached_prefixes: set[str] = set()
+        self._batches: dict[str, dict] = {}
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def zhipu_url(self) -> str:
+        return f"{self.url}/api/paas/v4"
+
+    def start(self) -> "MockLLMServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Block serving requests (standalone mode)"""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "MockLLMServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # -- behaviour ---------------------------------------------------------
+
+    def _latency_seconds(self) -> float:
+        cfg = self.config
+        with self._lock:
+            if cfg.latency_distribution == "uniform":
+                ms = self._random.uniform(cfg.latency_ms - cfg.jitter_ms, cfg.latency_ms + cfg.jitter_ms)
+            elif cfg.latency_distribution == "lognormal" and cfg.latency_ms > 0:
+                sigma = cfg.jitter_ms / cfg.latency_ms if cfg.jitter_ms else 0.5
+                ms = self._random.lognormvariate(0, sigma) * cfg.latency_ms
+            else:
+                ms = cfg.latency_ms
+        return max(ms, 0.0) / 1000
+
+    def _roll(self) -> str:
+        """Pick the outcome for one request"""
+        cfg = self.config
+        with self._lock:
+            x = self._random.random()
+        for outcome, rate in (
+            ("429", cfg.rate_429),
+            ("500", cfg.rate_500),
+            ("malformed", cfg.malformed_rate),
+            ("unparseable", cfg.unparseable_rate),
+        ):
+            if x < rate:
+                return outcome
+            x -= rate
+        return "ok"
+
+    def _answer_text(self, outcome: str) -> str:
+        body = json.dumps(MOCK_SUMMARY, ensure_ascii=False)
+        if outcome == "malformed":
+            return f"好的，以下是摘要：\n```json\n{body[:-1]},}}\n```\n希望对你有帮助。"
+        if outcome == "unparseable":
+            return "抱歉，我无法处理这篇文章。"
+        return body
+
+    def _cache_usage(self, body: dict) -> tuple[int, int, int]:
+        """(cache_write, cache_read, uncached) tokens for the static prefix"""
+        system = body.get("system")
+        cacheable = isinstance(system, list) and any("cache_control" in b for b in system)
+        prefix_text = json.dumps([body.get("tools"), system], sort_keys=True, ensure_ascii=False)
+        prefix_tokens = _estimate_tokens(prefix_text)
+        if not cacheable:
+            return 0, 0, prefix_tokens
+        with self._lock:
+            hit = prefix_text in self._cached_prefixes
+            self._cached_prefixes.add(prefix_text)
+            if hit:
+                self.counters.cache_hits += 1
+        return (0, prefix_tokens, 0) if hit else (prefix_tokens, 0, 0)
+
+    def _anthropic_response(self, body: dict, outcome: str) -> dict:
+        user_text = json.dumps(body.get("messages", []), ensure_ascii=False)
+        cache_write, cache_read, uncached = self._cache_usage(body)
+        if outcome == "ok" and body.get("tools"):
+            tool = body["tools"][0]
+            fields = tool.get("input_schema", {}).get("properties", MOCK_SUMMARY)
+            content = [{
+                "type": "tool_use",
+                "id": "toolu_mock",
+                "name": tool["name"],
+                "input": {key: value for key, value in MOCK_SUMMARY.items() if key in fields},
+            }]
+        else:
+            content = [{"type": "text", "text": self._answer_text(outcome)}]
+        return {
+            "id": f"msg_mock_{self.counters.requests}",
+            "type": "message",
+            "role": "assistant",
+            "model": body.get("model", "mock"),
+            "content": content,
+            "stop_reason": "tool_use" if content[0]["type"] == "tool_use" else "end_turn",
+            "stop_sequence": None,
+            "usage": {
+                "input_tokens": _estimate_tokens(user_text) + uncached,
+                "output_tokens": _estimate_tokens(json.dumps(MOCK_SUMMARY, ensure_ascii=False)),
+                "cache_creation_input_tokens": cache_write,
+                "cache_read_input_tokens": cache_read,
+            },
+        }
+
+    def _zhipu_response(self, body: dict, outcome: str) -> dict:
+        prompt_text = json.dumps(body.get("messages", []), ensure_ascii=False)
+        text = self._answer_text(outcome)
+        return {
+            "id": f"chatcmpl_mock_{self.counters.requests}",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": text},
+            }],
+            "usage": {
+                "prompt_tokens": _estimate_tokens(prompt_text),
+                "completion_tokens": _estimate_tokens(text),
+                "total_tokens": _estimate_tokens(prompt_text) + _estimate_tokens(text),
+            },
+        }
+
+    # -- Message Batches -----------------------------------------------------
+
+    def _batch_payload(self, batch_id: str) -> dict:
+        batch = self._batches[batch_id]
+        ended = time.time() - batch["created"] >= self.config.batch_processing_seconds
+        counts = {"processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0}
+        if ended:
+            for line in batch["results"]:
+                counts[line["result"]["type"]] += 1
+        else:
+            counts["processing"] = len(batch["results"])
+        created = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(batch["created"]))
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": counts,
+            "created_at": created,
+            "expires_at": created,
+            "ended_at": created if ended else None,
+            "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{self.url}/v1/messages/batches/{batch_id}/results" if ended else None,
+        }
+
+    def _create_batch(self, body: dict) -> tuple[int, dict]:
+        """Answer every request up front; results are released once the batch 'ends'"""
+        results = []
+        for request in body.get("requests", []):
+            outcome = self._roll()
+            if outcome in ("429", "500"):
+                result = {"type": "errored", "error": {
+                    "type": "error",
+                    "error": {"type": "api_error", "message": f"mock {outcome}"},
+                }}
+            else:
+                result = {"type": "succeeded", "message": self._anthropic_response(request["params"], outcome)}
+            results.append({"custom_id": request["custom_id"], "result": result})
+
+        with self._lock:
+            self.counters.batches += 1
+            batch_id = f"msgbatch_mock_{self.counters.batches}"
+            self._batches[batch_id] = {"created": time.time(), "results": results}
+        return 200, self._batch_payload(batch_id)
+
+    def handle_get(self, path: str) -> tuple[int, object]:
+        """Batch list, retrieve and JSONL results; returns (status, dict or bytes)"""
+        parts = path.strip("/").split("/")
+        if parts == ["v1", "messages", "batches"]:
+            # Newest first, all on one page
+            data = [self._batch_payload(batch_id) for batch_id in reversed(list(self._batches))]
+            return 200, {"data": data, "has_more": False,
+                         "first_id": data[0]["id"] if data else None, "last_id": data[-1]["id"] if data else None}
+        if parts[:3] != ["v1", "messages", "batches"] or len(parts) < 4 or parts[3] not in self._batches:
+            return 404, {"type": "error", "error": {"type": "not_found_error", "message": path}}
+        if len(parts) == 5 and parts[4] == "results":
+            lines = self._batches[parts[3]]["results"]
+            return 200, "\n".join(json.dumps(line, ensure_ascii=False) for line in lines).encode()
+        return 200, self._batch_payload(parts[3])
+
+    def handle(self, path: str, body: dict) -> tuple[int, dict]:
+        """Route one POST request; returns (status, payload)"""
+        with self._lock:
+            self.counters.requests += 1
+            self.counters.by_path[path] = self.counters.by_path.get(path, 0) + 1
+
+        if path.endswith("/v1/messages/batches"):
+            return self._create_batch(body)
+
+        time.sleep(self._latency_seconds())
+        outcome = self._roll()
+
+        if outcome == "429":
+            with self._lock:
+                self.counters.rate_limited += 1
+            return 429, {"type": "error", "error": {"type": "rate_limit_error", "message": "mock rate limit"}}
+        if outcome == "500":
+            with self._lock:
+                self.counters.server_errors += 1
+            return 500, {"type": "error", "error": {"type": "api_error", "message": "mock server error"}}
+
+        with self._lock:
+            if outcome == "malformed":
+                self.counters.malformed += 1
+            elif outcome == "unparseable":
+                self.counters.unparseable += 1
+            else:
+                self.counters.ok += 1
+
+        if path.endswith("/v1/messages"):
+            return 200, self._anthropic_response(body, outcome)
+        if path.endswith("/chat/completions"):
+            return 200, self._zhipu_response(body, outcome)
+        return 404, {"error": {"message": f"unknown path {path}"}}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, payload) -> None:
+                if isinstance(payload, bytes):
+                    data, content_type = payload, "application/x-jsonl"
+                else:
+                    data, content_type = json.dumps(payload, ensure_ascii=False).encode(), "application/json"
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b"{}"
+                path = self.path.split("?", 1)[0]
+                self._send(*server.handle(path, json.loads(raw or b"{}")))
+
+            def do_GET(self):
+                self._send(*server.handle_get(self.path.split("?", 1)[0]))
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a local mock LLM endpoint")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency-ms", type=float, default=500)
+    parser.add_argument("--distribution", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--jitter-ms", type=float, default=250)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-500", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--unparseable-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    config = MockLLMConfig(
+        latency_ms=args.latency_ms,
+        latency_distribution=args.distribution,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        rate_500=args.rate_500,
+        malformed_rate=args.malformed_rate,
+        unparseable_rate=args.unparseable_rate,
+    )
+    server = MockLLMServer(config, host=args.host, port=args.port)
+    print(f"Mock LLM listening on {server.url}")
+    print(f"  ANTHROPIC_BASE_URL={server.url}")
+    print(f"  Zhipu base_url={server.zhipu_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,165 @@
+import json
 import os
+from typing import Optional
+import anthropic
 from anthropic import AsyncAnthropic
-from tenacity import retry, stop_after_attempt, wait_exponential
 from app.core.config import get_settings
 from app.core import logger
-from app.services.base import BaseAIService
+from app.services.base import BaseAIService, SummaryParseError, SUMMARY_SCHEMA, ONE_LINER_SCHEMA
 
 settings = get_settings()
 
+SUMMARY_TOOL = {
+    "name": "record_summary",
+    "description": "记录文章的中文摘要、一句话推荐理由和关键词",
+    "input_schema": SUMMARY_SCHEMA,
+}
+
+# Anthropic ignores a cache breakpoint on a shorter prefix (1024 tokens for
+# Sonnet/Opus, 2048 for Haiku): caching is asked for but never happens
+MIN_CACHEABLE_PREFIX_TOKENS = 1024
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough count without a tokenizer: ~4 ASCII chars per token, ~1 per CJK char"""
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return ascii_chars // 4 + (len(text) - ascii_chars)
+
+
+ONE_LINER_TOOL = {
+    "name": "record_one_liner",
+    "description": "记录文章的一句话推荐理由和关键词",
+    "input_schema": ONE_LINER_SCHEMA,
+}
+
 
 class ClaudeService(BaseAIService):
     """Claude/Zhipu AI service via Anthropic-compatible endpoint"""
 
-    def __init__(self):
+    retryable_errors = (
+        anthropic.APIConnectionError,  # includes APITimeoutError
+        anthropic.RateLimitError,
+        anthropic.InternalServerError,
+    )
+    _prefix_checked = False
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+        super().__init__()
         # Support Zhipu via Anthropic-compatible endpoint
-        api_key = settings.anthropic_api_key or os.getenv("ANTHROPIC_API_KEY") or settings.claude_api_key
-        base_url = settings.anthropic_base_url or os.getenv("ANTHROPIC_BASE_URL")
+        api_key = api_key or settings.anthropic_api_key or os.getenv("ANTHROPIC_API_KEY") or settings.claude_api_key
+        base_url = base_url or settings.anthropic_base_url or os.getenv("ANTHROPIC_BASE_URL")
 
         self.client = AsyncAnthropic(
             api_key=api_key,
-            base_url=base_url  # None uses default, or set to Zhipu's endpoint
+            base_url=base_url,  # None uses default, or set to Zhipu's endpoint
+            max_retries=0,  # Retries are handled (and counted) by _call_with_retry
         )
         # Model name - Zhipu's Anthropic-compatible endpoint maps this internally
         self.model = "claude-3-5-sonnet-20241022"
+        if settings.claude_prompt_cache and not ClaudeService._prefix_checked:
+            ClaudeService._prefix_checked = True  # Once per process, not per processor run
+            self._check_cacheable_prefix()
+
+    def _system_blocks(self, one_liner_only: bool = False) -> list[dict]:
+        """System prompt as a content block carrying the cache breakpoint.
+
+        The cached prefix covers the tool definition and the system prompt;
+        the per-article user message is the only uncached part. Anthropic
+        only caches it from MIN_CACHEABLE_PREFIX_TOKENS up; the service logs
+        a warning at start when the prefix is shorter.
+        """
+        block = {"type": "text", "text": self._build_system_prompt(one_liner_only)}
+        if settings.claude_prompt_cache:
+            block["cache_control"] = {"type": "ephemeral"}
+        return [block]
+
+    def cacheable_prefix_tokens(self, one_liner_only: bool = False) -> int:
+        """Estimated size of the prefix the cache breakpoint covers (tools, then system)"""
+        params = self.request_params("", "", one_liner_only)
+        return estimate_tokens(json.dumps([params["tools"], params["system"]], ensure_ascii=False))
 
-    @retry(wait=wait_exponential(min=1, max=60), stop=stop_after_attempt(5))
-    async def summarize(self, title: str, content: str) -> dict:
-        """Generate summary for article"""
-        prompt = self._build_prompt(title, content)
+    def _check_cacheable_prefix(self) -> None:
+        for one_liner_only in (False, True):
+            tokens = self.cacheable_prefix_tokens(one_liner_only)
+            if tokens < MIN_CACHEABLE_PREFIX_TOKENS:
+                # Harmless to send, but cache_read_tokens will stay 0 on Anthropic
+                logger.warning("prompt_cache_prefix_too_short", one_liner_only=one_liner_only,
+                               prefix_tokens=tokens, minimum=MIN_CACHEABLE_PREFIX_TOKENS)
 
-        response = await self.client.messages.create(
-            model=self.model,
-            max_tokens=1000,
-            messages=[{"role": "user", "content": prompt}]
+    def request_params(self, title: str, content: str, one_liner_only: bool = False) -> dict:
+        """Messages API parameters; shared by summarize and Message Batches"""
+        tool = ONE_LINER_TOOL if one_liner_only else SUMMARY_TOOL
+        return {
+            "model": self.model,
+            "max_tokens": 200 if one_liner_only else 1000,
+            "system": self._system_blocks(one_liner_only),
+            "tools": [tool],
+            "tool_choice": {"type": "tool", "name": tool["name"]},
+            "messages": [{"role": "user", "content": self._build_prompt(title, content, one_liner_only)}],
+        }
+
+    def result_from_message(
+        self,
+        message,
+        attempts: int,
+        latency_ms: Optional[int],
+        batch: bool = False,
+        one_liner_only: bool = False,
+    ) -> dict:
+        """Turn a Messages API response into summary fields plus accounting"""
+        usage = message.usage
+        meta = self._usage_meta(
+            usage.input_tokens,
+            usage.output_tokens,
+            attempts,
+            latency_ms,
+            # Prompt-cache counts; absent on endpoints without caching
+            cache_read_tokens=getattr(usage, "cache_read_input_tokens", None),
+            cache_write_tokens=getattr(usage, "cache_creation_input_tokens", None),
+            batch=batch,
+        )
+
+        tool_input = next(
+            (block.input for block in message.content if block.type == "tool_use"),
+            None,
+        )
+        try:
+            if tool_input is not None:
+                result = self._validate_result(tool_input, one_liner_only)
+                result["repaired"] = False
+            else:
+                # Compatible endpoints may ignore tools and answer in text
+                text = "".join(block.text for block in message.content if block.type == "text")
+                result = self._parse_response(text, one_liner_only)
+        except SummaryParseError as e:
+            e.usage = meta
+            raise
+
+        result["structured"] = tool_input is not None
+        result.update(meta)
+        return result
+
+    async def summarize(self, title: str, content: str, one_liner_only: bool = False) -> dict:
+        """Generate summary for article via forced tool use"""
+        params = self.request_params(title, content, one_liner_only)
+
+        response, attempts, latency_ms = await self._call_with_retry(
+            lambda: self.client.messages.create(**params)
+        )
+        result = self.result_from_message(
+            response, attempts, latency_ms, one_liner_only=one_liner_only
         )
 
-        result = self._parse_response(response.content[0].text)
-        logger.info("claude_summary_generated", title=title)
+        logger.info(
+            "claude_summary_generated",
+            title=title,
+            repaired=result["repaired"],
+            structured=result["structured"],
+            one_liner_only=one_liner_only,
+            attempts=attempts,
+            latency_ms=latency_ms,
+            input_tokens=result["input_tokens"],
+            output_tokens=result["output_tokens"],
+            cache_read_tokens=result["cache_read_tokens"],
+        )
         return result
@@ -0,0 +1,278 @@
+"""
+In-memory index of the hot window, so the newest pages are served without SQL.
+
+Nearly all reads are page 1, /latest and the first pages of a category,
+and they all come from the last day or two of articles. HotWindow keeps
+every article published within `hot_window_hours` as a compact __slots__
+record, pre-sorted in list order (completed summaries, newest first):
+overall, per category and per feed. It also keeps a plain newest-first
+order for /latest.
+
+The index is tagged with the data generation (app.core.http_cache). While
+the generation is unchanged, pages come from memory with no query at all.
+When it moves, the next request catches the index up incrementally. It
+reads articles past the newest id it holds, summaries processed since the
+last refresh, and the (small) feeds table. A full rebuild happens on any
+deletion, on a restored database, or once the index is older than
+`hot_window_rebuild_minutes`.
+
+A page is answered from memory only if the whole page, and the row after
+it, lie inside the window. Articles outside the window sort after
+everything in it, so such a page is exactly what SQL would return. Anything
+else, including keyword and tag filters, falls back to SQL.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import logger
+from app.core.config import get_settings
+from app.core.http_cache import generation
+from app.models import Article, Feed, StatsCounters, Summary
+from app.services import totals
+from app.services.totals import Total
+from app.utils.cursor import ArticleCursor
+
+settings = get_settings()
+
+# processed_at is stamped just before each write commits (backfill stamps a
+# whole results file at write time, not when it starts reading); re-read
+# summaries this far back to cover that gap
+SUMMARY_LOOKBACK = timedelta(seconds=30)
+# /latest's own window
+LATEST_HOURS = 24
+
+_COLUMNS = (
+    Article.id, Article.title, Article.url, Article.published_at, Article.created_at, Article.feed_id,
+    Summary.status, Summary.one_liner, Summary.keywords,
+)
+
+
+class HotArticle:
+    __slots__ = ("id", "title", "url", "published_at", "created_at", "feed_id", "completed", "one_liner", "keywords")
+
+    def __init__(self, row):
+        self.id = row.id
+        self.title = row.title
+        self.url = row.url
+        self.published_at = row.published_at
+        self.created_at = row.created_at
+        self.feed_id = row.feed_id
+        self.completed = row.status == "completed"
+        self.one_liner = row.one_liner
+        self.keywords = row.keywords
+
+    @property
+    def order(self) -> tuple:
+        return (self.published_at, self.id)
+
+    def item(self, feeds: dict) -> dict:
+        """Fields of ArticleListItem"""
+        feed_title, feed_category = feeds.get(self.feed_id, ("", None))
+        return {
+            "id": self.id, "title": self.title, "url": self.url, "one_liner": self.one_liner,
+            "keywords": self.keywords, "published_at": self.published_at, "created_at": self.created_at,
+            "feed_title": feed_title, "feed_category": feed_category,
+        }
+
+
+def _first_after(records: list[HotArticle], position: tuple) -> int:
+    """Index of the first record ordered after `position` in a newest-first list"""
+    lo, hi = 0, len(records)
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if records[mid].order < position:
+            hi = mid
+        else:
+            lo = mid + 1
+    return lo
+
+
+class HotWindow:
+    def __init__(self, hours: int, rebuild_minutes: float):
+        self.hours = hours
+        self.rebuild_seconds = rebuild_minutes * 60
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+        self.reset()
+
+    def reset(self) -> None:
+        self.generation: Optional[tuple] = None  # As http_cache.generation reports it
+        self.totals_tag: Optional[tuple] = None  # As app.services.totals tags its cache
+        self.records: dict[int, HotArticle] = {}
+        self.feeds: dict[int, tuple] = {}
+        self.total_articles = 0
+        self.max_article_id = 0
+        self.window_start: Optional[datetime] = None
+        self.refreshed_at: Optional[datetime] = None
+        self.built_at = 0.0
+        # PostgreSQL sorts NULL published_at first under DESC, so undated
+        # completed articles would head SQL's offset pages
+        self.undated_first = False
+        self.newest: list[HotArticle] = []
+        self.completed: list[HotArticle] = []
+        self.by_category: dict[str, list[HotArticle]] = {}
+        self.by_feed: dict[int, list[HotArticle]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.hours > 0
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock, self._lock_loop = asyncio.Lock(), loop
+        return self._lock
+
+    async def current(self, db: AsyncSession) -> bool:
+        """Bring the index up to the data generation; False if it can't serve"""
+        if not self.enabled:
+            return False
+        data_generation = await generation.current(db)
+        if data_generation is None:
+            return False
+        if data_generation != self.generation:
+            async with self._get_lock():
+                if data_generation != self.generation:
+                    await self.refresh(db)
+                    # The refresh read a generation at least as new; have the
+                    # next request's lookup see the same one
+                    generation.invalidate()
+        return self.generation is not None
+
+    async def refresh(self, db: AsyncSession) -> None:
+        counters = (await db.execute(select(
+            StatsCounters.ingest_generation, StatsCounters.reconciled_at, StatsCounters.total_articles
+        ).where(StatsCounters.id == 1))).first()
+        if counters is None:
+            self.reset()
+            return
+        now = datetime.utcnow()
+        tag = (counters.ingest_generation, str(counters.reconciled_at))
+
+        full = (
+            self.generation is None
+            or tag[1] != self.generation[1]
+            or time.monotonic() - self.built_at > self.rebuild_seconds
+        )
+        if not full:
+            inserted = await db.scalar(select(func.count(Article.id)).where(Article.id > self.max_article_id))
+            # Fewer articles than before plus the new ones: something was deleted
+            full = counters.total_articles != self.total_articles + inserted
+        if full:
+            await self._rebuild(db, now)
+        else:
+            await self._catch_up(db, now)
+
+        self.feeds = {row.id: (row.title, row.category) for row in await db.execute(
+            select(Feed.id, Feed.title, Feed.category)
+        )}
+        self.generation = tag
+        self.totals_tag = (counters.ingest_generation, counters.reconciled_at)
+        self.total_articles = counters.total_articles
+        self.refreshed_at = now
+        self._reindex()
+        logger.debug("hot_window_refreshed", full=full, articles=len(self.records))
+
+    async def _rebuild(self, db: AsyncSession, now: datetime) -> None:
+        self.window_start = now - timedelta(hours=self.hours)
+        rows = await db.execute(select(*_COLUMNS).outerjoin(Summary).where(
+            Article.published_at >= self.window_start
+        ))
+        self.records = {row.id: HotArticle(row) for row in rows}
+        self.max_article_id = await db.scalar(select(func.max(Article.id))) or 0
+        self.undated_first = db.get_bind().dialect.name == "postgresql" and bool(await db.scalar(
+            select(func.count()).select_from(Summary).join(Article).where(
+                Summary.status == "completed", Article.published_at.is_(None)
+            )
+        ))
+        self.built_at = time.monotonic()
+
+    async def _catch_up(self, db: AsyncSession, now: datetime) -> None:
+        newest = self.max_article_id
+        self.max_article_id = await db.scalar(select(func.max(Article.id))) or newest
+        for row in await db.execute(select(*_COLUMNS).outerjoin(Summary).where(
+            Article.id > newest, Article.published_at >= self.window_start
+        )):
+            self.records[row.id] = HotArticle(row)
+
+        for row in await db.execute(
+            select(Summary.article_id, Summary.status, Summary.one_liner, Summary.keywords)
+            .join(Article, Article.id == Summary.article_id)
+            .where(Summary.processed_at >= self.refreshed_at - SUMMARY_LOOKBACK,
+                   Article.published_at >= self.window_start)
+        ):
+            record = self.records.get(row.article_id)
+            if record is not None:
+                record.completed = row.status == "completed"
+                record.one_liner = row.one_liner
+                record.keywords = row.keywords
+
+    def _reindex(self) -> None:
+        self.newest = sorted(self.records.values(), key=lambda r: r.order, reverse=True)
+        self.completed = [r for r in self.newest if r.completed]
+        self.by_category, self.by_feed = {}, {}
+        for record in self.completed:
+            self.by_feed.setdefault(record.feed_id, []).append(record)
+            category = self.feeds.get(record.feed_id, (None, None))[1]
+            if category:
+                self.by_category.setdefault(category, []).append(record)
+
+    def _candidates(self, feed_id: Optional[int], category: Optional[str]) -> list[HotArticle]:
+        if feed_id:
+            records = self.by_feed.get(feed_id, [])
+            if category:
+                records = [r for r in records if self.feeds.get(r.feed_id, (None, None))[1] == category]
+            return records
+        if category:
+            return self.by_category.get(category, [])
+        return self.completed
+
+    def list_page(self, feed_id: Optional[int], category: Optional[str], page_size: int,
+                  offset: int = 0, position: Optional[ArticleCursor] = None, keyset: bool = False):
+        """A list page from memory as (items, next_cursor), or None to use SQL
+
+        A page served from here always has a next page (its extra row is in
+        the window too); `next_cursor` is only set in keyset mode.
+        """
+        records = self._candidates(feed_id, category)
+        if keyset:
+            if position is None:
+                start = 0
+            elif position.has_summary == 0 and position.published_at is not None \
+                    and position.published_at >= self.window_start:
+                start = _first_after(records, (position.published_at, position.id))
+            else:
+                return None
+        else:
+            if self.undated_first:
+                return None
+            start = offset
+        if start + page_size >= len(records):
+            return None
+        page = records[start:start + page_size]
+        next_cursor = ArticleCursor(0, page[-1].published_at, page[-1].id) if keyset else None
+        return [r.item(self.feeds) for r in page], next_cursor
+
+    def latest(self, limit: int, now: Optional[datetime] = None) -> Optional[list[dict]]:
+        """/latest from memory, or None when its 24 h reach past the window"""
+        since = (now or datetime.utcnow()) - timedelta(hours=LATEST_HOURS)
+        if since < self.window_start:
+            return None
+        page = []
+        for record in self.newest:
+            if len(page) == limit or record.published_at < since:
+                break
+            page.append(record.item(self.feeds))
+        return page
+
+    def total(self, key: tuple) -> Optional[Total]:
+        """The listing total if known without a query"""
+        if not any(key):
+            return Total(self.total_articles, False)
+        return totals.cache.get(key, self.totals_tag)
+
+
+hot_window = HotWindow(settings.hot_window_hours, settings.hot_window_rebuild_minutes)
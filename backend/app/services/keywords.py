@@ -0,0 +1,63 @@
+"""
+Normalized keyword index (article_keywords) derived from Summary.keywords.
+
+Summary.keywords stays the source of truth for display; this table is what
+tag filters and keyword facets query. Rows are rewritten per article whenever
+its summary is written, and only completed summaries contribute keywords.
+"""
+import re
+from datetime import datetime
+from typing import Iterable, Optional
+from sqlalchemy import delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Article, ArticleKeyword, Summary
+
+MAX_KEYWORD_LENGTH = 64
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Case- and whitespace-insensitive form used as the index key"""
+    return _WHITESPACE_RE.sub(" ", keyword).strip().casefold()[:MAX_KEYWORD_LENGTH]
+
+
+def keyword_rows(
+    article_id: int,
+    feed_id: int,
+    published_at: Optional[datetime],
+    created_at: Optional[datetime],
+    keywords: Optional[Iterable],
+) -> list[dict]:
+    """article_keywords rows for one article; duplicates and non-strings dropped"""
+    if not isinstance(keywords, list):
+        return []
+    seen = []
+    for keyword in keywords:
+        if not isinstance(keyword, str):
+            continue
+        normalized = normalize_keyword(keyword)
+        if normalized and normalized not in seen:
+            seen.append(normalized)
+    when = published_at or created_at or datetime.utcnow()
+    return [
+        {"article_id": article_id, "keyword": k, "feed_id": feed_id, "published_at": when}
+        for k in seen
+    ]
+
+
+async def sync_article_keywords(db: AsyncSession, article_ids: Iterable[int]) -> None:
+    """Rewrite the keyword rows of the given articles from their summaries (no commit)"""
+    article_ids = list(article_ids)
+    if not article_ids:
+        return
+    await db.execute(delete(ArticleKeyword).where(ArticleKeyword.article_id.in_(article_ids)))
+
+    sources = (await db.execute(
+        select(Article.id, Article.feed_id, Article.published_at, Article.created_at, Summary.keywords)
+        .join(Summary, Summary.article_id == Article.id)
+        .where(Article.id.in_(article_ids), Summary.status == "completed")
+    )).all()
+    rows = [row for source in sources for row in keyword_rows(*source)]
+    if rows:
+        await db.execute(insert(ArticleKeyword), rows)
@@ -0,0 +1,37 @@
+"""
+Per-model token prices used to estimate summary cost.
+Prices are USD per million tokens: (input, output, cache_write, cache_read).
+"""
+from typing import Optional
+
+# Message Batches are billed at half the interactive price
+BATCH_DISCOUNT = 0.5
+
+MODEL_PRICING = {
+    "claude-3-5-sonnet-20241022": (3.00, 15.00, 3.75, 0.30),
+    "claude-3-5-haiku-20241022": (0.80, 4.00, 1.00, 0.08),
+    "glm-4-flash": (0.0, 0.0, 0.0, 0.0),
+    "glm-4": (14.0, 14.0, 14.0, 14.0),
+}
+
+
+def estimate_cost(
+    model: str,
+    input_tokens: int,
+    output_tokens: int,
+    cache_write_tokens: int = 0,
+    cache_read_tokens: int = 0,
+    batch: bool = False,
+) -> Optional[float]:
+    """Estimated USD cost of one call, or None for unknown models"""
+    prices = MODEL_PRICING.get(model)
+    if prices is None:
+        return None
+    input_price, output_price, write_price, read_price = prices
+    cost = (
+        input_tokens * input_price
+        + output_tokens * output_price
+        + cache_write_tokens * write_price
+        + cache_read_tokens * read_price
+    ) / 1_000_000
+    return cost * BATCH_DISCOUNT if batch else cost
@@ -0,0 +1,214 @@
+"""
+Full-text article search on top of the index built by app.core.fts.
+
+SQLite: FTS5 trigram MATCH ranked by bm25(), snippets from snippet().
+Trigrams need at least three characters, so shorter terms (most two-character
+Chinese words) fall back to LIKE over the indexed columns, which the
+external-content table reads back from articles_fts_source.
+
+PostgreSQL: to_tsquery('simple') against articles.search_vector, ranked by
+ts_rank_cd(). CJK characters are indexed one per token, so a CJK term is
+searched as a phrase of adjacent characters.
+
+Snippets are HTML-escaped with matches wrapped in <mark>. When the index
+can't give one, it is cut from the summary, title or decompressed body.
+"""
+import html
+import re
+from dataclasses import dataclass
+from typing import Optional
+from sqlalchemy import and_, column, false, func, literal, literal_column, or_, select, table
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.fts import CJK_CLASS, FTS_COLUMNS
+from app.models import Article, ArticleBody, Feed, Summary
+
+TRIGRAM_MIN_CHARS = 3
+MAX_TERMS = 8
+# bm25() weights in FTS_COLUMNS order: title, content, summary_cn, one_liner, keywords
+BM25_WEIGHTS = (10.0, 1.0, 4.0, 4.0, 8.0)
+SNIPPET_TOKENS = 40
+SNIPPET_CHARS = 80
+
+# Control characters survive html.escape, so matches are marked with them first
+_MARK_START, _MARK_END = "\x02", "\x03"
+
+_TERM_RE = re.compile(r'"([^"]+)"|(\S+)')
+_TSQUERY_TOKEN_RE = re.compile(rf"{CJK_CLASS}|(?:(?!{CJK_CLASS})[^\W_])+")
+
+articles_fts = table("articles_fts", column("rowid"), *(column(name) for name in FTS_COLUMNS))
+_fts_ref = literal_column("articles_fts")
+_search_vector = literal_column("articles.search_vector")
+
+
+@dataclass
+class SearchHit:
+    row: object
+    rank: float
+    snippet: Optional[str]
+
+
+def parse_terms(query: str) -> list[str]:
+    """Whitespace-separated terms; "double quotes" keep a phrase together"""
+    terms = [quoted or bare for quoted, bare in _TERM_RE.findall(query)]
+    return [term.strip() for term in terms if term.strip()][:MAX_TERMS]
+
+
+def _fts_phrase(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def _escape_like(term: str) -> str:
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _sqlite_condition(terms: list[str]):
+    """(WHERE clause, uses MATCH) for the articles_fts table"""
+    long_terms = [t for t in terms if len(t) >= TRIGRAM_MIN_CHARS]
+    conditions = []
+    if long_terms:
+        conditions.append(_fts_ref.op("MATCH")(" ".join(_fts_phrase(t) for t in long_terms)))
+    for term in terms:
+        if len(term) < TRIGRAM_MIN_CHARS:
+            pattern = f"%{_escape_like(term)}%"
+            conditions.append(or_(*(articles_fts.c[name].like(pattern, escape="\\") for name in FTS_COLUMNS)))
+    return and_(*conditions), bool(long_terms)
+
+
+def to_tsquery_text(terms: list[str]) -> str:
+    """AND of terms; each term is a phrase of its word / CJK-character tokens"""
+    groups = []
+    for term in terms:
+        tokens = _TSQUERY_TOKEN_RE.findall(term)
+        if tokens:
+            groups.append("(" + " <-> ".join(tokens) + ")")
+    return " & ".join(groups)
+
+
+def matching_article_ids(dialect: str, query: str):
+    """SELECT of article ids matching `query`, for use in an IN filter"""
+    terms = parse_terms(query)
+    if not terms:
+        return select(Article.id).where(false())
+    if dialect == "sqlite":
+        condition, _ = _sqlite_condition(terms)
+        return select(articles_fts.c.rowid).where(condition)
+    if dialect == "postgresql":
+        tsquery = to_tsquery_text(terms)
+        if not tsquery:
+            return select(Article.id).where(false())
+        return select(Article.id).where(_search_vector.op("@@")(func.to_tsquery("simple", tsquery)))
+    # No index for this backend: title substring like the original list filter
+    return select(Article.id).where(and_(*(Article.title.ilike(f"%{t}%") for t in terms)))
+
+
+def _mark_up(text: str) -> str:
+    """Escape snippet text for HTML, turning the match markers into <mark>"""
+    escaped = html.escape(text)
+    return escaped.replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+def highlight(text: Optional[str], terms: list[str], width: int = SNIPPET_CHARS) -> Optional[str]:
+    """Snippet around the first term found in `text`, or None if none occurs"""
+    if not text:
+        return None
+    lowered = text.lower()
+    positions = [(lowered.find(t.lower()), t) for t in terms]
+    positions = [(pos, t) for pos, t in positions if pos >= 0]
+    if not positions:
+        return None
+    first, _ = min(positions)
+    start = max(first - width // 4, 0)
+    end = min(start + width, len(text))
+    window = text[start:end]
+
+    pattern = re.compile("|".join(re.escape(t) for t in sorted(terms, key=len, reverse=True)), re.I)
+    window = pattern.sub(lambda m: f"{_MARK_START}{m.group(0)}{_MARK_END}", window)
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if end < len(text) else ""
+    return _mark_up(prefix + window + suffix)
+
+
+def _fallback_snippet(row, terms: list[str], body: Optional[str]) -> Optional[str]:
+    for text in (row.summary_cn, row.one_liner, row.Article.title, body):
+        snippet = highlight(text, terms)
+        if snippet:
+            return snippet
+    return None
+
+
+async def search_articles(
+    db: AsyncSession,
+    query: str,
+    page: int = 1,
+    page_size: int = 20,
+    category: Optional[str] = None,
+    feed_id: Optional[int] = None,
+) -> tuple[list[SearchHit], int]:
+    """Ranked search hits for one page, plus the total number of matches"""
+    terms = parse_terms(query)
+    dialect = db.get_bind().dialect.name
+    if not terms:
+        return [], 0
+
+    columns = (
+        Article,
+        Feed.title.label("feed_title"),
+        Feed.category.label("feed_category"),
+        Summary.summary_cn,
+        Summary.one_liner,
+        Summary.keywords,
+    )
+    snippet = literal(None)
+    if dialect == "sqlite":
+        condition, ranked = _sqlite_condition(terms)
+        base = select(*columns).select_from(articles_fts).join(Article, Article.id == articles_fts.c.rowid)
+        if ranked:
+            # bm25() is lower-is-better; negate so every backend sorts rank descending
+            rank = -func.bm25(_fts_ref, *BM25_WEIGHTS)
+            snippet = func.snippet(_fts_ref, -1, _MARK_START, _MARK_END, "…", SNIPPET_TOKENS)
+        else:
+            rank = literal(0.0)
+    elif dialect == "postgresql":
+        tsquery = to_tsquery_text(terms)
+        if not tsquery:
+            return [], 0
+        ts = func.to_tsquery("simple", tsquery)
+        condition = _search_vector.op("@@")(ts)
+        base = select(*columns).select_from(Article)
+        rank = func.ts_rank_cd(_search_vector, ts)
+    else:
+        condition = Article.id.in_(matching_article_ids(dialect, query))
+        base = select(*columns).select_from(Article)
+        rank = literal(0.0)
+
+    base = base.join(Feed, Feed.id == Article.feed_id).outerjoin(Summary, Summary.article_id == Article.id)
+    base = base.where(condition)
+    if category:
+        base = base.where(Feed.category == category)
+    if feed_id:
+        base = base.where(Article.feed_id == feed_id)
+
+    total = await db.scalar(select(func.count()).select_from(base.with_only_columns(Article.id).subquery()))
+    rows = (await db.execute(
+        base.add_columns(rank.label("rank"), snippet.label("snippet"))
+        .order_by(rank.desc(), Article.published_at.desc())
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+    )).all()
+
+    # Only this page's bodies, and only for hits the index gave no snippet
+    unsnipped = [row.Article.id for row in rows if not row.snippet]
+    bodies = {}
+    if unsnipped:
+        result = await db.scalars(select(ArticleBody).where(ArticleBody.article_id.in_(unsnipped)))
+        bodies = {body.article_id: body.text for body in result}
+
+    hits = [
+        SearchHit(
+            row=row,
+            rank=float(row.rank or 0.0),
+            snippet=_mark_up(row.snippet) if row.snippet else _fallback_snippet(row, terms, bodies.get(row.Article.id)),
+        )
+        for row in rows
+    ]
+    return hits, total or 0
@@ -0,0 +1,272 @@
+"""
+Live article events behind /api/articles/stream (Server-Sent Events).
+
+Each API process runs one Broadcaster that fans new articles and newly
+completed summaries out to every connected client, so open tabs cost one
+producer instead of a list query each. The fetcher and processor usually
+run in the scheduler process, so the producer polls. Every
+`stream_poll_seconds` it reads the data generation (a one-row lookup, see
+app.core.counters), and only queries for events when that generation has
+moved. Writers in this process wake it at once through
+app.core.cache.data_changed. It runs only while someone is listening.
+
+Each client has a bounded queue. A client that falls behind is dropped,
+and its browser reconnects with Last-Event-ID. An event id encodes the
+position in both feeds: the newest article id, and the processed_at and id
+of the newest completed summary. A reconnect therefore replays exactly
+what the client missed.
+"""
+import asyncio
+import contextlib
+import json
+from collections import deque
+from datetime import datetime, timedelta
+from typing import AsyncIterator, NamedTuple, Optional
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import logger
+from app.core.cache import on_data_changed
+from app.core.config import get_settings
+from app.core.db import AsyncSessionLocal
+from app.models import Article, Feed, StatsCounters, Summary
+
+settings = get_settings()
+
+# processed_at is stamped before the commit, so a summary can become visible
+# with a timestamp just behind one already streamed; look back this far
+SUMMARY_LOOKBACK = timedelta(seconds=30)
+_EPOCH = datetime(1970, 1, 1)
+
+
+class StreamPosition(NamedTuple):
+    article_id: int
+    summary_at: Optional[datetime]
+    summary_id: int
+
+
+def encode_position(position: StreamPosition) -> str:
+    at = (position.summary_at - _EPOCH) // timedelta(microseconds=1) if position.summary_at else 0
+    return f"{position.article_id}.{at}.{position.summary_id}"
+
+
+def decode_position(value: str) -> StreamPosition:
+    """Parse a Last-Event-ID; raises ValueError if it isn't one of ours"""
+    article_id, at, summary_id = (int(part) for part in value.split("."))
+    summary_at = _EPOCH + timedelta(microseconds=at) if at else None
+    return StreamPosition(article_id, summary_at, summary_id)
+
+
+class ArticleEvent(NamedTuple):
+    kind: str  # "article" (fetched) or "summary" (summary completed)
+    article_id: int
+    data: dict
+    position: StreamPosition
+    summary_id: Optional[int] = None
+
+    def encode(self) -> bytes:
+        return (
+            f"id: {encode_position(self.position)}\n"
+            f"event: {self.kind}\n"
+            f"data: {json.dumps(self.data, ensure_ascii=False, default=str)}\n\n"
+        ).encode("utf-8")
+
+
+async def current_position(db: AsyncSession) -> StreamPosition:
+    """The head of both feeds: a client starting here only sees what comes next"""
+    article_id = await db.scalar(select(Article.id).order_by(Article.id.desc()).limit(1))
+    summary = (await db.execute(
+        select(Summary.processed_at, Summary.id).where(
+            Summary.status == "completed", Summary.processed_at.isnot(None)
+        ).order_by(Summary.processed_at.desc(), Summary.id.desc()).limit(1)
+    )).first()
+    return StreamPosition(article_id or 0, summary.processed_at if summary else None, summary.id if summary else 0)
+
+
+async def events_after(db: AsyncSession, position: StreamPosition, limit: int,
+                       seen: Optional[set] = None) -> tuple[list[ArticleEvent], StreamPosition]:
+    """Events past `position` (at most `limit` of each kind), and the position after them
+
+    With `seen` (summary ids already sent), summaries are re-read from
+    SUMMARY_LOOKBACK before the position so late commits are not skipped.
+    """
+    events = []
+    articles = (await db.execute(
+        select(Article.id, Article.title, Article.url, Article.published_at,
+               Feed.title.label("feed_title"), Feed.category.label("feed_category"))
+        .join(Feed).where(Article.id > position.article_id).order_by(Article.id).limit(limit)
+    )).all()
+    for row in articles:
+        position = position._replace(article_id=row.id)
+        events.append(ArticleEvent("article", row.id, {
+            "id": row.id, "title": row.title, "url": row.url, "published_at": row.published_at,
+            "feed_title": row.feed_title, "feed_category": row.feed_category,
+        }, position))
+
+    query = select(
+        Summary.id, Summary.processed_at, Summary.article_id, Summary.one_liner, Summary.keywords,
+        Article.title, Feed.title.label("feed_title"), Feed.category.label("feed_category"),
+    ).join(Article, Article.id == Summary.article_id).join(Feed).where(
+        Summary.status == "completed", Summary.processed_at.isnot(None)
+    )
+    if position.summary_at is not None:
+        if seen is not None:
+            query = query.where(Summary.processed_at >= position.summary_at - SUMMARY_LOOKBACK)
+        else:
+            query = query.where(
+                tuple_(Summary.processed_at, Summary.id) > tuple_(position.summary_at, position.summary_id)
+            )
+    summaries = (await db.execute(
+        query.order_by(Summary.processed_at, Summary.id).limit(limit + (len(seen) if seen else 0))
+    )).all()
+    for row in summaries:
+        if seen is not None and row.id in seen:
+            continue
+        if (row.processed_at, row.id) > (position.summary_at or _EPOCH, position.summary_id):
+            position = position._replace(summary_at=row.processed_at, summary_id=row.id)
+        events.append(ArticleEvent("summary", row.article_id, {
+            "id": row.article_id, "title": row.title, "one_liner": row.one_liner, "keywords": row.keywords or [],
+            "feed_title": row.feed_title, "feed_category": row.feed_category,
+        }, position, row.id))
+    return events, position
+
+
+class Broadcaster:
+    """One producer per process, fanned out to a bounded queue per client"""
+
+    def __init__(self, poll_seconds: float, client_buffer: int, batch_limit: int, sessions=AsyncSessionLocal):
+        self.poll_seconds = poll_seconds
+        self.client_buffer = client_buffer
+        self.batch_limit = batch_limit
+        self.sessions = sessions
+        self.position: Optional[StreamPosition] = None
+        self._generation = None
+        self._clients: set[asyncio.Queue] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._lock_loop = None
+        self._seen_order: deque = deque(maxlen=4096)
+        self._seen: set = set()
+
+    @property
+    def clients(self) -> int:
+        return len(self._clients)
+
+    def notify(self) -> None:
+        if self._wake is not None:
+            self._wake.set()
+
+    def _get_lock(self) -> asyncio.Lock:
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock, self._lock_loop = asyncio.Lock(), loop
+        return self._lock
+
+    def _start(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._wake = asyncio.Event()
+            self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while self._clients:
+            try:
+                await self.poll()
+            except Exception as e:
+                logger.error("stream_poll_failed", error=str(e))
+            self._wake.clear()
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wake.wait(), self.poll_seconds)
+        # Nobody listening: start from the head again when someone does
+        self.position = None
+
+    async def poll(self) -> None:
+        async with self.sessions() as db:
+            data_generation = await db.scalar(select(StatsCounters.ingest_generation).where(StatsCounters.id == 1))
+            if self.position is None:
+                # Under the lock: a reconnecting client may be setting the start itself
+                async with self._get_lock():
+                    if self.position is None:
+                        await self._start_at(db, await current_position(db))
+                        self._generation = data_generation
+                        return
+            if data_generation == self._generation:
+                return
+            events, self.position = await events_after(db, self.position, self.batch_limit, seen=self._seen)
+        if len(events) < self.batch_limit:
+            # Otherwise more is waiting: keep the old generation so the next poll continues
+            self._generation = data_generation
+        for event in events:
+            if event.summary_id is not None:
+                self._remember(event.summary_id)
+        self.publish(events)
+
+    async def _start_at(self, db: AsyncSession, position: StreamPosition) -> None:
+        """Make `position` the live cursor"""
+        self.position = position
+        if position.summary_at is not None:
+            # Already sent; the lookback must not send them again
+            for summary_id in await db.scalars(select(Summary.id).where(
+                Summary.status == "completed",
+                Summary.processed_at >= position.summary_at - SUMMARY_LOOKBACK,
+                tuple_(Summary.processed_at, Summary.id) <= tuple_(position.summary_at, position.summary_id),
+            )):
+                self._remember(summary_id)
+
+    def _remember(self, summary_id: int) -> None:
+        if len(self._seen_order) == self._seen_order.maxlen:
+            self._seen.discard(self._seen_order[0])
+        self._seen_order.append(summary_id)
+        self._seen.add(summary_id)
+
+    def publish(self, events: list[ArticleEvent]) -> None:
+        for queue in list(self._clients):
+            for event in events:
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    # Too slow: end its stream; the browser resumes from its Last-Event-ID
+                    self._clients.discard(queue)
+                    queue.get_nowait()
+                    queue.put_nowait(None)
+                    logger.warning("stream_client_dropped", buffered=self.client_buffer)
+                    break
+
+    async def events(self, resume: Optional[StreamPosition], heartbeat_seconds: float) -> AsyncIterator[bytes]:
+        """One client's SSE byte stream: what it missed since `resume` (if given), then live events"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.client_buffer)
+        replay = []
+        try:
+            # The producer can't pick its starting point while a replay is read:
+            # it would start at the head and skip what lands in between
+            async with self._get_lock():
+                self._clients.add(queue)
+                self._start()
+                if resume is not None:
+                    async with self.sessions() as db:
+                        replay, end = await events_after(db, resume, self.batch_limit)
+                        if self.position is None:
+                            # Idle producer: go live right after the replay
+                            await self._start_at(db, end)
+                            self._generation = None
+            yield f"retry: {int(self.poll_seconds * 1000) + 1000}\n\n".encode()
+            for event in replay:
+                yield event.encode()
+            replayed = {(event.kind, event.article_id) for event in replay}
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+                    continue
+                if event is None:
+                    return
+                if (event.kind, event.article_id) in replayed:
+                    continue
+                yield event.encode()
+        finally:
+            self._clients.discard(queue)
+
+
+broadcaster = Broadcaster(settings.stream_poll_seconds, settings.stream_client_buffer, settings.stream_replay_limit)
+on_data_changed(broadcaster.notify)
@@ -0,0 +1,124 @@
+"""
+Totals for filtered article listings without a full COUNT per request.
+
+Totals are cached per filter tuple and tagged with the `ingest_generation`
+of stats_counters (bumped by triggers whenever a total could change, see
+app.core.counters), so a cached value is served until the next ingest or
+status change and never after. The tag also carries `reconciled_at`, which
+a recreated or restored database resets along with the generation. The
+cache is per process and bounded.
+
+Counting stops after `articles_total_exact_limit` matching rows. Past that
+the total is an estimate, flagged as approximate: PostgreSQL's planner row
+estimate for the filtered query, else the share of the newest articles
+that match the filters scaled to the article count in stats_counters.
+Unfiltered listings read the counter directly and stay exact.
+"""
+import json
+from collections import OrderedDict
+from typing import Hashable, NamedTuple, Optional
+from sqlalchemy import func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core import logger
+from app.core.config import get_settings
+from app.models import Article, StatsCounters
+
+settings = get_settings()
+
+
+class Total(NamedTuple):
+    value: int
+    approximate: bool
+
+
+class TotalsCache:
+    """LRU of filter key -> Total, valid for one generation tag"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, tuple[Hashable, Total]] = OrderedDict()
+
+    def get(self, key: Hashable, generation: Hashable) -> Optional[Total]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] != generation:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: Hashable, generation: Hashable, total: Total) -> None:
+        if self.max_entries <= 0:
+            return
+        self._entries[key] = (generation, total)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+cache = TotalsCache(settings.articles_total_cache_entries)
+
+
+async def _count(db: AsyncSession, query) -> int:
+    return await db.scalar(select(func.count()).select_from(query.subquery()))
+
+
+async def _planner_estimate(db: AsyncSession, query) -> Optional[int]:
+    sql = str(query.compile(dialect=db.get_bind().dialect, compile_kwargs={"literal_binds": True}))
+    try:
+        # A failed EXPLAIN must not abort the request's transaction
+        async with db.begin_nested():
+            plan = await db.scalar(text(f"EXPLAIN (FORMAT JSON) {sql}"))
+    except Exception as e:
+        logger.warning("total_estimate_failed", error=str(e))
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def _sampled_estimate(db: AsyncSession, query, total_articles: int, sample_size: int) -> int:
+    newest = select(Article.id).order_by(Article.id.desc()).limit(sample_size)
+    matches = await _count(db, query.where(Article.id.in_(newest)))
+    return round(total_articles * matches / max(1, min(sample_size, total_articles)))
+
+
+async def article_total(db: AsyncSession, query, key: tuple) -> Total:
+    """Total rows of the (unordered, unpaged) listing `query` filtered by `key`"""
+    counters = (await db.execute(select(
+        StatsCounters.ingest_generation, StatsCounters.reconciled_at, StatsCounters.total_articles
+    ).where(StatsCounters.id == 1))).first()
+    if counters is None:
+        # No counters row (yet): nothing to tag a cached value with
+        return Total(await _count(db, query), False)
+    generation = (counters.ingest_generation, counters.reconciled_at)
+    total_articles = counters.total_articles
+    if not any(key):
+        return Total(total_articles, False)
+
+    cached = cache.get(key, generation)
+    if cached is not None:
+        return cached
+
+    limit = settings.articles_total_exact_limit
+    if limit <= 0:
+        total = Total(await _count(db, query), False)
+    else:
+        counted = await _count(db, query.limit(limit + 1))
+        if counted <= limit:
+            total = Total(counted, False)
+        else:
+            estimate = None
+            if db.get_bind().dialect.name == "postgresql":
+                estimate = await _planner_estimate(db, query)
+            if estimate is None:
+                estimate = await _sampled_estimate(db, query, total_articles, limit)
+            # At least `counted` rows are known to exist
+            total = Total(max(estimate, counted), True)
+
+    cache.put(key, generation, total)
+    return total
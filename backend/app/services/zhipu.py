@@ -2,11 +2,12 @@
 Zhipu AI (BigModel) service for article summarization.
 Supports GLM-4 and other models via Zhipu AI API.
 """
+from typing import Optional
+import zhipuai
 from zhipuai import AsyncZhipuAI
-from tenacity import retry, stop_after_attempt, wait_exponential
 from app.core.config import get_settings
 from app.core import logger
-from app.services.base import BaseAIService
+from app.services.base import BaseAIService, SummaryParseError
 
 settings = get_settings()
 
@@ -14,29 +15,64 @@ settings = get_settings()
 class ZhipuService(BaseAIService):
     """Zhipu AI service for generating Chinese summaries"""
 
-    def __init__(self):
-        api_key = getattr(settings, 'zhipu_api_key', None) or settings.claude_api_key
+    retryable_errors = (
+        zhipuai.APIConnectionError,
+        zhipuai.APITimeoutError,
+        zhipuai.APIReachLimitError,
+        zhipuai.APIInternalError,
+        zhipuai.APIServerFlowExceedError,
+    )
+
+    def __init__(self, api_key: Optional[str] = None, base_url: Optional[str] = None):
+        super().__init__()
+        api_key = api_key or getattr(settings, 'zhipu_api_key', None) or settings.claude_api_key
         if not api_key or api_key == "your-claude-api-key-here":
             raise ValueError("ZHIPU_API_KEY not configured in .env")
 
-        self.client = AsyncZhipuAI(api_key=api_key)
+        # Retries are handled (and counted) by _call_with_retry
+        self.client = AsyncZhipuAI(api_key=api_key, base_url=base_url, max_retries=0)
         self.model = "glm-4-flash"  # Fast and cost-effective, or "glm-4" for higher quality
 
-    @retry(wait=wait_exponential(min=1, max=60), stop=stop_after_attempt(5))
-    async def summarize(self, title: str, content: str) -> dict:
-        """Generate summary for article using Zhipu AI"""
-        prompt = self._build_prompt(title, content)
+    async def summarize(self, title: str, content: str, one_liner_only: bool = False) -> dict:
+        """Generate summary for article using Zhipu AI JSON mode"""
+        prompt = self._build_prompt(title, content, one_liner_only)
 
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": "你是一个专业的技术文章摘要助手，擅长将英文技术文章总结为简洁的中文摘要。"},
-                {"role": "user", "content": prompt}
-            ],
-            temperature=0.3,
-            max_tokens=1000,
+        response, attempts, latency_ms = await self._call_with_retry(
+            lambda: self.client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    # Static prefix first so the provider's context cache can reuse it
+                    {"role": "system", "content": self._build_system_prompt(one_liner_only)},
+                    {"role": "user", "content": prompt}
+                ],
+                response_format={"type": "json_object"},
+                temperature=0.3,
+                max_tokens=200 if one_liner_only else 1000,
+            )
+        )
+
+        usage = response.usage
+        cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None) or 0
+        meta = self._usage_meta(
+            usage.prompt_tokens - cached,
+            usage.completion_tokens,
+            attempts,
+            latency_ms,
+            cache_read_tokens=cached,
         )
 
-        result = self._parse_response(response.choices[0].message.content)
-        logger.info("zhipu_summary_generated", title=title, model=self.model)
+        try:
+            result = self._parse_response(response.choices[0].message.content, one_liner_only)
+        except SummaryParseError as e:
+            e.usage = meta
+            raise
+
+        result.update(meta)
+        logger.info(
+            "zhipu_summary_generated",
+            title=title,
+            model=self.model,
+            repaired=result["repaired"],
+            **meta,
+        )
         return result
@@ -0,0 +1,300 @@
+"""
+Bulk backfill of pending summaries through the provider's Message Batches API.
+
+Realtime work stays on AIProcessor; backfill only takes pending rows older
+than `min_age_hours` on the priority scale, marks them "batched" and hands
+them to the provider as one asynchronous job. All progress lives in the
+database (summary_batches + summaries.batch_id), so a crashed run simply
+resumes: unsubmitted batches are released back to pending and submitted
+ones are polled and collected. A batch the provider accepted just before
+the crash, with its id never recorded, is found again on the provider and
+kept rather than released, so its rows are not billed twice.
+
+Submitting honours the processor's daily token budget (app.tasks.budget):
+once it is spent, only rows above the budget's priority floor are sent.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import data_changed
+from app.core.db import AsyncSessionLocal
+from app.core import logger
+from app.models import Article, ArticleBody, Summary, SummaryBatch
+from app.services.base import SummaryParseError
+from app.services.claude import ClaudeService
+from app.services.keywords import sync_article_keywords
+from app.tasks import budget
+from app.tasks.priority import now_hours
+from app.tasks.triage import ROUTE_ONE_LINER
+
+BATCH_SIZE = 1000
+MIN_AGE_HOURS = 24
+POLL_INTERVAL_SECONDS = 60
+# Provider and local clocks may disagree this much when matching an unrecorded batch
+CLOCK_SKEW = timedelta(minutes=5)
+
+USAGE_FIELDS = (
+    "input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens", "cost_usd",
+)
+
+
+def _custom_id(summary_id: int) -> str:
+    return f"summary-{summary_id}"
+
+
+def _summary_id(custom_id: str) -> Optional[int]:
+    prefix, _, value = custom_id.partition("-")
+    return int(value) if prefix == "summary" and value.isdigit() else None
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Provider timestamps are tz-aware; the database stores naive UTC"""
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+class BatchBackfill:
+    def __init__(
+        self,
+        ai_service: Optional[ClaudeService] = None,
+        batch_size: int = BATCH_SIZE,
+        min_age_hours: float = MIN_AGE_HOURS,
+    ):
+        self.ai_service = ai_service or ClaudeService()
+        self.batch_size = batch_size
+        self.min_age_hours = min_age_hours
+
+    @property
+    def _batches_api(self):
+        return self.ai_service.client.messages.batches
+
+    async def recover(self) -> int:
+        """Settle batches interrupted during submission; returns how many
+
+        One the provider holds after all is adopted and collected as usual;
+        the rest never reached it, and their summaries are released.
+        """
+        async with AsyncSessionLocal() as db:
+            stale = (await db.scalars(select(SummaryBatch).where(
+                SummaryBatch.status == "submitting",
+                SummaryBatch.provider_batch_id.is_(None),
+            ))).all()
+            if not stale:
+                return 0
+            known = set(await db.scalars(
+                select(SummaryBatch.provider_batch_id).where(SummaryBatch.provider_batch_id.isnot(None))
+            ))
+            adopted = 0
+            for batch in stale:
+                provider_batch = await self._find_unrecorded(batch, known)
+                if provider_batch is not None:
+                    known.add(provider_batch.id)
+                    batch.provider_batch_id = provider_batch.id
+                    batch.status = "submitted"
+                    batch.submitted_at = _naive_utc(provider_batch.created_at)
+                    adopted += 1
+                    continue
+                await self._release(db, batch.id)
+                batch.status = "abandoned"
+                batch.error = "Interrupted before submission"
+            await db.commit()
+            logger.warning("backfill_batches_recovered", count=len(stale), adopted=adopted)
+            return len(stale)
+
+    async def _find_unrecorded(self, batch: SummaryBatch, known: set[str]):
+        """The provider's copy of `batch` if it was created but its id never saved
+
+        Requests can't be listed while a batch runs, so it is matched on
+        size and creation time; a wrong match only sends rows back to the
+        queue when collected (see _collect_one).
+        """
+        since = batch.created_at - CLOCK_SKEW
+        async for provider_batch in self._batches_api.list(limit=100):
+            if _naive_utc(provider_batch.created_at) < since:
+                break  # Newest first: the rest are older still
+            counts = provider_batch.request_counts
+            size = counts.processing + counts.succeeded + counts.errored + counts.canceled + counts.expired
+            if provider_batch.id not in known and size == batch.request_count:
+                return provider_batch
+        return None
+
+    async def _release(self, db: AsyncSession, batch_id: int) -> None:
+        await db.execute(
+            update(Summary)
+            .where(Summary.batch_id == batch_id, Summary.status == "batched")
+            .values(status="pending", batch_id=None)
+        )
+
+    async def submit(self) -> Optional[int]:
+        """Submit the next slice of backlog as one provider batch; returns its local id"""
+        async with AsyncSessionLocal() as db:
+            query = select(Summary.id, Summary.triage, Article.title, ArticleBody).join(
+                Article, Article.id == Summary.article_id
+            ).outerjoin(
+                ArticleBody, ArticleBody.article_id == Article.id
+            ).where(
+                Summary.status == "pending",
+                Summary.priority < now_hours() - self.min_age_hours,
+            ).order_by(Summary.priority.desc()).limit(self.batch_size)
+            floor = await budget.min_priority(db)
+            if floor is not None:
+                # Same gate as realtime: with the day's budget spent the backlog waits
+                logger.warning("ai_budget_exhausted", min_priority=floor)
+                query = query.where(Summary.priority >= floor)
+            rows = (await db.execute(query)).all()
+            if not rows:
+                return None
+
+            # Claim the rows, and record the batch, before calling the provider so
+            # realtime skips them and a crash mid-call leaves a trace for recover();
+            # only rows still pending are claimed, and only those are sent
+            batch = SummaryBatch(status="submitting")
+            db.add(batch)
+            await db.flush()
+            claimed = set(await db.scalars(
+                update(Summary)
+                .where(Summary.id.in_([row.id for row in rows]), Summary.status == "pending")
+                .values(status="batched", batch_id=batch.id)
+                .returning(Summary.id)
+            ))
+            rows = [row for row in rows if row.id in claimed]
+            if not rows:
+                await db.rollback()
+                return None
+            batch.request_count = len(rows)
+            await db.commit()
+
+            requests = [
+                {
+                    "custom_id": _custom_id(row.id),
+                    "params": self.ai_service.request_params(
+                        row.title, row.ArticleBody.text if row.ArticleBody else "", one_liner_only=row.triage == ROUTE_ONE_LINER
+                    ),
+                }
+                for row in rows
+            ]
+            try:
+                provider_batch = await self._batches_api.create(requests=requests)
+            except Exception as e:
+                await self._release(db, batch.id)
+                batch.status = "abandoned"
+                batch.error = str(e)
+                await db.commit()
+                logger.error("backfill_submit_failed", batch_id=batch.id, error=str(e))
+                raise
+
+            batch.provider_batch_id = provider_batch.id
+            batch.status = "submitted"
+            batch.submitted_at = datetime.utcnow()
+            await db.commit()
+            logger.info("backfill_batch_submitted", batch_id=batch.id,
+                        provider_batch_id=provider_batch.id, requests=len(rows))
+            return batch.id
+
+    async def collect(self) -> int:
+        """Poll submitted batches and bulk-write results of those that ended"""
+        collected = 0
+        async with AsyncSessionLocal() as db:
+            submitted = (await db.scalars(
+                select(SummaryBatch).where(SummaryBatch.status == "submitted")
+            )).all()
+            for batch in submitted:
+                provider_batch = await self._batches_api.retrieve(batch.provider_batch_id)
+                if provider_batch.processing_status != "ended":
+                    continue
+                await self._collect_one(db, batch)
+                collected += 1
+            return collected
+
+    async def _collect_one(self, db: AsyncSession, batch: SummaryBatch) -> None:
+        # Only rows still held by this batch are written, so re-collecting is a no-op
+        held = dict((await db.execute(select(Summary.id, Summary.triage).where(
+            Summary.batch_id == batch.id, Summary.status == "batched"
+        ))).all())
+        mappings = []
+        completed = []
+        succeeded = errored = 0
+
+        async for item in await self._batches_api.results(batch.provider_batch_id):
+            summary_id = _summary_id(item.custom_id)
+            if summary_id not in held:
+                continue
+            one_liner_only = held.pop(summary_id) == ROUTE_ONE_LINER
+            mapping = {"id": summary_id, "batch_id": None, "attempts": 1}
+
+            if item.result.type == "succeeded":
+                try:
+                    result = self.ai_service.result_from_message(
+                        item.result.message, attempts=1, latency_ms=None, batch=True,
+                        one_liner_only=one_liner_only,
+                    )
+                    mapping.update(
+                        status="completed",
+                        summary_cn=result["summary"],
+                        one_liner=result["one_liner"],
+                        keywords=result["keywords"],
+                        model_version=self.ai_service.model,
+                        error=None,
+                        **{field: result[field] for field in USAGE_FIELDS},
+                    )
+                    completed.append(summary_id)
+                    succeeded += 1
+                except SummaryParseError as e:
+                    mapping.update(status="failed", error=str(e),
+                                   **{field: e.usage.get(field) for field in USAGE_FIELDS})
+                    errored += 1
+            elif item.result.type == "errored":
+                mapping.update(status="failed", error=str(item.result.error))
+                errored += 1
+            else:
+                # Canceled or expired: hand back to the queue untouched
+                mapping.update(status="pending", processed_at=None, attempts=None)
+            mappings.append(mapping)
+
+        # Stamped at write time, not when reading the results began (which can
+        # take minutes): readers catching up on processed_at, such as the hot
+        # window and the event stream, only look SUMMARY_LOOKBACK back
+        now = datetime.utcnow()
+        for mapping in mappings:
+            mapping.setdefault("processed_at", now)
+        if mappings:
+            await db.execute(update(Summary), mappings)
+        if completed:
+            await sync_article_keywords(db, await db.scalars(
+                select(Summary.article_id).where(Summary.id.in_(completed))
+            ))
+        if held:
+            # Requests the provider never answered go back to pending
+            await db.execute(
+                update(Summary).where(Summary.id.in_(list(held))).values(status="pending", batch_id=None)
+            )
+
+        batch.status = "collected"
+        batch.succeeded = succeeded
+        batch.errored = errored
+        batch.collected_at = now
+        await db.commit()
+        data_changed()
+        logger.info("backfill_batch_collected", batch_id=batch.id,
+                    succeeded=succeeded, errored=errored, returned_to_queue=len(held))
+
+    async def in_flight(self) -> int:
+        async with AsyncSessionLocal() as db:
+            return await db.scalar(
+                select(func.count(SummaryBatch.id)).where(SummaryBatch.status == "submitted")
+            )
+
+    async def run(self, max_in_flight: int = 5, poll_interval: float = POLL_INTERVAL_SECONDS) -> None:
+        """Submit and collect until the eligible backlog is drained"""
+        await self.recover()
+        while True:
+            while await self.in_flight() < max_in_flight and await self.submit() is not None:
+                pass
+            await self.collect()
+            if await self.in_flight() == 0:
+                # Nothing outstanding; stop once nothing new can be submitted
+                if await self.submit() is None:
+                    break
+                continue
+            await asyncio.sleep(poll_interval)
@@ -0,0 +1,47 @@
+"""
+Daily token budget governor for the AI processor.
+
+Token usage is summed from Summary rows processed since UTC midnight. Once the
+configured budget is spent, only pending work whose priority is within
+`ai_budget_priority_hours` of "now" (fresh or first-page boosted articles) is
+picked up; the backlog waits for tomorrow's budget.
+"""
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.config import get_settings
+from app.models import Summary
+from app.tasks.priority import now_hours
+
+settings = get_settings()
+
+# Every token the provider bills for, cached or not
+TOKEN_COLUMNS = (
+    Summary.input_tokens,
+    Summary.output_tokens,
+    Summary.cache_read_tokens,
+    Summary.cache_write_tokens,
+)
+
+
+def start_of_day(now: Optional[datetime] = None) -> datetime:
+    now = now or datetime.utcnow()
+    return now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+async def tokens_used_since(db: AsyncSession, since: datetime) -> int:
+    total = sum(func.coalesce(func.sum(column), 0) for column in TOKEN_COLUMNS)
+    return await db.scalar(select(total).where(Summary.processed_at >= since)) or 0
+
+
+async def tokens_used_today(db: AsyncSession) -> int:
+    return await tokens_used_since(db, start_of_day())
+
+
+async def min_priority(db: AsyncSession) -> Optional[float]:
+    """Lowest priority allowed to run now, or None when within budget"""
+    budget = settings.ai_daily_token_budget
+    if budget <= 0 or await tokens_used_today(db) < budget:
+        return None
+    return now_hours() - settings.ai_budget_priority_hours
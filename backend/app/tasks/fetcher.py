@@ -1,14 +1,19 @@
 import asyncio
 import feedparser
 import requests  # requests works better on Windows SSL than httpx
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Optional
-from sqlalchemy.orm import Session
-from app.core.db import SessionLocal
-from app.models import Feed, Article, Summary
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import data_changed
+from app.core.db import AsyncSessionLocal
+from app.models import Feed, Article, ArticleBody, ArchivedArticle, Summary
 from app.core.logging import logger
 from app.utils.url import content_hash
 from app.utils.html import clean_html
+from app.tasks.priority import compute_priority
+from app.tasks.triage import ROUTE_SKIPPED, triage_entry
 
 class RSSFetcher:
     def __init__(self, max_concurrent: int = 10):
@@ -16,18 +21,15 @@ class RSSFetcher:
 
     async def fetch_all(self) -> None:
         """Fetch all active feeds"""
-        db: Session = SessionLocal()
-        try:
-            active_feeds = db.query(Feed).filter(Feed.is_active == True).all()
-            logger.info("fetch_started", feed_count=len(active_feeds))
+        async with AsyncSessionLocal() as db:
+            active_feeds = (await db.scalars(select(Feed).where(Feed.is_active == True))).all()
+        logger.info("fetch_started", feed_count=len(active_feeds))
 
-            tasks = [self._fetch_one(feed) for feed in active_feeds]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
+        tasks = [self._fetch_one(feed) for feed in active_feeds]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
 
-            success_count = sum(1 for r in results if r is not None and not isinstance(r, Exception))
-            logger.info("fetch_completed", success=success_count, total=len(active_feeds))
-        finally:
-            db.close()
+        success_count = sum(1 for r in results if r is not None and not isinstance(r, Exception))
+        logger.info("fetch_completed", success=success_count, total=len(active_feeds))
 
     async def _fetch_one(self, feed: Feed) -> Optional[int]:
         """Fetch single feed using requests (sync) in thread pool"""
@@ -51,24 +53,25 @@ class RSSFetcher:
                 # feedparser is sync, run in thread
                 parsed = await asyncio.to_thread(feedparser.parse, response.content)
 
-                db: Session = SessionLocal()
-                try:
+                async with AsyncSessionLocal() as db:
                     new_count = 0
                     for entry in parsed.entries[:50]:  # Limit per fetch
-                        if await self._process_entry(entry, feed.id, db):
+                        if await self._process_entry(entry, feed, db):
                             new_count += 1
 
-                    feed.last_fetched_at = datetime.utcnow()
-                    db.commit()
+                    # `feed` belongs to fetch_all's (closed) session, so update by id
+                    await db.execute(
+                        update(Feed).where(Feed.id == feed.id).values(last_fetched_at=datetime.utcnow())
+                    )
+                    await db.commit()
+                    data_changed()
                     logger.info("feed_fetched", feed=feed.title, new_articles=new_count)
                     return new_count
-                finally:
-                    db.close()
             except Exception as e:
                 logger.error("fetch_failed", feed_url=feed.url, error=str(e))
                 return None
 
-    async def _process_entry(self, entry, feed_id: int, db: Session) -> bool:
+    async def _process_entry(self, entry, feed: Feed, db: AsyncSession) -> bool:
         """Process single feed entry, return True if new"""
         url = entry.get('link', '')
         title = entry.get('title', '')
@@ -77,40 +80,66 @@ class RSSFetcher:
             return False
 
         hash_key = content_hash(url, title)
-        existing = db.query(Article).filter(Article.content_hash == hash_key).first()
+        existing = await db.scalar(select(Article.id).where(Article.content_hash == hash_key))
         if existing:
             return False
+        # Still in the feed after retention archived it: don't ingest (and summarize) it again
+        if await db.scalar(select(ArchivedArticle.id).where(ArchivedArticle.content_hash == hash_key)):
+            return False
 
         # Extract content
         content = entry.get('content', [{}])[0].get('value', '') if entry.get('content') else entry.get('description', '')
         cleaned_content = clean_html(content) if content else ''
 
+        # Decide before inserting so the duplicate check doesn't match this entry
+        decision = await triage_entry(db, url, title, feed.id, content or '', cleaned_content)
+
         article = Article(
             content_hash=hash_key,
             url=url,
             title=title,
-            content=cleaned_content[:10000],  # Limit size
+            body=ArticleBody(text=cleaned_content[:10000]),  # Limit size
             author=entry.get('author'),
+            language=decision.language,
             published_at=self._parse_date(entry.get('published')),
-            feed_id=feed_id,
+            feed_id=feed.id,
+            created_at=datetime.utcnow(),
         )
         db.add(article)
-        db.flush()
+        await db.flush()
 
         # Check if summary already exists (handle duplicate creation)
-        existing_summary = db.query(Summary).filter(Summary.article_id == article.id).first()
+        existing_summary = await db.scalar(select(Summary.id).where(Summary.article_id == article.id))
         if not existing_summary:
-            summary = Summary(article_id=article.id, status="pending")
+            summary = Summary(
+                article_id=article.id,
+                status="skipped" if decision.route == ROUTE_SKIPPED else "pending",
+                triage=decision.route,
+                triage_reason=decision.reason,
+                priority=compute_priority(
+                    article.published_at,
+                    article.created_at,
+                    category=feed.category,
+                    source_type=feed.source_type,
+                ),
+            )
             db.add(summary)
+            if decision.reason:
+                logger.debug("article_triaged", url=url, route=decision.route, reason=decision.reason)
 
         return True
 
     def _parse_date(self, date_str: Optional[str]) -> Optional[datetime]:
-        """Parse various date formats"""
+        """Parse an RFC 822 date as naive UTC, like every other DateTime column
+
+        asyncpg rejects tz-aware values for `timestamp without time zone`.
+        """
         if not date_str:
             return None
         try:
-            from email.utils import parsedate_to_datetime
-            return parsedate_to_datetime(date_str)
-        except:
+            dt = parsedate_to_datetime(date_str)
+        except (TypeError, ValueError, IndexError):
             return None
+        if dt.tzinfo is not None:
+            dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+        return dt
@@ -0,0 +1,137 @@
+"""
+Priority scoring for the pending summary queue.
+
+Priority is expressed in "hours since epoch": an article's freshness is its
+publish time in hours, and category / source-type bonuses are worth a fixed
+number of hours of freshness. Because every pending row ages at the same rate,
+the relative order never changes over time, so the score is computed once at
+enqueue time and the processor simply drains `ORDER BY priority DESC` through
+the (status, priority) index.
+"""
+from datetime import datetime, timezone
+from typing import Optional
+from sqlalchemy import desc, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.taxonomy import DOMAIN_CATEGORY_LABELS, SOURCE_TYPE_LABELS
+from app.models import Article, Feed, Summary
+
+EPOCH = datetime(1970, 1, 1)
+
+# Bonuses in hours of freshness, keyed by the English taxonomy values
+CATEGORY_BONUS_HOURS = {
+    "AI/ML": 12,
+    "Security": 12,
+    "Engineering": 6,
+    "Systems": 6,
+    "Web": 6,
+    "Science": 3,
+    "Business": 3,
+}
+
+SOURCE_TYPE_BONUS_HOURS = {
+    "Company Tech Blog": 6,
+    "Research Institution": 6,
+    "Personal Blog": 3,
+}
+
+# Articles already visible on a first page jump ahead of everything else
+FIRST_PAGE_BOOST_HOURS = 7 * 24
+FIRST_PAGE_SIZE = 20
+
+# Legacy rows store Chinese labels; map them back to the English keys
+_CATEGORY_BY_LABEL = {label: key for key, label in DOMAIN_CATEGORY_LABELS.items()}
+_SOURCE_TYPE_BY_LABEL = {label: key for key, label in SOURCE_TYPE_LABELS.items()}
+
+
+def _to_hours(value: datetime) -> float:
+    """Convert a (possibly tz-aware) datetime to hours since epoch"""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return (value - EPOCH).total_seconds() / 3600
+
+
+def now_hours() -> float:
+    return _to_hours(datetime.utcnow())
+
+
+def compute_priority(
+    published_at: Optional[datetime],
+    created_at: Optional[datetime] = None,
+    category: Optional[str] = None,
+    source_type: Optional[str] = None,
+) -> float:
+    """Score a pending summary; higher values are processed first"""
+    current = now_hours()
+    reference = published_at or created_at
+    # Future-dated entries are clamped so they can't jump the queue
+    freshness = min(_to_hours(reference), current) if reference else current
+
+    category = _CATEGORY_BY_LABEL.get(category, category)
+    source_type = _SOURCE_TYPE_BY_LABEL.get(source_type, source_type)
+
+    return (
+        freshness
+        + CATEGORY_BONUS_HOURS.get(category, 0)
+        + SOURCE_TYPE_BONUS_HOURS.get(source_type, 0)
+    )
+
+
+async def _first_page_pending(db: AsyncSession, scope=None) -> list[int]:
+    """Pending article ids on page 1 of /api/articles, optionally filtered by `scope`
+
+    Page 1 is completed summaries first, then the rest by publish date, so
+    pending rows show only when fewer than a page of summaries is done.
+    Both reads stop after a page of rows.
+    """
+    completed = select(Article.id).join(Feed).join(Summary).where(Summary.status == "completed")
+    rest = select(Article.id, Summary.status).join(Feed).outerjoin(Summary).where(
+        or_(Summary.status.is_(None), Summary.status != "completed")
+    )
+    if scope is not None:
+        completed, rest = completed.where(scope), rest.where(scope)
+
+    shown = await db.scalar(select(func.count()).select_from(completed.limit(FIRST_PAGE_SIZE).subquery()))
+    if shown >= FIRST_PAGE_SIZE:
+        return []
+    rows = await db.execute(rest.order_by(desc(Article.published_at)).limit(FIRST_PAGE_SIZE - shown))
+    return [article_id for article_id, status in rows if status == "pending"]
+
+
+async def first_page_article_ids(db: AsyncSession) -> set[int]:
+    """Pending articles on page 1 of /api/articles, unfiltered or for their category
+
+    Each first page is read like the list endpoint reads it, down the
+    published_at index a page at a time; cost follows the number of
+    categories, not the size of the table.
+    """
+    ids = set(await _first_page_pending(db))
+    categories = await db.scalars(select(Feed.category).where(Feed.category.isnot(None)).distinct())
+    for category in categories.all():
+        ids.update(await _first_page_pending(db, Feed.category == category))
+    return ids
+
+
+async def boost_first_page(db: AsyncSession) -> int:
+    """Raise pending summaries visible on a first page above the rest of the queue
+
+    Returns the number of rows boosted. Caller is responsible for committing.
+    """
+    ids = await first_page_article_ids(db)
+    if not ids:
+        return 0
+
+    current = now_hours()
+    boosted = current + FIRST_PAGE_BOOST_HOURS
+    # Rows boosted on a previous run are still well above this threshold
+    threshold = current + FIRST_PAGE_BOOST_HOURS / 2
+    result = await db.execute(
+        update(Summary)
+        .where(
+            Summary.status == "pending",
+            Summary.article_id.in_(ids),
+            Summary.priority < threshold,
+        )
+        .values(priority=boosted)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
@@ -1,88 +1,169 @@
 import asyncio
-from sqlalchemy.orm import Session
-from app.core.db import SessionLocal
-from app.models import Article, Summary
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import data_changed
+from app.core.db import AsyncSessionLocal
+from app.models import Article, ArticleBody, Summary
+from app.services.base import BaseAIService, SummaryParseError
 from app.services.claude import ClaudeService
+from app.services.keywords import sync_article_keywords
 from app.core import logger
 from app.core.config import get_settings
+from app.tasks.priority import boost_first_page
+from app.tasks import budget
+from app.tasks.triage import ROUTE_ONE_LINER
 
 settings = get_settings()
 
+BATCH_SIZE = 50
+# A realtime claim this old was left by a crashed run (longer than any call with its retries)
+CLAIM_TIMEOUT = timedelta(minutes=15)
+
 class AIProcessor:
-    def __init__(self, max_concurrent: int = None):
+    def __init__(
+        self,
+        max_concurrent: int = None,
+        batch_size: int = BATCH_SIZE,
+        ai_service: Optional[BaseAIService] = None,
+    ):
         # Using ClaudeService which supports NewAPI/Zhipu compatibility
-        self.ai_service = ClaudeService()
+        self.ai_service = ai_service or ClaudeService()
         self.semaphore = asyncio.Semaphore(max_concurrent or settings.claude_max_concurrency)
+        self.batch_size = batch_size
 
     async def process_pending(self) -> None:
         """Process all pending summaries"""
-        db: Session = SessionLocal()
-        try:
-            pending = db.query(Summary).filter(
-                Summary.status == "pending"
-            ).join(Article).limit(50).all()
+        async with AsyncSessionLocal() as db:
+            pending = await self._next_batch(db, self.batch_size)
+
+        if not pending:
+            return
+
+        logger.info("ai_processing_started", count=len(pending))
+
+        async def _process(summary_id: int):
+            async with self.semaphore:
+                return await self._generate_summary(summary_id)
+
+        tasks = [_process(s.id) for s in pending]
+        await asyncio.gather(*tasks, return_exceptions=True)
 
-            if not pending:
-                return
+        logger.info("ai_processing_completed", total=len(pending), **self.ai_service.stats)
 
-            logger.info("ai_processing_started", count=len(pending))
+    async def _next_batch(self, db: AsyncSession, limit: int = BATCH_SIZE) -> list[Summary]:
+        """Highest-priority pending summaries, served by ix_summaries_pending_priority"""
+        await boost_first_page(db)
+        await self._release_stale_claims(db)
+        await db.commit()
+        query = select(Summary).where(Summary.status == "pending")
 
-            async def _process(summary_id: int):
-                async with self.semaphore:
-                    return await self._generate_summary(summary_id)
+        floor = await budget.min_priority(db)
+        if floor is not None:
+            # Daily budget spent: keep serving fresh work, pause the backlog
+            logger.warning("ai_budget_exhausted", min_priority=floor)
+            query = query.where(Summary.priority >= floor)
+
+        return list(await db.scalars(query.order_by(Summary.priority.desc(), Summary.id).limit(limit)))
+
+    async def _claim(self, db: AsyncSession, summary_id: int) -> bool:
+        """Take a pending row for a realtime call; False if backfill or another run has it
+
+        Realtime claims reuse the "batched" status, with no batch_id, so
+        BatchBackfill.submit skips the row as it skips its own. processed_at
+        stays NULL until the call finishes, so usage and budget totals only
+        see finished work.
+        """
+        claimed = await db.scalar(
+            update(Summary)
+            .where(Summary.id == summary_id, Summary.status == "pending")
+            .values(status="batched", batch_id=None, claimed_at=datetime.utcnow())
+            .returning(Summary.id)
+        )
+        await db.commit()
+        return claimed is not None
 
-            tasks = [_process(s.id) for s in pending]
-            await asyncio.gather(*tasks, return_exceptions=True)
+    async def _release_stale_claims(self, db: AsyncSession) -> None:
+        await db.execute(
+            update(Summary)
+            .where(Summary.status == "batched", Summary.batch_id.is_(None),
+                   Summary.claimed_at < datetime.utcnow() - CLAIM_TIMEOUT)
+            .values(status="pending", claimed_at=None)
+        )
 
-            logger.info("ai_processing_completed", total=len(pending))
-        finally:
-            db.close()
+    def _apply_usage(self, summary: Summary, usage: dict) -> None:
+        """Copy provider accounting from a service result onto the row"""
+        for field in (
+            "input_tokens", "output_tokens", "cache_read_tokens", "cache_write_tokens",
+            "latency_ms", "attempts", "cost_usd",
+        ):
+            setattr(summary, field, usage.get(field))
+        summary.processed_at = datetime.utcnow()
 
     async def _generate_summary(self, summary_id: int) -> bool:
         """Generate summary for single article
 
-        CRITICAL: Each coroutine gets its own Session to avoid threading issues.
-        SQLAlchemy Session is NOT thread/coroutine-safe.
+        CRITICAL: Each coroutine gets its own AsyncSession.
+        SQLAlchemy sessions are NOT safe to share between concurrent tasks.
         """
-        db: Session = SessionLocal()
-        try:
-            summary = db.query(Summary).filter(Summary.id == summary_id).first()
-            if not summary:
-                return False
+        async with AsyncSessionLocal() as db:
+            try:
+                if not await self._claim(db, summary_id):
+                    logger.debug("summary_already_claimed", summary_id=summary_id)
+                    return False
+                summary = await db.get(Summary, summary_id)
 
-            article = db.query(Article).filter(Article.id == summary.article_id).first()
-            if not article:
-                summary.status = "failed"
-                summary.error = "Article not found"
-                db.commit()
-                return False
+                article = await db.get(Article, summary.article_id)
+                if not article:
+                    summary.status = "failed"
+                    summary.error = "Article not found"
+                    summary.processed_at = datetime.utcnow()
+                    await db.commit()
+                    return False
+                body = await db.get(ArticleBody, article.id)
+                content = body.text if body else ""
 
-            result = await self.ai_service.summarize(article.title, article.content or "")
+                # Don't hold a read transaction open across the provider call
+                await db.commit()
 
-            summary.status = "completed"
-            summary.summary_cn = result["summary"]
-            summary.one_liner = result["one_liner"]
-            summary.keywords = result["keywords"]
-            summary.model_version = "claude-3-5-sonnet"  # Uses NewAPI endpoint
-            db.commit()
+                result = await self.ai_service.summarize(
+                    article.title,
+                    content,
+                    one_liner_only=summary.triage == ROUTE_ONE_LINER,
+                )
 
-            logger.info("summary_completed", article_id=article.id)
-            return True
+                summary.status = "completed"
+                summary.summary_cn = result["summary"]
+                summary.one_liner = result["one_liner"]
+                summary.keywords = result["keywords"]
+                summary.model_version = "claude-3-5-sonnet"  # Uses NewAPI endpoint
+                self._apply_usage(summary, result)
+                await db.flush()
+                await sync_article_keywords(db, [article.id])
+                await db.commit()
+                data_changed()
 
-        except Exception as e:
-            logger.error("summary_failed", summary_id=summary_id, error=str(e))
-            # Rollback the failed transaction first
-            db.rollback()
-            # Now update the status in a fresh transaction
-            try:
-                summary = db.query(Summary).filter(Summary.id == summary_id).first()
-                if summary:
-                    summary.status = "failed"
-                    summary.error = str(e)
-                    db.commit()
-            except Exception as inner_e:
-                logger.error("summary_status_update_failed", summary_id=summary_id, error=str(inner_e))
-                db.rollback()
-            return False
-        finally:
-            db.close()
+                logger.info("summary_completed", article_id=article.id)
+                return True
+
+            except Exception as e:
+                logger.error("summary_failed", summary_id=summary_id, error=str(e))
+                # Rollback the failed transaction first
+                await db.rollback()
+                # Now update the status in a fresh transaction
+                try:
+                    summary = await db.get(Summary, summary_id)
+                    if summary:
+                        summary.status = "failed"
+                        summary.error = str(e)
+                        summary.processed_at = datetime.utcnow()
+                        if isinstance(e, SummaryParseError):
+                            # The call was billed even though the output was unusable
+                            self._apply_usage(summary, e.usage)
+                        await db.commit()
+                        data_changed()
+                except Exception as inner_e:
+                    logger.error("summary_status_update_failed", summary_id=summary_id, error=str(inner_e))
+                    await db.rollback()
+                return False
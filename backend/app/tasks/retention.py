@@ -0,0 +1,146 @@
+"""
+Retention: move old articles out of the live tables into the archive.
+
+An article is due once it is older than `retention_days` (published_at, else
+created_at) or falls outside the newest `retention_max_per_feed` of its feed.
+Each batch is one transaction: rows are copied into archived_articles /
+archived_summaries, then deleted from articles, article_bodies, summaries and
+article_keywords (the search index follows through its triggers). Archived
+articles keep their id and stay readable through /api/articles/{id}.
+
+On SQLite the freed pages are then returned with incremental_vacuum in small
+steps, each its own short write transaction, so the fetcher and processor
+never queue behind one long VACUUM. PostgreSQL leaves this to autovacuum.
+"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+from sqlalchemy import delete, func, insert, literal, or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.cache import data_changed
+from app.core.db import AsyncSessionLocal
+from app.core import logger
+from app.core.config import get_settings
+from app.models import (
+    Article, ArticleBody, ArticleKeyword, ArchivedArticle, ArchivedSummary, Summary,
+)
+
+settings = get_settings()
+
+# Pause between vacuum steps so waiting writers get the lock
+VACUUM_STEP_PAUSE_SECONDS = 0.05
+SQLITE_AUTO_VACUUM_INCREMENTAL = 2
+
+_ARCHIVED_ARTICLE_COLUMNS = (
+    "id", "content_hash", "url", "title", "author", "language", "published_at", "feed_id", "created_at",
+)
+_ARCHIVED_SUMMARY_COLUMNS = (
+    "id", "article_id", "status", "triage", "triage_reason", "summary_cn", "one_liner", "keywords",
+    "model_version", "input_tokens", "output_tokens", "cost_usd", "processed_at", "created_at",
+)
+
+
+class Archiver:
+    def __init__(
+        self,
+        days: Optional[int] = None,
+        max_per_feed: Optional[int] = None,
+        batch_size: Optional[int] = None,
+        vacuum_pages: Optional[int] = None,
+    ):
+        self.days = settings.retention_days if days is None else days
+        self.max_per_feed = settings.retention_max_per_feed if max_per_feed is None else max_per_feed
+        self.batch_size = batch_size or settings.retention_batch_size
+        self.vacuum_pages = vacuum_pages or settings.retention_vacuum_pages
+
+    @property
+    def enabled(self) -> bool:
+        return self.days > 0 or self.max_per_feed > 0
+
+    def due(self, now: Optional[datetime] = None):
+        """SELECT of the next batch of article ids to archive, oldest id first"""
+        conditions = []
+        if self.days > 0:
+            cutoff = (now or datetime.utcnow()) - timedelta(days=self.days)
+            conditions.append(func.coalesce(Article.published_at, Article.created_at) < cutoff)
+        if self.max_per_feed > 0:
+            ranked = select(
+                Article.id,
+                func.row_number().over(
+                    partition_by=Article.feed_id,
+                    order_by=(Article.published_at.desc(), Article.id.desc()),
+                ).label("position"),
+            ).subquery()
+            conditions.append(Article.id.in_(
+                select(ranked.c.id).where(ranked.c.position > self.max_per_feed)
+            ))
+
+        # Rows held by a provider batch are archived after it is collected
+        in_flight = select(Summary.article_id).where(Summary.status == "batched")
+        # SQLite hands out max(id) + 1, so archiving the newest row would let its id be reused
+        newest = select(func.max(Article.id)).scalar_subquery()
+        return select(Article.id).where(
+            or_(*conditions), Article.id.notin_(in_flight), Article.id != newest
+        ).order_by(Article.id).limit(self.batch_size)
+
+    async def archive_batch(self, db: AsyncSession) -> int:
+        """Move one batch to the archive tables and commit; returns articles moved"""
+        if not self.enabled:
+            return 0
+        ids = list(await db.scalars(self.due()))
+        if not ids:
+            return 0
+
+        await db.execute(insert(ArchivedArticle).from_select(
+            [*_ARCHIVED_ARTICLE_COLUMNS, "body_codec", "body_data", "archived_at"],
+            select(
+                *(getattr(Article, name) for name in _ARCHIVED_ARTICLE_COLUMNS),
+                ArticleBody.codec, ArticleBody.data, literal(datetime.utcnow()),
+            ).outerjoin(ArticleBody, ArticleBody.article_id == Article.id).where(Article.id.in_(ids)),
+        ))
+        await db.execute(insert(ArchivedSummary).from_select(
+            list(_ARCHIVED_SUMMARY_COLUMNS),
+            select(*(getattr(Summary, name) for name in _ARCHIVED_SUMMARY_COLUMNS))
+            .where(Summary.article_id.in_(ids)),
+        ))
+        for column in (ArticleKeyword.article_id, ArticleBody.article_id, Summary.article_id, Article.id):
+            await db.execute(delete(column.class_).where(column.in_(ids)))
+        await db.commit()
+        data_changed()
+        return len(ids)
+
+    async def vacuum(self) -> int:
+        """Return free pages to the filesystem a few at a time; returns pages released"""
+        released = 0
+        async with AsyncSessionLocal() as db:
+            if db.get_bind().dialect.name != "sqlite":
+                return 0
+            if await db.scalar(text("PRAGMA auto_vacuum")) != SQLITE_AUTO_VACUUM_INCREMENTAL:
+                logger.warning("retention_vacuum_skipped", reason="auto_vacuum is not INCREMENTAL")
+                return 0
+
+            free = await db.scalar(text("PRAGMA freelist_count"))
+            while free:
+                await db.execute(text(f"PRAGMA incremental_vacuum({int(self.vacuum_pages)})"))
+                await db.commit()
+                remaining = await db.scalar(text("PRAGMA freelist_count"))
+                await db.commit()
+                if remaining >= free:
+                    break
+                released += free - remaining
+                free = remaining
+                await asyncio.sleep(VACUUM_STEP_PAUSE_SECONDS)
+        return released
+
+    async def run(self) -> dict:
+        """Archive until nothing is due, then vacuum"""
+        archived = 0
+        while True:
+            async with AsyncSessionLocal() as db:
+                moved = await self.archive_batch(db)
+            archived += moved
+            if moved < self.batch_size:
+                break
+        released = await self.vacuum()
+        logger.info("retention_completed", archived=archived, pages_released=released)
+        return {"archived": archived, "pages_released": released}
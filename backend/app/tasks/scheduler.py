@@ -2,6 +2,8 @@ import asyncio
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from app.tasks.fetcher import RSSFetcher
 from app.tasks.processor import AIProcessor
+from app.tasks.retention import Archiver
+from app.tasks import counters
 from app.core.logging import logger
 from app.core.config import get_settings
 
@@ -23,6 +25,19 @@ async def scheduled_process():
     await processor.process_pending()
     logger.info("scheduled_process_completed")
 
+@scheduler.scheduled_job('interval', hours=6)
+async def scheduled_retention():
+    archiver = Archiver()
+    if not archiver.enabled:
+        return
+    logger.info("scheduled_retention_started")
+    await archiver.run()
+    logger.info("scheduled_retention_completed")
+
+@scheduler.scheduled_job('interval', hours=1)
+async def scheduled_reconcile_counters():
+    await counters.reconcile()
+
 def start_scheduler():
     logger.info("scheduler_starting")
     scheduler.start()
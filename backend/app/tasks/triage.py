@@ -0,0 +1,115 @@
+"""
+Ingest-time triage: decide whether a new article needs a provider call at all.
+
+Routes:
+- "summarize": full Chinese summary (the default)
+- "one_liner": cheaper one-liner + keywords only (already Chinese, or short)
+- "skipped":   no provider call (empty, link-only, or duplicate)
+
+A duplicate is the same link (tracking parameters aside), or a repost in the
+same feed: same title and nearly the same body. A title alone is not enough,
+since recurring posts ("Weekly Roundup") reuse it with new content.
+"""
+import re
+from difflib import SequenceMatcher
+from dataclasses import dataclass
+from typing import Optional
+from bs4 import BeautifulSoup
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Article, ArticleBody
+from app.utils.language import detect_language
+from app.utils.url import normalize_url
+
+ROUTE_SUMMARIZE = "summarize"
+ROUTE_ONE_LINER = "one_liner"
+ROUTE_SKIPPED = "skipped"
+
+# Below this there is nothing to summarize
+MIN_CONTENT_CHARS = 80
+# Up to this length a one-liner says as much as a summary would
+ONE_LINER_MAX_CHARS = 600
+# Link-only posts (HN/Lobsters style "Comments" links) are short and mostly anchor text
+LINK_ONLY_MAX_CHARS = 280
+LINK_ONLY_ANCHOR_RATIO = 0.6
+# Same-title articles in a feed are reposts only when the bodies mostly match
+DUPLICATE_BODY_SIMILARITY = 0.9
+DUPLICATE_COMPARE_CHARS = 2000
+DUPLICATE_MAX_CANDIDATES = 5
+
+# Bodies made only of URLs and aggregator boilerplate ("Article URL: ... Comments")
+_URL_ONLY_RE = re.compile(r"^(?:https?://\S+|article url:?|comments url:?|comments|points:?|#|\d+|\s)+$", re.I)
+
+
+@dataclass
+class TriageDecision:
+    route: str
+    reason: Optional[str]
+    language: str
+    content_length: int
+
+
+def is_link_only(raw_html: str, text: str) -> bool:
+    """True when the entry body is essentially just links"""
+    if len(text) > LINK_ONLY_MAX_CHARS:
+        return False
+    if _URL_ONLY_RE.match(text):
+        return True
+    if not raw_html or "<a" not in raw_html.lower():
+        return False
+    anchors = BeautifulSoup(raw_html, "html.parser").find_all("a")
+    anchor_chars = sum(len(a.get_text(strip=True)) for a in anchors)
+    return anchor_chars >= LINK_ONLY_ANCHOR_RATIO * max(len(text), 1)
+
+
+def similar_bodies(a: str, b: str) -> bool:
+    """True when two bodies are (nearly) the same text, judged on their openings"""
+    matcher = SequenceMatcher(None, a[:DUPLICATE_COMPARE_CHARS], b[:DUPLICATE_COMPARE_CHARS], autojunk=False)
+    return (matcher.real_quick_ratio() >= DUPLICATE_BODY_SIMILARITY
+            and matcher.quick_ratio() >= DUPLICATE_BODY_SIMILARITY
+            and matcher.ratio() >= DUPLICATE_BODY_SIMILARITY)
+
+
+async def find_duplicate(db: AsyncSession, url: str, title: str, feed_id: int, text: str) -> Optional[int]:
+    """An existing article with the same normalized URL, or a same-feed repost (same title, similar body)"""
+    article_id = await db.scalar(select(Article.id).where(Article.url.in_({url, normalize_url(url)})).limit(1))
+    if article_id is not None:
+        return article_id
+    candidates = await db.scalars(
+        select(ArticleBody).join(Article, Article.id == ArticleBody.article_id)
+        .where(Article.feed_id == feed_id, Article.title == title)
+        .order_by(Article.id.desc()).limit(DUPLICATE_MAX_CANDIDATES)
+    )
+    for body in candidates:
+        if similar_bodies(body.text, text):
+            return body.article_id
+    return None
+
+
+async def triage_entry(
+    db: AsyncSession,
+    url: str,
+    title: str,
+    feed_id: int,
+    raw_content: str,
+    text: str,
+) -> TriageDecision:
+    """Route a new entry; `text` is the cleaned body, `raw_content` the original HTML"""
+    length = len(text)
+    language = detect_language(f"{title} {text}")
+
+    def decide(route: str, reason: Optional[str] = None) -> TriageDecision:
+        return TriageDecision(route=route, reason=reason, language=language, content_length=length)
+
+    duplicate_of = await find_duplicate(db, url, title, feed_id, text)
+    if duplicate_of is not None:
+        return decide(ROUTE_SKIPPED, f"duplicate of article {duplicate_of}")
+    if is_link_only(raw_content, text):
+        return decide(ROUTE_SKIPPED, "link_only")
+    if length < MIN_CONTENT_CHARS:
+        return decide(ROUTE_SKIPPED, "empty")
+    if language == "zh":
+        return decide(ROUTE_ONE_LINER, "already_chinese")
+    if length <= ONE_LINER_MAX_CHARS:
+        return decide(ROUTE_ONE_LINER, "short")
+    return decide(ROUTE_SUMMARIZE)
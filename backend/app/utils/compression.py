@@ -0,0 +1,24 @@
+import zlib
+
+# "raw" is plain UTF-8, used when compressing would not save anything
+CODEC_ZLIB = "zlib"
+CODEC_RAW = "raw"
+
+ZLIB_LEVEL = 6
+
+
+def compress_text(text: str) -> tuple[str, bytes]:
+    """(codec, payload) for storing `text`"""
+    raw = text.encode("utf-8")
+    packed = zlib.compress(raw, ZLIB_LEVEL)
+    if len(packed) < len(raw):
+        return CODEC_ZLIB, packed
+    return CODEC_RAW, raw
+
+
+def decompress_text(codec: str, payload: bytes) -> str:
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(payload).decode("utf-8")
+    if codec == CODEC_RAW:
+        return bytes(payload).decode("utf-8")
+    raise ValueError(f"Unknown body codec: {codec}")
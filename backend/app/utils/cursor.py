@@ -0,0 +1,31 @@
+import base64
+import json
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+
+class ArticleCursor(NamedTuple):
+    """Position after the last article of a page, in list order"""
+    has_summary: int  # 0 = completed summary (listed first), 1 = the rest
+    published_at: Optional[datetime]
+    id: int
+
+
+def encode_cursor(cursor: ArticleCursor) -> str:
+    published_at = cursor.published_at.isoformat() if cursor.published_at else None
+    raw = json.dumps([cursor.has_summary, published_at, cursor.id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str) -> ArticleCursor:
+    """Inverse of encode_cursor; raises ValueError for anything it did not produce"""
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        has_summary, published_at, article_id = json.loads(raw)
+        if published_at is not None:
+            published_at = datetime.fromisoformat(published_at)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if has_summary not in (0, 1) or type(article_id) is not int:
+        raise ValueError("Invalid cursor")
+    return ArticleCursor(has_summary, published_at, article_id)
@@ -0,0 +1,103 @@
+"""
+Local repair of almost-JSON model output.
+
+Models frequently return JSON wrapped in markdown fences, followed by a stray
+prose line, with a trailing comma, or with unescaped quotes inside a Chinese
+string. Fixing those locally is free; re-sending the prompt is not.
+"""
+import json
+import re
+
+_FENCE_RE = re.compile(r"```(?:json|JSON)?\s*(.*?)```", re.DOTALL)
+_TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+_SMART_QUOTES = str.maketrans({"“": '"', "”": '"'})
+
+
+def strip_fences(text: str) -> str:
+    """Return the contents of the first markdown code block, if any"""
+    match = _FENCE_RE.search(text)
+    if match:
+        return match.group(1)
+    # Unterminated fence: drop the opening line
+    if text.lstrip().startswith("```"):
+        return text.lstrip().split("\n", 1)[-1]
+    return text
+
+
+def extract_object(text: str) -> str:
+    """Cut leading/trailing prose around the outermost JSON object"""
+    start = text.find("{")
+    end = text.rfind("}")
+    if start == -1:
+        return text
+    if end < start:
+        # Truncated output - close the object and let the other passes cope
+        return text[start:] + "}"
+    return text[start:end + 1]
+
+
+def remove_trailing_commas(text: str) -> str:
+    return _TRAILING_COMMA_RE.sub(r"\1", text)
+
+
+def escape_inner_quotes(text: str) -> str:
+    """Escape quotes and raw newlines that appear inside string values
+
+    A quote only closes a string when the next non-space character is a JSON
+    delimiter; any other quote is treated as content and escaped.
+    """
+    out = []
+    in_string = False
+    escaped = False
+    length = len(text)
+    for i, char in enumerate(text):
+        if not in_string:
+            out.append(char)
+            if char == '"':
+                in_string = True
+            continue
+
+        if escaped:
+            out.append(char)
+            escaped = False
+        elif char == "\\":
+            out.append(char)
+            escaped = True
+        elif char == '"':
+            j = i + 1
+            while j < length and text[j] in " \t\r\n":
+                j += 1
+            if j >= length or text[j] in ",:}]":
+                out.append(char)
+                in_string = False
+            else:
+                out.append('\\"')
+        elif char == "\n":
+            out.append("\\n")
+        elif char == "\r":
+            continue
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+def repair_json(text: str) -> str:
+    """Apply all repair passes and return text suitable for json.loads"""
+    text = strip_fences(text.strip())
+    text = extract_object(text)
+    if '"' not in text:
+        text = text.translate(_SMART_QUOTES)
+    text = remove_trailing_commas(text)
+    return escape_inner_quotes(text)
+
+
+def loads_with_repair(text: str) -> tuple[object, bool]:
+    """Parse JSON, repairing locally if needed.
+
+    Returns (value, repaired). Raises json.JSONDecodeError if repair fails.
+    """
+    try:
+        return json.loads(text), False
+    except json.JSONDecodeError:
+        pass
+    return json.loads(repair_json(text)), True
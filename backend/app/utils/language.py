@@ -0,0 +1,31 @@
+import re
+
+# Character classes are enough to tell the scripts we care about apart
+_HAN_RE = re.compile(r"[一-鿿㐀-䶿]")
+_KANA_RE = re.compile(r"[぀-ヿ]")
+_HANGUL_RE = re.compile(r"[가-힯]")
+_LATIN_RE = re.compile(r"[A-Za-z]")
+
+
+def detect_language(text: str, sample_size: int = 2000) -> str:
+    """Cheap script-based language guess: "zh", "ja", "ko", "en" or "unknown"
+
+    Latin-script text is reported as "en"; that is the only Latin language
+    the summarizer distinguishes.
+    """
+    sample = text[:sample_size]
+    han = len(_HAN_RE.findall(sample))
+    kana = len(_KANA_RE.findall(sample))
+    hangul = len(_HANGUL_RE.findall(sample))
+    latin = len(_LATIN_RE.findall(sample))
+    total = han + kana + hangul + latin
+    if total == 0:
+        return "unknown"
+    if kana / total > 0.1:
+        return "ja"
+    if hangul / total > 0.2:
+        return "ko"
+    # One Han character carries roughly a word; Latin needs ~5 letters per word
+    if han / total > 0.3:
+        return "zh"
+    return "en"
@@ -0,0 +1,42 @@
+#!/usr/bin/env python
+"""
+Apply the retention policy once: archive old articles, then vacuum in steps.
+
+    python scripts/archive.py --days 180 --max-per-feed 2000 [--dry-run]
+
+Defaults come from RETENTION_* in .env (see app.tasks.retention).
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+from sqlalchemy import func, select
+from app.core.db import AsyncSessionLocal
+from app.tasks.retention import Archiver
+
+
+async def main(args) -> None:
+    archiver = Archiver(days=args.days, max_per_feed=args.max_per_feed, batch_size=args.batch_size)
+    if not archiver.enabled:
+        print("Retention is off: pass --days and/or --max-per-feed (or set RETENTION_* in .env)")
+        return
+
+    if args.dry_run:
+        async with AsyncSessionLocal() as db:
+            due = await db.scalar(select(func.count()).select_from(archiver.due().limit(None).subquery()))
+        print(f"{due} articles would be archived")
+        return
+
+    result = await archiver.run()
+    print(f"Archived {result['archived']} articles, released {result['pages_released']} pages")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archive articles past the retention policy")
+    parser.add_argument("--days", type=int, default=None, help="Archive articles older than this")
+    parser.add_argument("--max-per-feed", type=int, default=None, help="Keep at most this many per feed")
+    parser.add_argument("--batch-size", type=int, default=None, help="Articles moved per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="Only count what would be archived")
+    asyncio.run(main(parser.parse_args()))
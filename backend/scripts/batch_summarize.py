@@ -1,6 +1,11 @@
 #!/usr/bin/env python
 """
 Batch process summaries with concurrent execution and progress tracking
+
+--mode realtime (default) drains the queue through the interactive API.
+--mode batch-api submits the backlog as provider Message Batches (half price,
+asynchronous); it is resumable, so re-running after a crash picks up the
+batches already submitted.
 """
 import sys
 import time
@@ -9,11 +14,20 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import asyncio
 from app.tasks.processor import AIProcessor
+from app.tasks.backfill import BatchBackfill, BATCH_SIZE, MIN_AGE_HOURS, POLL_INTERVAL_SECONDS
 from app.core.db import SessionLocal
-from app.models import Summary
+from app.models import StatsCounters
 from datetime import datetime
 
 
+def _summary_counts() -> dict:
+    db = SessionLocal()
+    try:
+        return db.get(StatsCounters, 1).summaries_by_status()
+    finally:
+        db.close()
+
+
 async def batch_process(concurrency: int = 2, max_articles: int = None):
     """Process all pending summaries with progress tracking"""
 
@@ -21,13 +35,11 @@ async def batch_process(concurrency: int = 2, max_articles: int = None):
     start_time = time.time()
 
     while True:
-        db = SessionLocal()
-        pending_count = db.query(Summary).filter(Summary.status == "pending").count()
-
-        # Track progress
-        completed_before = db.query(Summary).filter(Summary.status == "completed").count()
-        failed_before = db.query(Summary).filter(Summary.status == "failed").count()
-        db.close()
+        # Track progress from the counters row rather than counting summaries each round
+        counts = _summary_counts()
+        pending_count = counts["pending"]
+        completed_before = counts["completed"]
+        failed_before = counts["failed"]
 
         if pending_count == 0:
             print(f"\n✅ No more pending summaries!")
@@ -48,11 +60,8 @@ async def batch_process(concurrency: int = 2, max_articles: int = None):
         await asyncio.sleep(1)
 
     # Final stats
-    db = SessionLocal()
-    stats = {}
-    for status in ["pending", "completed", "failed"]:
-        stats[status] = db.query(Summary).filter(Summary.status == status).count()
-    db.close()
+    counts = _summary_counts()
+    stats = {status: counts[status] for status in ["pending", "completed", "failed"]}
 
     elapsed = int((time.time() - start_time)/60)
     print(f"\n{'='*60}")
@@ -60,15 +69,41 @@ async def batch_process(concurrency: int = 2, max_articles: int = None):
     print(f"📈 Final stats: {stats}")
 
 
+async def batch_api_backfill(batch_size: int, min_age_hours: float, poll_interval: float):
+    """Drain the backlog through provider batch jobs"""
+    start_time = time.time()
+    backfill = BatchBackfill(batch_size=batch_size, min_age_hours=min_age_hours)
+    await backfill.run(poll_interval=poll_interval)
+
+    counts = _summary_counts()
+    stats = {status: counts[status] for status in ["pending", "batched", "completed", "failed"]}
+
+    elapsed = int((time.time() - start_time)/60)
+    print(f"\n{'='*60}")
+    print(f"✅ Backfill done! Elapsed: {elapsed} min")
+    print(f"📈 Final stats: {stats}")
+
+
 if __name__ == "__main__":
     import argparse
     parser = argparse.ArgumentParser()
+    parser.add_argument("--mode", choices=["realtime", "batch-api"], default="realtime")
     parser.add_argument("--concurrency", type=int, default=2, help="Concurrent API calls")
     parser.add_argument("--max", type=int, help="Max articles to process (default: all)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Requests per provider batch")
+    parser.add_argument("--min-age-hours", type=float, default=MIN_AGE_HOURS,
+                        help="Leave articles fresher than this to the realtime processor")
+    parser.add_argument("--poll-interval", type=float, default=POLL_INTERVAL_SECONDS)
     args = parser.parse_args()
 
-    print(f"🚀 Starting batch processing")
-    print(f"   Concurrency: {args.concurrency}")
-    print(f"   Max articles: {args.max or 'all pending'}")
-
-    asyncio.run(batch_process(args.concurrency, args.max))
+    if args.mode == "batch-api":
+        print(f"🚀 Starting provider batch backfill")
+        print(f"   Batch size: {args.batch_size}")
+        print(f"   Min age: {args.min_age_hours}h")
+        asyncio.run(batch_api_backfill(args.batch_size, args.min_age_hours, args.poll_interval))
+    else:
+        print(f"🚀 Starting batch processing")
+        print(f"   Concurrency: {args.concurrency}")
+        print(f"   Max articles: {args.max or 'all pending'}")
+
+        asyncio.run(batch_process(args.concurrency, args.max))
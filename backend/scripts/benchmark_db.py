@@ -0,0 +1,188 @@
+#!/usr/bin/env python
+"""
+Benchmark the SQLite connection profile under a mixed read/write load.
+
+Seeds a scratch database, then for each profile runs concurrent readers
+(the /api/articles and /api/stats handlers) against writers that update
+summaries the way the processor does. Reports throughput, read latency
+percentiles and "database is locked" errors.
+
+    python scripts/benchmark_db.py -n 5000 --readers 8 --writers 2 --seconds 10
+
+"default" is SQLite's own behaviour (rollback journal, synchronous=FULL);
+"tuned" is the profile from Settings (WAL, synchronous=NORMAL, ...).
+"""
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Point the app at a scratch database before anything imports app.core.db
+_bench_dir = tempfile.mkdtemp(prefix="rss-dbbench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_bench_dir}/seed.db"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.articles import list_articles
+from app.api.stats import get_stats
+from app.core import fts
+from app.core.db import Base, SessionLocal, apply_sqlite_pragmas, engine, sqlite_pragmas
+from app.models import Article, ArticleBody, Feed, Summary
+from app.services.hot_window import hot_window
+
+# Every read should reach the database under test, not the in-memory hot window
+hot_window.hours = 0
+
+PROFILES = {
+    "default": {"journal_mode": "DELETE"},
+    "tuned": sqlite_pragmas(),
+}
+
+CATEGORIES = ["AI/ML", "Security", "Engineering", "Web", "Systems"]
+
+
+def seed(n: int) -> None:
+    """Create the schema and n articles, about 20% of them still pending"""
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        feeds = [
+            Feed(url=f"https://bench.example/{i}", title=f"Feed {i}", category=CATEGORIES[i % len(CATEGORIES)])
+            for i in range(50)
+        ]
+        db.add_all(feeds)
+        db.flush()
+        now = datetime.utcnow()
+        body = "Benchmark article body. " * 100
+        articles = [
+            Article(
+                content_hash=f"bench-{i}",
+                url=f"https://bench.example/a/{i}",
+                title=f"Benchmark article {i}",
+                body=ArticleBody(text=body),
+                published_at=now - timedelta(minutes=i),
+                feed_id=feeds[i % len(feeds)].id,
+            )
+            for i in range(n)
+        ]
+        db.add_all(articles)
+        db.flush()
+        db.add_all(
+            Summary(article_id=a.id, status="pending" if i % 5 == 0 else "completed",
+                    one_liner="One liner", keywords=["a", "b", "c"], priority=float(n - i))
+            for i, a in enumerate(articles)
+        )
+        db.commit()
+    finally:
+        db.close()
+    engine.dispose()
+
+
+def percentile(values: list[float], pct: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+async def run_profile(name: str, pragmas: dict, n: int, readers: int, writers: int, seconds: float) -> dict:
+    path = Path(_bench_dir) / f"{name}.db"
+    shutil.copy(Path(_bench_dir) / "seed.db", path)
+
+    bench_engine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}", pool_size=readers + writers, max_overflow=0
+    )
+    apply_sqlite_pragmas(bench_engine.sync_engine, pragmas)
+    fts.register_sqlite_functions(bench_engine.sync_engine)
+    sessions = async_sessionmaker(bench_engine, expire_on_commit=False)
+
+    deadline = time.perf_counter() + seconds
+    read_latencies: list[float] = []
+    counts = {"reads": 0, "writes": 0, "locked": 0}
+
+    async def reader(worker: int):
+        rng = random.Random(worker)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                async with sessions() as db:
+                    # __wrapped__: the handlers themselves, without the in-process response cache
+                    if rng.random() < 0.2:
+                        await get_stats.__wrapped__(db=db)
+                    else:
+                        await list_articles.__wrapped__(page=rng.randint(1, 5), page_size=20, feed_id=None,
+                                                        category=rng.choice([None, *CATEGORIES]), keyword=None,
+                                                        tag=None, cursor=None, db=db)
+            except OperationalError:
+                counts["locked"] += 1
+                continue
+            read_latencies.append((time.perf_counter() - started) * 1000)
+            counts["reads"] += 1
+
+    async def writer(worker: int):
+        rng = random.Random(1000 + worker)
+        while time.perf_counter() < deadline:
+            try:
+                async with sessions() as db:
+                    await db.execute(
+                        update(Summary)
+                        .where(Summary.id == rng.randint(1, n))
+                        .values(status="completed", summary_cn="摘要" * 100, processed_at=datetime.utcnow())
+                    )
+                    await db.commit()
+            except OperationalError:
+                counts["locked"] += 1
+                continue
+            counts["writes"] += 1
+
+    await asyncio.gather(*[reader(i) for i in range(readers)], *[writer(i) for i in range(writers)])
+    await bench_engine.dispose()
+
+    return {
+        "profile": name,
+        "reads_per_second": counts["reads"] / seconds,
+        "writes_per_second": counts["writes"] / seconds,
+        "p50_ms": percentile(read_latencies, 0.50),
+        "p95_ms": percentile(read_latencies, 0.95),
+        "p99_ms": percentile(read_latencies, 0.99),
+        "locked": counts["locked"],
+    }
+
+
+async def main(args) -> None:
+    print(f"Seeding {args.n} articles into {_bench_dir}")
+    seed(args.n)
+    print(f"{args.readers} readers, {args.writers} writers, {args.seconds}s per profile\n")
+
+    header = f"{'profile':>8} {'reads/s':>8} {'writes/s':>8} {'p50ms':>7} {'p95ms':>7} {'p99ms':>7} {'locked':>6}"
+    print(header)
+    print("-" * len(header))
+    for name in args.profile:
+        r = await run_profile(name, PROFILES[name], args.n, args.readers, args.writers, args.seconds)
+        print(
+            f"{r['profile']:>8} {r['reads_per_second']:>8.1f} {r['writes_per_second']:>8.1f} "
+            f"{r['p50_ms'] or 0:>7.1f} {r['p95_ms'] or 0:>7.1f} {r['p99_ms'] or 0:>7.1f} {r['locked']:>6}"
+        )
+    shutil.rmtree(_bench_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark SQLite connection profiles")
+    parser.add_argument("-n", type=int, default=5000, help="Articles to seed")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--profile", nargs="+", choices=list(PROFILES), default=list(PROFILES))
+    asyncio.run(main(parser.parse_args()))
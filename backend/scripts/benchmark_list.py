@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+"""
+Benchmark the article list hot path: query plus JSON serialization.
+
+Seeds a scratch SQLite database (1M articles by default, bulk-inserted),
+then times /api/articles pages the way the route runs them, bypassing the
+in-process response cache. "entities" is the previous shape (full Article
+entities, one ArticleListItem built per row); "projection" is the current
+handler's SQL path (list columns only, one TypeAdapter call per page);
+"hot" is the same handler answering from the in-memory hot window. Reports
+rows/s and latency percentiles per page size.
+
+    python scripts/benchmark_list.py -n 1000000 --page-size 20 100 --requests 300
+"""
+import os
+import sys
+import shutil
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Point the app at a scratch database before anything imports app.core.db
+_bench_dir = tempfile.mkdtemp(prefix="rss-listbench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_bench_dir}/bench.db"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import argparse
+import asyncio
+import random
+import time
+from datetime import datetime, timedelta
+
+from pydantic import TypeAdapter
+from sqlalchemy import case, desc, insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.articles import list_articles
+from app.core.db import Base, apply_sqlite_pragmas, engine, sqlite_pragmas
+from app.models import Article, Feed, Summary
+from app.schemas.article import ArticleListItem, PaginatedArticlesResponse
+from app.services.hot_window import hot_window
+
+CATEGORIES = ["AI/ML", "Security", "Engineering", "Web", "Systems"]
+CHUNK = 20000
+
+response_adapter = TypeAdapter(PaginatedArticlesResponse)
+
+
+def seed(n: int) -> None:
+    """Create the schema and n articles (no bodies; the list never reads them), 20% pending"""
+    Base.metadata.create_all(bind=engine)
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        conn.execute(insert(Feed), [
+            {"url": f"https://bench.example/{i}", "title": f"Feed {i}", "category": CATEGORIES[i % len(CATEGORIES)]}
+            for i in range(50)
+        ])
+    for start in range(0, n, CHUNK):
+        ids = range(start + 1, min(start + CHUNK, n) + 1)
+        with engine.begin() as conn:
+            conn.execute(insert(Article), [
+                {"id": i, "content_hash": f"bench-{i}", "url": f"https://bench.example/a/{i}",
+                 "title": f"Benchmark article {i}", "published_at": now - timedelta(minutes=i),
+                 "created_at": now, "feed_id": i % 50 + 1}
+                for i in ids
+            ])
+            conn.execute(insert(Summary), [
+                {"article_id": i, "status": "pending" if i % 5 == 0 else "completed",
+                 "one_liner": "One liner", "keywords": ["a", "b", "c"], "priority": float(n - i)}
+                for i in ids
+            ])
+        print(f"  {ids[-1]}/{n}", end="\r", flush=True)
+    print()
+    engine.dispose()
+
+
+async def entities_page(db, page: int, page_size: int, category):
+    """The list handler as it was: whole Article entities, a model per row"""
+    query = select(
+        Article,
+        Feed.title.label("feed_title"),
+        Feed.category.label("feed_category"),
+        Summary.status.label("summary_status"),
+        Summary.one_liner,
+        Summary.keywords,
+    ).join(Feed).outerjoin(Summary)
+    if category:
+        query = query.where(Feed.category == category)
+    rows = (await db.execute(query.order_by(
+        case((Summary.status == 'completed', 0), else_=1), desc(Article.published_at)
+    ).offset((page - 1) * page_size).limit(page_size + 1))).all()
+    items = [
+        ArticleListItem(
+            id=a.Article.id, title=a.Article.title, url=a.Article.url, one_liner=a.one_liner,
+            keywords=a.keywords or [], published_at=a.Article.published_at, created_at=a.Article.created_at,
+            feed_title=a.feed_title, feed_category=a.feed_category,
+        )
+        for a in rows[:page_size]
+    ]
+    return PaginatedArticlesResponse(items=items, total=0, page=page, page_size=page_size,
+                                     has_next=len(rows) > page_size)
+
+
+async def handler_page(db, page: int, page_size: int, category):
+    # __wrapped__: the handler itself, without the in-process response cache
+    return await list_articles.__wrapped__(page=page, page_size=page_size, feed_id=None, category=category,
+                                           keyword=None, tag=None, cursor=None, db=db)
+
+
+async def projection_page(db, page: int, page_size: int, category):
+    hours, hot_window.hours = hot_window.hours, 0
+    try:
+        return await handler_page(db, page, page_size, category)
+    finally:
+        hot_window.hours = hours
+
+
+MODES = {"entities": entities_page, "projection": projection_page, "hot": handler_page}
+
+
+def percentile(values: list[float], pct: float):
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+async def run(mode: str, page_size: int, requests: int) -> dict:
+    bench_engine = create_async_engine(f"sqlite+aiosqlite:///{_bench_dir}/bench.db")
+    apply_sqlite_pragmas(bench_engine.sync_engine, sqlite_pragmas())
+    sessions = async_sessionmaker(bench_engine, expire_on_commit=False)
+    rng = random.Random(page_size)
+    latencies, rows = [], 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        begun = time.perf_counter()
+        async with sessions() as db:
+            result = await MODES[mode](db, rng.randint(1, 5), page_size, rng.choice([None, *CATEGORIES]))
+        body = response_adapter.dump_json(result)
+        latencies.append((time.perf_counter() - begun) * 1000)
+        rows += len(result.items)
+        assert body
+    elapsed = time.perf_counter() - started
+    await bench_engine.dispose()
+    return {
+        "mode": mode, "page_size": page_size, "rows_per_second": rows / elapsed,
+        "p50_ms": percentile(latencies, 0.50), "p95_ms": percentile(latencies, 0.95),
+    }
+
+
+async def main(args) -> None:
+    print(f"Seeding {args.n} articles into {_bench_dir}")
+    seed(args.n)
+    header = f"{'mode':>10} {'page':>5} {'rows/s':>9} {'p50ms':>7} {'p95ms':>7}"
+    print(header)
+    print("-" * len(header))
+    for page_size in args.page_size:
+        for mode in args.mode:
+            r = await run(mode, page_size, args.requests)
+            print(f"{r['mode']:>10} {r['page_size']:>5} {r['rows_per_second']:>9.0f} "
+                  f"{r['p50_ms']:>7.1f} {r['p95_ms']:>7.1f}")
+    shutil.rmtree(_bench_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the article list query and serialization")
+    parser.add_argument("-n", type=int, default=1_000_000, help="Articles to seed")
+    parser.add_argument("--page-size", type=int, nargs="+", default=[20, 100])
+    parser.add_argument("--requests", type=int, default=300, help="Pages timed per mode and page size")
+    parser.add_argument("--mode", nargs="+", choices=list(MODES), default=list(MODES))
+    asyncio.run(main(parser.parse_args()))
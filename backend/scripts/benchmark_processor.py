@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+"""
+Benchmark AIProcessor throughput against the local mock LLM endpoint.
+
+Seeds N pending summaries into a throwaway SQLite database, drains them with
+each concurrency / batch-size combination and reports summaries per second,
+provider latency percentiles and wasted calls (429/500 retries and answers
+that could not be used). No real provider is called.
+
+    python scripts/benchmark_processor.py -n 200 --concurrency 1 2 4 8 --batch-size 50
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# Point the app at a scratch database before anything imports app.core.db
+_bench_dir = tempfile.mkdtemp(prefix="rss-bench-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_bench_dir}/bench.db"
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import argparse
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from tenacity import wait_exponential
+
+from app.core.db import Base, SessionLocal, engine
+from app.models import Article, ArticleBody, Feed, Summary
+from app.scripts.mock_llm import MockLLMConfig, MockLLMServer
+from app.services.claude import ClaudeService
+from app.tasks.priority import compute_priority
+from app.tasks.processor import AIProcessor
+
+
+def seed(n: int) -> None:
+    """Recreate the schema and insert n articles with pending summaries"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        feed = Feed(url="https://bench.example/rss", title="Bench", category="Engineering", is_active=True)
+        db.add(feed)
+        db.flush()
+        now = datetime.utcnow()
+        body = "Benchmark article body. " * 100
+        for i in range(n):
+            published = now - timedelta(minutes=i)
+            article = Article(
+                content_hash=f"bench-{i}",
+                url=f"https://bench.example/{i}",
+                title=f"Benchmark article {i}",
+                body=ArticleBody(text=body),
+                published_at=published,
+                feed_id=feed.id,
+            )
+            db.add(article)
+            db.flush()
+            db.add(Summary(article_id=article.id, status="pending",
+                           priority=compute_priority(published, category=feed.category)))
+        db.commit()
+    finally:
+        db.close()
+
+
+def percentile(values: list[int], pct: float):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+async def run_once(server: MockLLMServer, n: int, concurrency: int, batch_size: int, backoff_max: float) -> dict:
+    seed(n)
+    requests_before = server.counters.requests
+
+    service = ClaudeService(api_key="bench-key", base_url=server.url)
+    service.retry_wait = wait_exponential(min=0.05, max=backoff_max)
+    processor = AIProcessor(max_concurrent=concurrency, batch_size=batch_size, ai_service=service)
+
+    started = time.perf_counter()
+    while True:
+        db = SessionLocal()
+        pending = db.query(Summary).filter(Summary.status == "pending").count()
+        db.close()
+        if pending == 0:
+            break
+        await processor.process_pending()
+    elapsed = time.perf_counter() - started
+
+    db = SessionLocal()
+    try:
+        completed = db.query(Summary).filter(Summary.status == "completed").count()
+        failed = db.query(Summary).filter(Summary.status == "failed").count()
+        latencies = [
+            row[0] for row in db.query(Summary.latency_ms).filter(Summary.latency_ms.isnot(None))
+        ]
+    finally:
+        db.close()
+
+    calls = server.counters.requests - requests_before
+    return {
+        "concurrency": concurrency,
+        "batch_size": batch_size,
+        "completed": completed,
+        "failed": failed,
+        "seconds": elapsed,
+        "per_second": completed / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "calls": calls,
+        "wasted_calls": calls - completed,
+        "repaired": service.stats["repaired"],
+    }
+
+
+async def main(args) -> None:
+    config = MockLLMConfig(
+        latency_ms=args.latency_ms,
+        latency_distribution=args.distribution,
+        jitter_ms=args.jitter_ms,
+        rate_429=args.rate_429,
+        rate_500=args.rate_500,
+        malformed_rate=args.malformed_rate,
+        unparseable_rate=args.unparseable_rate,
+        seed=args.seed,
+    )
+    print(f"Mock LLM: {config}")
+    print(f"Articles per run: {args.n}\n")
+
+    header = f"{'conc':>4} {'batch':>5} {'done':>5} {'fail':>4} {'sec':>7} {'sum/s':>7} {'p50ms':>6} {'p95ms':>6} {'calls':>5} {'waste':>5} {'fixed':>5}"
+    print(header)
+    print("-" * len(header))
+
+    with MockLLMServer(config) as server:
+        for batch_size in args.batch_size:
+            for concurrency in args.concurrency:
+                r = await run_once(server, args.n, concurrency, batch_size, args.backoff_max)
+                print(
+                    f"{r['concurrency']:>4} {r['batch_size']:>5} {r['completed']:>5} {r['failed']:>4} "
+                    f"{r['seconds']:>7.2f} {r['per_second']:>7.2f} {r['p50_ms'] or 0:>6} {r['p95_ms'] or 0:>6} "
+                    f"{r['calls']:>5} {r['wasted_calls']:>5} {r['repaired']:>5}"
+                )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark AIProcessor against a local mock LLM")
+    parser.add_argument("-n", type=int, default=200, help="Pending summaries to seed per run")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[50])
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--distribution", choices=["fixed", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--jitter-ms", type=float, default=150)
+    parser.add_argument("--rate-429", type=float, default=0.02)
+    parser.add_argument("--rate-500", type=float, default=0.01)
+    parser.add_argument("--malformed-rate", type=float, default=0.05)
+    parser.add_argument("--unparseable-rate", type=float, default=0.0)
+    parser.add_argument("--backoff-max", type=float, default=2.0, help="Cap on retry backoff seconds")
+    parser.add_argument("--seed", type=int, default=42)
+    asyncio.run(main(parser.parse_args()))
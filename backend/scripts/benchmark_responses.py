@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""
+Benchmark response encoding: serialization time and bytes on the wire.
+
+Builds typical /api/articles list pages (20 and 100 items with one-liners
+and keywords) and an article detail, then for each JSON encoder reports the
+time to produce the body the way FastAPI does, and the size of that body
+raw, gzipped at each level, and brotli-compressed when `brotli` is installed.
+
+    python scripts/benchmark_responses.py --repeat 2000
+
+"pydantic" is FastAPI's path with no response class (TypeAdapter.dump_json);
+"orjson" is JSON_RESPONSE=orjson (jsonable dump + orjson.dumps);
+"stdlib" is the same through Starlette's JSONResponse (json.dumps).
+"""
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+# Settings need a database URL; nothing here connects to it
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import argparse
+import gzip
+import json
+import time
+from datetime import datetime, timedelta
+
+from pydantic import TypeAdapter
+
+from app.core.compression import brotli
+from app.core.responses import orjson
+from app.schemas.article import ArticleDetail, ArticleListItem, PaginatedArticlesResponse
+
+
+def list_page(page_size: int) -> PaginatedArticlesResponse:
+    now = datetime.utcnow()
+    items = [
+        ArticleListItem(
+            id=100000 + i,
+            title=f"Researchers release open benchmark for long-context retrieval, part {i}",
+            url=f"https://news.example.com/2026/10/{i}/long-context-retrieval-benchmark",
+            one_liner="研究人员发布了一个用于长上下文检索的开放基准，覆盖多种语言和文档类型。",
+            keywords=["长上下文", "检索", "基准测试", "开源"],
+            published_at=now - timedelta(minutes=i),
+            created_at=now,
+            feed_title="Example Engineering Blog",
+            feed_category="AI/ML",
+        )
+        for i in range(page_size)
+    ]
+    return PaginatedArticlesResponse(items=items, total=125000, page=1, page_size=page_size, has_next=True)
+
+
+def detail() -> ArticleDetail:
+    return ArticleDetail(
+        id=100000,
+        title="Researchers release open benchmark for long-context retrieval",
+        url="https://news.example.com/2026/10/long-context-retrieval-benchmark",
+        content="Long-context models are evaluated on retrieval across documents of varying length. " * 80,
+        content_hash="3f2a9c" * 10,
+        summary_cn="本文介绍了一个新的长上下文检索基准。" * 20,
+        one_liner="研究人员发布了一个用于长上下文检索的开放基准。",
+        keywords=["长上下文", "检索", "基准测试"],
+        summary_status="completed",
+        published_at=datetime.utcnow(),
+        feed_title="Example Engineering Blog",
+        source_type="rss",
+        author="Jane Doe",
+    )
+
+
+def encoders(model_type) -> dict:
+    adapter = TypeAdapter(model_type)
+    jsonable = lambda value: adapter.dump_python(value, mode="json")
+    found = {
+        "pydantic": adapter.dump_json,
+        "stdlib": lambda value: json.dumps(
+            jsonable(value), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode("utf-8"),
+    }
+    if orjson is not None:
+        found["orjson"] = lambda value: orjson.dumps(jsonable(value))
+    return found
+
+
+def time_per_call(fn, value, repeat: int) -> float:
+    started = time.perf_counter()
+    for _ in range(repeat):
+        fn(value)
+    return (time.perf_counter() - started) / repeat * 1e6
+
+
+def main(args) -> None:
+    cases = [(f"list/{n}", PaginatedArticlesResponse, list_page(n)) for n in (20, 100)]
+    cases.append(("detail", ArticleDetail, detail()))
+
+    print(f"{'response':>9} {'encoder':>9} {'us/call':>8}")
+    print("-" * 28)
+    bodies = {}
+    for name, model_type, value in cases:
+        for encoder, fn in encoders(model_type).items():
+            print(f"{name:>9} {encoder:>9} {time_per_call(fn, value, args.repeat):>8.1f}")
+            bodies.setdefault(name, fn(value))
+
+    print()
+    columns = ["raw", *(f"gzip-{level}" for level in args.gzip_level)]
+    if brotli is not None:
+        columns += [f"br-{quality}" for quality in args.brotli_level]
+    print(f"{'response':>9} " + " ".join(f"{c:>8}" for c in columns) + f" {'gzip us':>8}")
+    print("-" * (10 + 9 * (len(columns) + 1)))
+    for name, body in bodies.items():
+        sizes = [len(body), *(len(gzip.compress(body, level)) for level in args.gzip_level)]
+        if brotli is not None:
+            sizes += [len(brotli.compress(body, quality=q)) for q in args.brotli_level]
+        gzip_us = time_per_call(lambda b: gzip.compress(b, 6), body, max(args.repeat // 10, 1))
+        print(f"{name:>9} " + " ".join(f"{s:>8}" for s in sizes) + f" {gzip_us:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON encoders and response compression")
+    parser.add_argument("--repeat", type=int, default=2000, help="Calls timed per encoder")
+    parser.add_argument("--gzip-level", type=int, nargs="+", default=[1, 6, 9])
+    parser.add_argument("--brotli-level", type=int, nargs="+", default=[4, 11])
+    main(parser.parse_args())
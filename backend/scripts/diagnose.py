@@ -9,7 +9,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 import asyncio
 from app.core.db import SessionLocal
-from app.models import Feed, Article, Summary
+from app.models import Feed, Article, ArticleBody, Summary, StatsCounters
 
 
 def diagnose():
@@ -19,23 +19,25 @@ def diagnose():
     print(" RSS Web Reader 诊断报告")
     print("=" * 50)
 
+    # Totals come from the trigger-maintained counters row
+    counters = db.get(StatsCounters, 1)
+
     # Feeds
-    feeds_total = db.query(Feed).count()
-    feeds_active = db.query(Feed).filter(Feed.is_active == True).count()
+    feeds_total = counters.total_feeds
+    feeds_active = counters.active_feeds
     feeds_no_articles = db.query(Feed).filter(
         ~Feed.id.in_(db.query(Article.feed_id).distinct())
     ).count()
 
     # Articles
-    articles_total = db.query(Article).count()
-    articles_no_content = db.query(Article).filter(
-        (Article.content == None) | (Article.content == "")
+    articles_total = counters.total_articles
+    articles_no_content = db.query(Article).outerjoin(ArticleBody).filter(
+        (ArticleBody.article_id == None) | (ArticleBody.size == 0)
     ).count()
 
     # Summaries
-    summary_stats = {}
-    for status in ["pending", "completed", "failed"]:
-        summary_stats[status] = db.query(Summary).filter(Summary.status == status).count()
+    by_status = counters.summaries_by_status()
+    summary_stats = {status: by_status[status] for status in ["pending", "completed", "failed"]}
 
     # Failed samples
     failed = db.query(Summary).filter(Summary.status == "failed").limit(5).all()
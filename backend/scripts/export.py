@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Export articles with their summaries as NDJSON or CSV (see app.services.export).
+
+    python scripts/export.py -o articles.ndjson.gz
+    python scripts/export.py --format csv -o - --created-after 2026-01-01
+    python scripts/export.py -o delta.ndjson --state export.watermark
+
+Output ending in .gz is gzip-compressed; "-" writes to stdout. With --state,
+the export starts from the watermarks stored in that file (article id, and
+summary processed_at on a second line) and, once complete, stores the new
+ones there, so repeated runs pick up new articles and newly finished
+summaries.
+"""
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import argparse
+import asyncio
+from datetime import datetime
+from app.core.db import AsyncSessionLocal
+from app.services.export import FORMATS, export_chunks, head_id, head_summary_at
+
+
+async def main(args) -> None:
+    since_id, summarized_after = args.since_id, args.summarized_after
+    if args.state and args.state.exists():
+        saved = args.state.read_text().split()
+        since_id = int(saved[0]) if saved else 0
+        # State files written before the summary watermark hold the id only
+        summarized_after = datetime.fromisoformat(saved[1]) if len(saved) > 1 else None
+    async with AsyncSessionLocal() as db:
+        watermark = await head_id(db)
+        summary_watermark = await head_summary_at(db)
+
+    compress = args.gzip or args.output.endswith(".gz")
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    written = 0
+    try:
+        async for chunk in export_chunks(args.format, since_id, watermark, args.created_after,
+                                         batch_size=args.batch_size, compress=compress,
+                                         summarized_after=summarized_after):
+            out.write(chunk)
+            written += len(chunk)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+
+    if args.state:
+        args.state.write_text(f"{watermark}\n" + (f"{summary_watermark.isoformat()}\n" if summary_watermark else ""))
+    resummarized = f", summaries since {summarized_after.isoformat()}" if summarized_after else ""
+    print(f"Exported {since_id} < id <= {watermark}{resummarized} ({written} bytes)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export articles and summaries as NDJSON or CSV")
+    parser.add_argument("-o", "--output", required=True, help="File to write (.gz compresses), or - for stdout")
+    parser.add_argument("--format", choices=list(FORMATS), default="ndjson")
+    parser.add_argument("--since-id", type=int, default=0, help="Only articles with a greater id")
+    parser.add_argument("--created-after", type=datetime.fromisoformat, default=None,
+                        help="Only articles ingested at or after this time (ISO 8601)")
+    parser.add_argument("--summarized-after", type=datetime.fromisoformat, default=None,
+                        help="Also older articles whose summary was processed at or after this time (ISO 8601)")
+    parser.add_argument("--state", type=Path, default=None,
+                        help="Watermark file: read as --since-id and --summarized-after, rewritten after a complete export")
+    parser.add_argument("--gzip", action="store_true", help="Compress even without a .gz suffix")
+    parser.add_argument("--batch-size", type=int, default=None, help="Rows per cursor fetch (EXPORT_BATCH_SIZE)")
+    asyncio.run(main(parser.parse_args()))
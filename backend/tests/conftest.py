@@ -2,18 +2,29 @@ import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from app.main import app
+from app.core import fts
+from app.core.cache import data_changed
 from app.core.db import Base, get_db
 
 # Test database
 TEST_DATABASE_URL = "sqlite:///./test.db"
 engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
 TestingSessionLocal = sessionmaker(bind=engine)
+# Same file through aiosqlite; NullPool so connections never outlive a test's event loop
+async_engine = create_async_engine("sqlite+aiosqlite:///./test.db", poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+fts.register_sqlite_functions(engine)
+fts.register_sqlite_functions(async_engine.sync_engine)
 
 @pytest.fixture
 def db():
     Base.metadata.create_all(bind=engine)
+    # Fresh database: nothing derived from the previous test's data applies
+    data_changed()
     db = TestingSessionLocal()
     try:
         yield db
@@ -21,15 +32,29 @@ def db():
         db.close()
         Base.metadata.drop_all(bind=engine)
 
+@pytest_asyncio.fixture
+async def async_db(db):
+    """AsyncSession on the test database; seed through `db` and commit first"""
+    async with TestingAsyncSessionLocal() as session:
+        yield session
+
 @pytest_asyncio.fixture
 async def client(db):
-    def override_get_db():
-        try:
-            yield db
-        finally:
-            pass
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
     app.dependency_overrides[get_db] = override_get_db
+    # Each test starts from a fresh database; don't serve the previous test's reads
+    data_changed()
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://testserver") as api_client:
         yield api_client
     app.dependency_overrides.clear()
+
+@pytest.fixture
+def mock_llm():
+    """Local Anthropic/Zhipu stand-in; tweak `mock_llm.config` per test"""
+    from app.scripts.mock_llm import MockLLMServer
+
+    with MockLLMServer() as server:
+        yield server
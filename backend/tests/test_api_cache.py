@@ -0,0 +1,94 @@
+import asyncio
+
+import pytest
+
+from app.core import cache as api_cache
+from app.core.cache import AsyncTTLCache, data_changed, get_cache
+from app.models import Feed
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache = AsyncTTLCache("test", max_entries=8, ttl=60)
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(*(cache.get_or_load("k", load) for _ in range(5)))
+    assert results == ["value"] * 5
+    assert calls == 1
+    assert await cache.get_or_load("k", load) == "value"
+    assert cache.metrics() == {
+        "name": "test", "entries": 1, "max_entries": 8, "ttl_seconds": 60,
+        "hits": 1, "misses": 1, "coalesced": 4, "evictions": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_failures_reach_waiters_and_are_not_cached():
+    cache = AsyncTTLCache("test", max_entries=8, ttl=60)
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("db down")
+
+    results = await asyncio.gather(*(cache.get_or_load("k", fail) for _ in range(3)), return_exceptions=True)
+    assert all(isinstance(r, RuntimeError) for r in results)
+    assert cache.metrics()["entries"] == 0
+
+    async def ok():
+        return 1
+
+    assert await cache.get_or_load("k", ok) == 1
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_and_least_recently_used_is_evicted(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(api_cache.time, "monotonic", lambda: clock[0])
+    cache = AsyncTTLCache("test", max_entries=2, ttl=5)
+
+    async def value(v):
+        return v
+
+    await cache.get_or_load("a", lambda: value(1))
+    await cache.get_or_load("b", lambda: value(2))
+    await cache.get_or_load("a", lambda: value(0))  # touch a
+    await cache.get_or_load("c", lambda: value(3))
+    assert cache.evictions == 1
+    assert await cache.get_or_load("b", lambda: value(20)) == 20
+
+    clock[0] += 6
+    assert await cache.get_or_load("c", lambda: value(30)) == 30
+
+
+@pytest.mark.asyncio
+async def test_endpoint_served_from_cache_until_data_changed(client, db):
+    db.add(Feed(url="https://apicache.example/1", title="First"))
+    db.commit()
+    feeds = get_cache("feeds")
+    hits = feeds.hits
+
+    assert [f["title"] for f in (await client.get("/api/feeds/")).json()] == ["First"]
+    db.add(Feed(url="https://apicache.example/2", title="Second"))
+    db.commit()
+    # Written behind the API's back and within the TTL: still the cached list
+    assert len((await client.get("/api/feeds/")).json()) == 1
+    assert feeds.hits == hits + 1
+
+    data_changed()
+    assert len((await client.get("/api/feeds/")).json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_cache_metrics_endpoint(client, db):
+    await client.get("/api/stats/")
+    await client.get("/api/stats/")
+    response = await client.get("/api/stats/cache")
+    assert response.status_code == 200
+    stats = next(m for m in response.json() if m["name"] == "stats")
+    assert stats["hits"] >= 1 and stats["misses"] >= 1
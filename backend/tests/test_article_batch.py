@@ -0,0 +1,73 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.api.articles import BATCH_MAX_IDS
+from app.models import Article, ArticleBody, Feed, Summary
+from app.tasks import retention as retention_module
+from app.tasks.retention import Archiver
+from tests.conftest import TestingAsyncSessionLocal, async_engine
+
+
+@pytest.fixture
+def articles(db, monkeypatch):
+    """Five articles, the two summarized ones old enough to archive; ids in publication order"""
+    monkeypatch.setattr(retention_module, "AsyncSessionLocal", TestingAsyncSessionLocal)
+    feed = Feed(url="https://batch.example/rss", title="Batch", source_type="blog")
+    db.add(feed)
+    db.flush()
+    now = datetime.utcnow()
+    ids = []
+    for i in range(5):
+        article = Article(content_hash=f"batch-{i}", url=f"https://batch.example/{i}", title=f"Batch {i}",
+                          published_at=now - timedelta(days=(60, 45, 3, 2, 1)[i]), feed_id=feed.id,
+                          body=ArticleBody(text=f"Body {i}"))
+        db.add(article)
+        db.flush()
+        if i < 2:
+            db.add(Summary(article_id=article.id, status="completed", summary_cn=f"摘要 {i}", keywords=[f"k{i}"]))
+        ids.append(article.id)
+    db.commit()
+    return ids
+
+
+@pytest.mark.asyncio
+async def test_batch_matches_single_details_in_one_query(client, articles):
+    singles = [(await client.get(f"/api/articles/{id}")).json() for id in articles]
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        response = await client.get("/api/articles/batch", params={"ids": ",".join(map(str, articles))})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+    assert response.status_code == 200
+    assert response.json() == singles
+    assert len([s for s in statements if "article_bodies" in s]) == 1
+
+
+@pytest.mark.asyncio
+async def test_batch_keeps_order_drops_unknown_and_reads_archive(client, articles):
+    await Archiver(days=30).run()
+    first, _, *rest = articles
+
+    # Repeated and comma-separated ids mix; duplicates collapse
+    response = await client.get(f"/api/articles/batch?ids={rest[0]},999999,{first}&ids={rest[0]}")
+    body = response.json()
+    assert [a["id"] for a in body] == [rest[0], first]
+    assert body[0]["archived"] is False
+    assert body[1]["archived"] is True and body[1]["content"] == "Body 0" and body[1]["keywords"] == ["k0"]
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_bad_requests(client):
+    assert (await client.get("/api/articles/batch")).status_code == 422
+    assert (await client.get("/api/articles/batch", params={"ids": "1,x"})).status_code == 400
+    too_many = ",".join(str(i) for i in range(1, BATCH_MAX_IDS + 2))
+    assert (await client.get("/api/articles/batch", params={"ids": too_many})).status_code == 400
+    assert (await client.get("/api/articles/batch", params={"ids": ","})).json() == []
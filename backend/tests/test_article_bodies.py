@@ -0,0 +1,63 @@
+import pytest
+from sqlalchemy import event
+from sqlalchemy.exc import InvalidRequestError
+
+from app.models import Article, ArticleBody, Feed
+from app.utils.compression import CODEC_RAW, CODEC_ZLIB, compress_text, decompress_text
+from tests.conftest import async_engine
+
+BODY = "数据库索引与查询计划。" * 200 + "Closing paragraph."
+
+
+@pytest.fixture
+def article(db):
+    feed = Feed(url="https://bodies.example/rss", title="Bodies")
+    db.add(feed)
+    db.flush()
+    article = Article(content_hash="body-1", url="https://bodies.example/1", title="Bodies",
+                      body=ArticleBody(text=BODY), feed_id=feed.id)
+    db.add(article)
+    db.commit()
+    return article
+
+
+def test_codec_round_trip():
+    codec, payload = compress_text(BODY)
+    assert codec == CODEC_ZLIB and len(payload) < len(BODY.encode("utf-8")) // 10
+    assert decompress_text(codec, payload) == BODY
+
+    # Too short to benefit: stored as-is
+    assert compress_text("hi") == (CODEC_RAW, b"hi")
+    assert decompress_text(*compress_text("")) == ""
+
+
+def test_body_is_stored_compressed(db, article):
+    body = db.get(ArticleBody, article.id)
+    assert body.codec == CODEC_ZLIB
+    assert body.size == len(BODY.encode("utf-8")) and len(body.data) < body.size
+    assert body.text == BODY
+
+
+@pytest.mark.asyncio
+async def test_detail_loads_body_and_lists_never_touch_it(client, article):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        for path in ("/api/articles/", "/api/articles/latest", "/api/articles/search?q=Closing"):
+            assert (await client.get(path)).status_code == 200
+        assert not any("article_bodies" in s for s in statements)
+
+        detail = (await client.get(f"/api/articles/{article.id}")).json()
+        assert detail["content"] == BODY
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+
+
+def test_body_is_never_lazy_loaded(db, article):
+    db.expire_all()
+    with pytest.raises(InvalidRequestError):
+        db.get(Article, article.id).body
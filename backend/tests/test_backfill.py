@@ -0,0 +1,190 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+
+from app.models import Article, ArticleBody, ArticleKeyword, Feed, Summary, SummaryBatch
+from app.services.claude import ClaudeService
+from app.tasks import backfill as backfill_module
+from app.tasks import budget as budget_module
+from app.tasks.backfill import BatchBackfill
+from app.tasks.priority import compute_priority
+from app.tasks.processor import CLAIM_TIMEOUT, AIProcessor
+from app.tasks import processor as processor_module
+from tests.conftest import TestingAsyncSessionLocal
+
+
+@pytest.fixture
+def seeded(db, monkeypatch):
+    monkeypatch.setattr(backfill_module, "AsyncSessionLocal", TestingAsyncSessionLocal)
+    feed = Feed(url="https://backfill.example/rss", title="Backfill", is_active=True)
+    db.add(feed)
+    db.flush()
+    now = datetime.utcnow()
+    ids = {}
+    for name, published in [("old-1", now - timedelta(days=90)),
+                            ("old-2", now - timedelta(days=60)),
+                            ("fresh", now - timedelta(hours=1))]:
+        article = Article(content_hash=f"backfill-{name}", url=f"https://backfill.example/{name}",
+                          title=name, body=ArticleBody(text="body"), published_at=published, feed_id=feed.id)
+        db.add(article)
+        db.flush()
+        summary = Summary(article_id=article.id, status="pending", priority=compute_priority(published))
+        db.add(summary)
+        db.flush()
+        ids[name] = summary.id
+    db.commit()
+    return ids
+
+
+def _backfill(mock_llm):
+    return BatchBackfill(ai_service=ClaudeService(api_key="test-key", base_url=mock_llm.url))
+
+
+def _status(db, summary_id):
+    db.expire_all()
+    return db.get(Summary, summary_id)
+
+
+@pytest.mark.asyncio
+async def test_backfill_submits_old_backlog_and_collects_in_bulk(db, seeded, mock_llm):
+    mock_llm.config.batch_processing_seconds = 60
+    backfill = _backfill(mock_llm)
+
+    local_id = await backfill.submit()
+    assert _status(db, seeded["old-1"]).status == "batched"
+    assert _status(db, seeded["fresh"]).status == "pending"  # left to realtime
+    assert await backfill.submit() is None
+
+    assert await backfill.collect() == 0  # provider still processing
+
+    # A new process (e.g. after a crash) resumes from the database alone
+    mock_llm.config.batch_processing_seconds = 0
+    assert await _backfill(mock_llm).collect() == 1
+
+    old = _status(db, seeded["old-1"])
+    assert old.status == "completed"
+    assert old.one_liner and old.keywords
+    assert old.batch_id is None and old.input_tokens > 0
+    assert db.query(ArticleKeyword).filter_by(article_id=old.article_id).count() == len(old.keywords)
+    assert db.get(SummaryBatch, local_id).status == "collected"
+    assert db.get(SummaryBatch, local_id).succeeded == 2
+    assert mock_llm.counters.by_path == {"/v1/messages/batches": 1}
+
+
+@pytest.mark.asyncio
+async def test_errored_and_unsubmitted_rows_are_released(db, seeded, mock_llm):
+    # A batch claimed rows but crashed before the provider accepted it
+    stale = SummaryBatch(status="submitting", request_count=1)
+    db.add(stale)
+    db.flush()
+    db.get(Summary, seeded["old-2"]).status = "batched"
+    db.get(Summary, seeded["old-2"]).batch_id = stale.id
+    db.commit()
+
+    backfill = _backfill(mock_llm)
+    assert await backfill.recover() == 1
+    assert _status(db, seeded["old-2"]).status == "pending"
+
+    mock_llm.config.rate_500 = 1.0
+    await backfill.run(poll_interval=0)
+    assert _status(db, seeded["old-1"]).status == "failed"
+    assert _status(db, seeded["old-2"]).status == "failed"
+
+
+@pytest.mark.asyncio
+async def test_realtime_and_backfill_never_take_the_same_row(db, seeded, mock_llm, monkeypatch):
+    monkeypatch.setattr(processor_module, "AsyncSessionLocal", TestingAsyncSessionLocal)
+    mock_llm.config.batch_processing_seconds = 60
+
+    def realtime_claims_old_2(session, flush_context):
+        # Lands between submit's SELECT and its claim
+        session.connection().execute(
+            update(Summary).where(Summary.id == seeded["old-2"]).values(status="batched")
+        )
+
+    event.listen(Session, "after_flush", realtime_claims_old_2, once=True)
+    local_id = await _backfill(mock_llm).submit()
+    assert db.get(SummaryBatch, local_id).request_count == 1
+    assert _status(db, seeded["old-2"]).batch_id is None
+
+    # Realtime leaves the row backfill holds alone, and never calls the model for it
+    processor = AIProcessor(ai_service=ClaudeService(api_key="test-key", base_url=mock_llm.url))
+    assert await processor._generate_summary(seeded["old-1"]) is False
+    assert "/v1/messages" not in mock_llm.counters.by_path
+    assert _status(db, seeded["old-1"]).batch_id == local_id
+
+
+@pytest.mark.asyncio
+async def test_stale_realtime_claims_are_released(db, async_db, seeded):
+    summary = db.get(Summary, seeded["fresh"])
+    summary.status, summary.claimed_at = "batched", datetime.utcnow() - CLAIM_TIMEOUT * 2
+    db.commit()
+
+    assert seeded["fresh"] in {s.id for s in await AIProcessor(ai_service=object())._next_batch(async_db)}
+
+
+@pytest.mark.asyncio
+async def test_collected_rows_are_stamped_at_write_time(db, seeded, mock_llm, monkeypatch):
+    backfill = _backfill(mock_llm)
+    await backfill.submit()
+
+    # Reading a large results file takes a while
+    batches = backfill.ai_service.client.messages.batches
+    results = batches.results
+    read_until = []
+
+    async def slow_results(batch_id):
+        async def items():
+            async for item in await results(batch_id):
+                yield item
+            read_until.append(datetime.utcnow())
+        return items()
+
+    monkeypatch.setattr(batches, "results", slow_results)
+    assert await backfill.collect() == 1
+    assert _status(db, seeded["old-1"]).processed_at >= read_until[0]
+
+
+@pytest.mark.asyncio
+async def test_submit_respects_the_daily_budget(db, seeded, mock_llm, monkeypatch):
+    monkeypatch.setattr(budget_module.settings, "ai_daily_token_budget", 100)
+    spent = Summary(article_id=db.get(Summary, seeded["fresh"]).article_id, status="completed",
+                    input_tokens=500, output_tokens=50, processed_at=datetime.utcnow())
+    db.delete(db.get(Summary, seeded["fresh"]))
+    db.flush()
+    db.add(spent)
+    db.commit()
+
+    assert await _backfill(mock_llm).submit() is None
+    assert _status(db, seeded["old-1"]).status == "pending"
+    assert "/v1/messages/batches" not in mock_llm.counters.by_path
+
+
+@pytest.mark.asyncio
+async def test_batch_accepted_before_a_crash_is_adopted_not_released(db, seeded, mock_llm, monkeypatch):
+    backfill = _backfill(mock_llm)
+    batches = backfill.ai_service.client.messages.batches
+    create = batches.create
+
+    async def create_then_die(**kwargs):
+        await create(**kwargs)
+        raise asyncio.CancelledError  # Shutdown before the provider's id is saved
+
+    monkeypatch.setattr(batches, "create", create_then_die)
+    with pytest.raises(asyncio.CancelledError):
+        await backfill.submit()
+    local = db.query(SummaryBatch).one()
+    assert local.status == "submitting" and local.provider_batch_id is None
+
+    restarted = _backfill(mock_llm)
+    assert await restarted.recover() == 1
+    db.expire_all()
+    assert local.status == "submitted" and local.provider_batch_id == "msgbatch_mock_1"
+    assert _status(db, seeded["old-1"]).status == "batched"
+
+    assert await restarted.collect() == 1
+    assert _status(db, seeded["old-1"]).status == "completed"
+    assert mock_llm.counters.by_path == {"/v1/messages/batches": 1}
@@ -0,0 +1,78 @@
+import asyncio
+import gzip
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.responses import StreamingResponse
+
+from app.core import http_cache
+from app.core.compression import CompressionMiddleware, _accepted
+from app.core.responses import ORJSONResponse
+from app.models import Feed
+
+
+@pytest.fixture
+def many_feeds(db):
+    db.add_all(Feed(url=f"https://gzip.example/{i}", title=f"Compressible feed title {i}", category="Web")
+               for i in range(60))
+    db.commit()
+
+
+@pytest.mark.asyncio
+async def test_large_responses_are_gzipped_with_encoding_specific_etag(client, many_feeds):
+    http_cache.generation.invalidate()
+    plain = await client.get("/api/feeds/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["vary"]
+
+    zipped = await client.get("/api/feeds/", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert int(zipped.headers["content-length"]) < len(plain.content)
+    assert zipped.json() == plain.json()
+    assert zipped.headers["etag"] == plain.headers["etag"][:-1] + '-gzip"'
+
+    # Each variant revalidates against its own tag
+    for etag, encoding in ((zipped.headers["etag"], "gzip"), (plain.headers["etag"], "identity")):
+        again = await client.get("/api/feeds/", headers={"Accept-Encoding": encoding, "If-None-Match": etag})
+        assert again.status_code == 304
+        assert again.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_small_responses_are_sent_as_is(client):
+    response = await client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+
+
+@pytest.mark.asyncio
+async def test_streaming_bodies_are_compressed_per_chunk():
+    async def app(scope, receive, send):
+        async def chunks():
+            for i in range(3):
+                yield f"line {i}\n".encode() * 100
+        await StreamingResponse(chunks(), media_type="application/x-ndjson")(scope, receive, send)
+
+    sent = []
+
+    async def receive():
+        await asyncio.Event().wait()  # the client never disconnects
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", b"gzip")]}
+    await CompressionMiddleware(app, minimum_size=10)(scope, receive, send)
+    headers = dict(sent[0]["headers"])
+    assert headers[b"content-encoding"] == b"gzip" and b"content-length" not in headers
+    bodies = [m["body"] for m in sent[1:]]
+    # Every chunk is flushed on its own, the stream decodes as a whole
+    assert all(bodies[:3])
+    assert gzip.decompress(b"".join(bodies)) == b"".join(f"line {i}\n".encode() * 100 for i in range(3))
+
+
+def test_accept_encoding_honours_q_zero():
+    assert _accepted("gzip;q=0, br;q=0.5, deflate") == {"br", "deflate"}
+
+
+def test_orjson_response_renders_json():
+    assert ORJSONResponse({"a": [1, None]}).body == b'{"a":[1,null]}'
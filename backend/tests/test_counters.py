@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text, update
+
+from app.models import Article, Feed, StatsCounters, Summary
+from app.tasks import counters as counters_module
+from tests.conftest import TestingAsyncSessionLocal
+
+
+def _counters(db) -> StatsCounters:
+    db.expire_all()
+    return db.get(StatsCounters, 1)
+
+
+def _article(feed, name, created_at=None):
+    return Article(content_hash=name, url=f"https://counters.example/{name}", title=name,
+                   feed_id=feed.id, created_at=created_at or datetime.utcnow())
+
+
+@pytest.fixture
+def seeded(db):
+    feeds = [Feed(url=f"https://counters.example/feed/{i}", title=f"Feed {i}", is_active=i != 2)
+             for i in range(3)]
+    db.add_all(feeds)
+    db.flush()
+    now = datetime.utcnow()
+    articles = [
+        _article(feeds[0], "fresh-1", now - timedelta(minutes=5)),
+        _article(feeds[0], "fresh-2", now - timedelta(hours=3)),
+        _article(feeds[1], "stale", now - timedelta(hours=30)),
+    ]
+    db.add_all(articles)
+    db.flush()
+    for article, status in zip(articles, ["pending", "completed", "skipped"]):
+        db.add(Summary(article_id=article.id, status=status))
+    db.commit()
+    return feeds, articles
+
+
+def test_triggers_count_inserts(db, seeded):
+    counters = _counters(db)
+    assert (counters.total_feeds, counters.active_feeds, counters.total_articles) == (3, 2, 3)
+    assert counters.summaries_by_status() == {
+        "pending": 1, "batched": 0, "completed": 1, "failed": 0, "skipped": 1,
+    }
+
+
+def test_triggers_follow_status_changes_and_deletes(db, seeded):
+    feeds, articles = seeded
+    # Bulk UPDATE, as the batch backfill issues it
+    db.execute(update(Summary).where(Summary.status == "pending").values(status="batched"))
+    db.commit()
+    assert _counters(db).summaries_batched == 1
+
+    summary = db.query(Summary).filter_by(status="batched").one()
+    summary.status = "failed"
+    db.commit()
+    db.delete(db.query(Summary).filter_by(status="completed").one())
+    db.delete(articles[1])
+    feeds[2].is_active = True
+    feeds[0].last_fetched_at = datetime(2026, 10, 19, 12, 0)
+    db.commit()
+
+    counters = _counters(db)
+    assert counters.summaries_by_status() == {
+        "pending": 0, "batched": 0, "completed": 0, "failed": 1, "skipped": 1,
+    }
+    assert counters.total_articles == 2
+    assert counters.active_feeds == 3
+    assert counters.last_fetch_at == datetime(2026, 10, 19, 12, 0)
+
+
+@pytest.mark.asyncio
+async def test_stats_endpoint_reads_counters(client, db, seeded):
+    feeds, _ = seeded
+    feeds[1].last_fetched_at = datetime(2026, 10, 19, 8, 30)
+    db.commit()
+
+    stats = (await client.get("/api/stats/")).json()
+    assert stats["total_feeds"] == 3 and stats["active_feeds"] == 2
+    assert stats["total_articles"] == 3
+    # The 30 h old article falls outside the rolling window
+    assert stats["articles_today"] == 2
+    assert stats["summaries_pending"] == 1 and stats["summaries_completed"] == 1
+    assert stats["summaries_skipped"] == 1
+    assert stats["completion_rate"] == 0.5
+    assert stats["last_fetch_at"] == "2026-10-19T08:30:00"
+
+
+@pytest.mark.asyncio
+async def test_reconcile_corrects_drift(db, seeded, monkeypatch):
+    monkeypatch.setattr(counters_module, "AsyncSessionLocal", TestingAsyncSessionLocal)
+    db.execute(text("UPDATE stats_counters SET total_articles = 99, summaries_failed = 4"))
+    db.execute(text("DELETE FROM article_hourly_counts"))
+    db.commit()
+
+    drift = await counters_module.reconcile()
+    assert drift == {"total_articles": 3 - 99, "summaries_failed": -4}
+
+    counters = _counters(db)
+    assert counters.total_articles == 3 and counters.summaries_failed == 0
+    assert counters.reconciled_at is not None
+    async with TestingAsyncSessionLocal() as session:
+        _, articles_today = await counters_module.read_stats(session)
+    assert articles_today == 2
+
+    assert await counters_module.reconcile() == {}
@@ -0,0 +1,48 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import get_settings
+from app.core.db import apply_sqlite_pragmas, async_database_url, pool_options, sqlite_pragmas
+
+
+def test_async_database_url_swaps_drivers():
+    assert async_database_url("sqlite:///./rss.db") == "sqlite+aiosqlite:///./rss.db"
+    assert async_database_url("postgresql://u:p@db/rss") == "postgresql+asyncpg://u:p@db/rss"
+    assert async_database_url("postgresql+psycopg2://u@db/rss") == "postgresql+asyncpg://u@db/rss"
+
+
+def test_pool_options_only_for_server_databases():
+    assert pool_options("sqlite:///./rss.db") == {}
+    options = pool_options("postgresql://u@db/rss")
+    assert options["pool_size"] == get_settings().db_pool_size
+    assert options["pool_pre_ping"] is True
+
+
+def test_empty_pragma_settings_are_skipped():
+    config = get_settings().model_copy(update={"sqlite_mmap_size": None, "sqlite_temp_store": ""})
+    assert "mmap_size" not in sqlite_pragmas(config)
+    assert "temp_store" not in sqlite_pragmas(config)
+
+
+@pytest.mark.asyncio
+async def test_profile_is_applied_to_sync_and_async_connections(tmp_path):
+    url = f"sqlite:///{tmp_path}/profile.db"
+    pragmas = sqlite_pragmas()
+
+    sync_engine = create_engine(url)
+    apply_sqlite_pragmas(sync_engine, pragmas)
+    with sync_engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA auto_vacuum")).scalar() == 2  # INCREMENTAL on a new file
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == pragmas["busy_timeout"]
+    sync_engine.dispose()
+
+    async_engine = create_async_engine(async_database_url(url))
+    apply_sqlite_pragmas(async_engine.sync_engine, pragmas)
+    async with async_engine.connect() as conn:
+        # 1 = NORMAL, 2 = MEMORY
+        assert (await conn.execute(text("PRAGMA synchronous"))).scalar() == 1
+        assert (await conn.execute(text("PRAGMA temp_store"))).scalar() == 2
+        assert (await conn.execute(text("PRAGMA cache_size"))).scalar() == pragmas["cache_size"]
+    await async_engine.dispose()
@@ -6,12 +6,9 @@ from main import app as entrypoint_app
 
 
 @pytest.mark.asyncio
-async def test_main_entrypoint_exposes_stats_under_api_stats(db):
-    def override_get_db():
-        try:
-            yield db
-        finally:
-            pass
+async def test_main_entrypoint_exposes_stats_under_api_stats(async_db):
+    async def override_get_db():
+        yield async_db
 
     entrypoint_app.dependency_overrides[get_db] = override_get_db
     try:
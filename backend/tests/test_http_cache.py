@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import event
+
+from app.core import http_cache
+from app.models import Feed
+from tests.conftest import async_engine
+
+
+@pytest.fixture
+def fresh_generation(monkeypatch):
+    """Re-read the generation on every request, as if the TTL had just expired"""
+    monkeypatch.setattr(http_cache.generation, "ttl", 0)
+    http_cache.generation.invalidate()
+    yield
+    http_cache.generation.invalidate()
+
+
+@pytest.fixture
+def feeds(db):
+    db.add_all([Feed(url=f"https://cache.example/{i}", title=f"Feed {i}", category="Web") for i in range(2)])
+    db.commit()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/api/articles/", "/api/articles/latest", "/api/feeds/",
+                                  "/api/feeds/categories", "/api/stats/"])
+async def test_matching_if_none_match_gets_304(client, feeds, fresh_generation, path):
+    first = await client.get(path)
+    etag = first.headers["etag"]
+    assert etag.startswith('"') and not etag.startswith("W/")
+    assert "max-age" in first.headers["cache-control"]
+
+    again = await client.get(path, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+
+
+@pytest.mark.asyncio
+async def test_writes_change_the_etag(client, db, feeds, fresh_generation):
+    etag = (await client.get("/api/feeds/")).headers["etag"]
+    db.query(Feed).filter_by(title="Feed 0").update({"title": "Renamed"})
+    db.commit()
+
+    response = await client.get("/api/feeds/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert "Renamed" in {feed["title"] for feed in response.json()}
+
+
+@pytest.mark.asyncio
+async def test_etag_varies_with_query(client, feeds, fresh_generation):
+    first = (await client.get("/api/articles/", params={"page": 1})).headers["etag"]
+    second = await client.get("/api/articles/", params={"page": 2}, headers={"If-None-Match": first})
+    assert second.status_code == 200 and second.headers["etag"] != first
+
+
+@pytest.mark.asyncio
+async def test_304_within_ttl_does_not_query(client, feeds, monkeypatch):
+    monkeypatch.setattr(http_cache.generation, "ttl", 60)
+    http_cache.generation.invalidate()
+    etag = (await client.get("/api/feeds/")).headers["etag"]
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(async_engine.sync_engine, "before_cursor_execute", listener)
+    try:
+        response = await client.get("/api/feeds/", headers={"If-None-Match": f'W/"other", {etag}'})
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", listener)
+        http_cache.generation.invalidate()
+    assert response.status_code == 304
+    assert statements == []
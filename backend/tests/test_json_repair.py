@@ -0,0 +1,100 @@
+import json
+from types import SimpleNamespace
+
+import anthropic
+import httpx
+import pytest
+from tenacity import wait_none
+
+from app.services.base import SummaryParseError
+from app.services.claude import ClaudeService
+from app.utils.json_repair import loads_with_repair, repair_json
+
+VALID = {"summary": "摘要", "one_liner": "推荐", "keywords": ["a", "b"]}
+
+
+def test_valid_json_is_not_marked_repaired():
+    value, repaired = loads_with_repair(json.dumps(VALID, ensure_ascii=False))
+    assert value == VALID
+    assert repaired is False
+
+
+@pytest.mark.parametrize("broken", [
+    '```json\n{"summary": "摘要", "one_liner": "推荐", "keywords": ["a", "b"]}\n```',
+    'Here is the JSON:\n{"summary": "摘要", "one_liner": "推荐", "keywords": ["a", "b"]}\nHope this helps!',
+    '{"summary": "摘要", "one_liner": "推荐", "keywords": ["a", "b",],}',
+])
+def test_common_defects_are_repaired(broken):
+    value, repaired = loads_with_repair(broken)
+    assert value == VALID
+    assert repaired is True
+
+
+def test_unescaped_inner_quotes_and_newlines():
+    broken = '{"summary": "作者称"零拷贝"很快\n第二行", "one_liner": "推荐", "keywords": ["a"]}'
+    value = json.loads(repair_json(broken))
+    assert value["summary"] == '作者称"零拷贝"很快\n第二行'
+
+
+def _message(*blocks):
+    usage = SimpleNamespace(input_tokens=10, output_tokens=5)
+    return SimpleNamespace(content=list(blocks), usage=usage)
+
+
+def _service(responses):
+    service = ClaudeService()
+    service.retry_wait = wait_none()
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        outcome = responses.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    service.client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    return service, calls
+
+
+@pytest.mark.asyncio
+async def test_claude_uses_tool_input():
+    service, calls = _service([_message(SimpleNamespace(type="tool_use", input=VALID))])
+    result = await service.summarize("Title", "Body")
+    assert result["keywords"] == ["a", "b"]
+    assert result["attempts"] == 1
+    assert calls[0]["tool_choice"]["name"] == "record_summary"
+
+
+@pytest.mark.asyncio
+async def test_malformed_text_is_repaired_without_resend():
+    text = 'Sure!\n```json\n{"summary": "摘要", "one_liner": "推荐", "keywords": ["a", "b"],}\n```'
+    service, calls = _service([_message(SimpleNamespace(type="text", text=text))])
+    result = await service.summarize("Title", "Body")
+    assert result["repaired"] is True
+    assert len(calls) == 1
+    assert service.stats["repaired"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unparseable_output_is_not_retried():
+    service, calls = _service([_message(SimpleNamespace(type="text", text="I cannot help with that."))])
+    with pytest.raises(SummaryParseError):
+        await service.summarize("Title", "Body")
+    assert len(calls) == 1
+    assert service.stats["parse_failures"] == 1
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_is_retried_and_counted():
+    request = httpx.Request("POST", "https://api.example/v1/messages")
+    rate_limited = anthropic.RateLimitError(
+        "slow down", response=httpx.Response(429, request=request), body=None
+    )
+    service, calls = _service([
+        rate_limited,
+        _message(SimpleNamespace(type="tool_use", input=VALID)),
+    ])
+    result = await service.summarize("Title", "Body")
+    assert result["attempts"] == 2
+    assert service.stats["retries"] == 1
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import Article, ArticleBody, ArticleKeyword, Feed, Summary
+from app.services.claude import ClaudeService
+from app.services.keywords import keyword_rows, normalize_keyword, sync_article_keywords
+from app.tasks import processor as processor_module
+from app.tasks.processor import AIProcessor
+from tests.conftest import TestingAsyncSessionLocal
+
+
+@pytest.fixture
+def tagged(db):
+    now = datetime.utcnow()
+    rust = Feed(url="https://tags.example/rust", title="Rust", category="Engineering")
+    sec = Feed(url="https://tags.example/sec", title="Sec", category="Security")
+    db.add_all([rust, sec])
+    db.flush()
+    specs = [
+        ("a", rust, now - timedelta(hours=2), ["Rust", "Async"]),
+        ("b", rust, now - timedelta(days=3), ["rust", "编译器"]),
+        ("c", sec, now - timedelta(hours=5), ["RUST ", "CVE"]),
+        ("old", sec, now - timedelta(days=40), ["Rust"]),
+    ]
+    ids = {}
+    for name, feed, published, keywords in specs:
+        article = Article(content_hash=f"tag-{name}", url=f"https://tags.example/{name}",
+                          title=name, published_at=published, feed_id=feed.id)
+        db.add(article)
+        db.flush()
+        db.add(Summary(article_id=article.id, status="completed", keywords=keywords))
+        db.add_all(ArticleKeyword(**row) for row in keyword_rows(
+            article.id, feed.id, published, None, keywords))
+        ids[name] = article.id
+    db.commit()
+    return ids
+
+
+def test_keyword_rows_normalize_and_dedupe():
+    published = datetime(2026, 1, 1)
+    rows = keyword_rows(1, 2, None, published, ["Rust", " rust ", "Machine  Learning", 3, "", "数据库"])
+    assert [r["keyword"] for r in rows] == ["rust", "machine learning", "数据库"]
+    assert all(r["published_at"] == published and r["feed_id"] == 2 for r in rows)
+    assert keyword_rows(1, 2, None, published, None) == []
+    assert normalize_keyword("  PostgreSQL\t16 ") == "postgresql 16"
+
+
+@pytest.mark.asyncio
+async def test_list_articles_tag_filter(client, tagged):
+    payload = (await client.get("/api/articles/", params={"tag": "RUST"})).json()
+    assert payload["total"] == 4
+    assert {item["id"] for item in payload["items"]} == set(tagged.values())
+
+    payload = (await client.get("/api/articles/", params={"tag": "rust", "category": "Security"})).json()
+    assert {item["id"] for item in payload["items"]} == {tagged["c"], tagged["old"]}
+
+    payload = (await client.get("/api/articles/", params={"tag": "编译器"})).json()
+    assert [item["id"] for item in payload["items"]] == [tagged["b"]]
+
+
+@pytest.mark.asyncio
+async def test_keyword_facets_by_category_and_window(client, tagged):
+    payload = (await client.get("/api/articles/keywords", params={"hours": 24 * 7})).json()
+    assert payload["window_hours"] == 168
+    facets = {item["keyword"]: item for item in payload["items"]}
+    assert payload["items"][0]["keyword"] == "rust"
+    assert facets["rust"]["count"] == 3  # "old" is outside the window
+    assert facets["rust"]["categories"] == {"Engineering": 2, "Security": 1}
+    assert facets["cve"]["categories"] == {"Security": 1}
+
+    payload = (await client.get("/api/articles/keywords",
+                                params={"hours": 24, "category": "Engineering"})).json()
+    assert [(item["keyword"], item["count"]) for item in payload["items"]] == [("async", 1), ("rust", 1)]
+
+
+@pytest.mark.asyncio
+async def test_sync_rewrites_and_drops_non_completed(db, async_db, tagged):
+    summary = db.query(Summary).filter(Summary.article_id == tagged["a"]).one()
+    summary.keywords = ["Tokio"]
+    db.commit()
+    await sync_article_keywords(async_db, [tagged["a"]])
+    await async_db.commit()
+    db.expire_all()
+    assert [k.keyword for k in db.query(ArticleKeyword).filter_by(article_id=tagged["a"])] == ["tokio"]
+
+    summary.status = "pending"
+    db.commit()
+    await sync_article_keywords(async_db, [tagged["a"]])
+    await async_db.commit()
+    assert db.query(ArticleKeyword).filter_by(article_id=tagged["a"]).count() == 0
+
+
+@pytest.mark.asyncio
+async def test_processor_indexes_keywords_on_completion(db, mock_llm, monkeypatch):
+    monkeypatch.setattr(processor_module, "AsyncSessionLocal", TestingAsyncSessionLocal)
+    feed = Feed(url="https://tags.example/proc", title="Proc", category="Web")
+    db.add(feed)
+    db.flush()
+    article = Article(content_hash="tag-proc", url="https://tags.example/proc/1", title="Proc",
+                      body=ArticleBody(text="body"), feed_id=feed.id)
+    db.add(article)
+    db.flush()
+    summary = Summary(article_id=article.id, status="pending")
+    db.add(summary)
+    db.commit()
+
+    service = ClaudeService(api_key="test-key", base_url=mock_llm.url)
+    assert await AIProcessor(ai_service=service)._generate_summary(summary.id)
+
+    rows = db.query(ArticleKeyword).filter_by(article_id=article.id).all()
+    assert sorted(r.keyword for r in rows) == sorted(["模拟", "压测", "摘要"])
+    assert all(r.feed_id == feed.id and r.published_at == article.created_at for r in rows)
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import Article, Feed, Summary
+from app.utils.cursor import ArticleCursor, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def listing(db):
+    feeds = [Feed(url=f"https://pages.example/{i}", title=f"Feed {i}") for i in range(2)]
+    db.add_all(feeds)
+    db.flush()
+    now = datetime.utcnow()
+    for i in range(23):
+        # Mixed summary states, a few undated articles, and two articles sharing a timestamp
+        published_at = None if i % 7 == 3 else now - timedelta(hours=i if i != 12 else 11)
+        article = Article(content_hash=f"page-{i}", url=f"https://pages.example/a/{i}", title=f"A{i}",
+                          published_at=published_at, feed_id=feeds[i % 2].id)
+        db.add(article)
+        db.flush()
+        if i % 5 != 4:
+            db.add(Summary(article_id=article.id, status="completed" if i % 3 else "pending"))
+    db.commit()
+    return feeds
+
+
+def _expected_order(db, feed_id=None):
+    """List order spelled out in Python: completed first, newest, undated last, id breaks ties"""
+    rows = []
+    for article in db.query(Article):
+        if feed_id and article.feed_id != feed_id:
+            continue
+        summary = db.query(Summary).filter_by(article_id=article.id).first()
+        has_summary = 0 if summary and summary.status == "completed" else 1
+        dated = article.published_at is not None
+        rows.append(((has_summary, not dated, -(article.published_at.timestamp() if dated else 0), -article.id),
+                     article.id))
+    return [article_id for _, article_id in sorted(rows)]
+
+
+async def _walk(client, page_size, total, **params):
+    ids, cursor, pages = [], "", 0
+    while cursor is not None:
+        body = (await client.get("/api/articles/", params={**params, "cursor": cursor,
+                                                           "page_size": page_size})).json()
+        assert body["total"] == total
+        assert body["has_next"] == (body["next_cursor"] is not None)
+        ids += [item["id"] for item in body["items"]]
+        cursor = body["next_cursor"]
+        pages += 1
+    return ids, pages
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page_size", [1, 4, 23, 50])
+async def test_cursor_walk_visits_every_article_once_in_list_order(client, db, listing, page_size):
+    ids, pages = await _walk(client, page_size, 23)
+    assert ids == _expected_order(db)
+    assert pages == max(1, -(-23 // page_size))
+
+
+@pytest.mark.asyncio
+async def test_cursor_walk_respects_filters(client, db, listing):
+    expected = _expected_order(db, feed_id=listing[1].id)
+    ids, _ = await _walk(client, 3, len(expected), feed_id=listing[1].id)
+    assert ids == expected
+
+
+@pytest.mark.asyncio
+async def test_offset_mode_still_reports_total(client, listing):
+    body = (await client.get("/api/articles/", params={"page": 2, "page_size": 10})).json()
+    assert body["total"] == 23 and body["has_next"] is True
+    assert body["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_invalid_cursor_is_rejected(client):
+    for token in ["not-a-cursor", encode_cursor(ArticleCursor(0, None, 1))[:-3] + "!!!"]:
+        assert (await client.get("/api/articles/", params={"cursor": token})).status_code == 400
+
+
+def test_cursor_round_trip():
+    cursor = ArticleCursor(1, datetime(2026, 10, 19, 8, 30, 0, 123456), 42)
+    assert decode_cursor(encode_cursor(cursor)) == cursor
+    assert decode_cursor(encode_cursor(ArticleCursor(0, None, 7))) == ArticleCursor(0, None, 7)
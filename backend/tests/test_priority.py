@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.models import Article, ArticleBody, Feed, Summary
+from app.tasks.priority import FIRST_PAGE_SIZE, compute_priority, first_page_article_ids
+from app.tasks.processor import AIProcessor
+from tests.conftest import async_engine
+
+
+def _seed(db, feed, title, published_at, status="pending", priority=None):
+    article = Article(
+        content_hash=f"priority-{title}",
+        url=f"https://priority.example/{title}",
+        title=title,
+        body=ArticleBody(text="content"),
+        published_at=published_at,
+        feed_id=feed.id,
+    )
+    db.add(article)
+    db.flush()
+    if priority is None:
+        priority = compute_priority(published_at, category=feed.category, source_type=feed.source_type)
+    db.add(Summary(article_id=article.id, status=status, priority=priority))
+    return article
+
+
+def test_fresh_articles_outrank_old_backlog():
+    now = datetime.utcnow()
+    fresh = compute_priority(now - timedelta(hours=1))
+    stale = compute_priority(now - timedelta(days=365), category="AI/ML", source_type="Company Tech Blog")
+    assert fresh > stale
+
+
+def test_category_bonus_accepts_legacy_chinese_labels():
+    published = datetime.utcnow() - timedelta(days=2)
+    assert compute_priority(published, category="安全") == compute_priority(published, category="Security")
+    assert compute_priority(published, category="Security") > compute_priority(published)
+
+
+def test_future_dates_are_clamped():
+    future = datetime.utcnow() + timedelta(days=30)
+    assert compute_priority(future) <= compute_priority(datetime.utcnow()) + 1e-3
+
+
+@pytest.mark.asyncio
+async def test_next_batch_drains_highest_priority_first(db, async_db):
+    feed = Feed(url="https://priority.example/rss", title="Priority", is_active=True)
+    db.add(feed)
+    db.flush()
+
+    now = datetime.utcnow()
+    # Fill the first page with completed articles so none of the pending ones are boosted
+    for i in range(FIRST_PAGE_SIZE):
+        _seed(db, feed, f"done-{i}", now, status="completed")
+    old = _seed(db, feed, "old", now - timedelta(days=400))
+    new = _seed(db, feed, "new", now - timedelta(hours=2))
+    db.commit()
+
+    batch = await AIProcessor()._next_batch(async_db, limit=2)
+    assert [s.article_id for s in batch] == [new.id, old.id]
+
+
+@pytest.mark.asyncio
+async def test_next_batch_boosts_first_page_articles(db, async_db):
+    feed = Feed(url="https://boost.example/rss", title="Boost", category="Security", is_active=True)
+    db.add(feed)
+    db.flush()
+
+    visible = _seed(db, feed, "visible", datetime.utcnow() - timedelta(days=30), priority=0.0)
+    db.commit()
+
+    batch = await AIProcessor()._next_batch(async_db, limit=1)
+    assert batch[0].article_id == visible.id
+    assert batch[0].priority > compute_priority(datetime.utcnow())
+
+
+@pytest.mark.asyncio
+async def test_first_pages_of_every_category(db, async_db):
+    busy = Feed(url="https://busy.example/rss", title="Busy", category="Web", is_active=True)
+    quiet = Feed(url="https://quiet.example/rss", title="Quiet", category="Science", is_active=True)
+    db.add_all([busy, quiet])
+    db.flush()
+    now = datetime.utcnow()
+    for i in range(FIRST_PAGE_SIZE):
+        _seed(db, busy, f"done-{i}", now, status="completed")
+    buried = _seed(db, busy, "buried", now - timedelta(days=1))
+    # Off the unfiltered first page, but on Science's
+    science = _seed(db, quiet, "science", now - timedelta(days=2))
+    db.commit()
+
+    assert await first_page_article_ids(async_db) == {science.id}
+    assert buried.id not in await first_page_article_ids(async_db)
+
+
+@pytest.mark.asyncio
+async def test_first_page_reads_stop_after_a_page(db, async_db):
+    feed = Feed(url="https://bounded.example/rss", title="Bounded", category="Web", is_active=True)
+    db.add(feed)
+    db.flush()
+    first = _seed(db, feed, "first", datetime.utcnow(), priority=0.0)
+    db.commit()
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(async_engine.sync_engine, "before_cursor_execute", record)
+    try:
+        assert await first_page_article_ids(async_db) == {first.id}
+    finally:
+        event.remove(async_engine.sync_engine, "before_cursor_execute", record)
+    # Every article read is a LIMITed walk, never a ranking of the whole join
+    article_reads = [sql for sql in statements if "articles" in sql]
+    assert article_reads and all("LIMIT" in sql for sql in article_reads), article_reads
+    assert not any("row_number" in sql for sql in statements)
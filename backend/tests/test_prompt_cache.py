@@ -0,0 +1,112 @@
+from types import SimpleNamespace
+
+import pytest
+from structlog.testing import capture_logs
+from tenacity import wait_none
+
+from app.services import base as base_module
+from app.services.base import SYSTEM_PROMPT, SummaryParseError
+from app.services.claude import MIN_CACHEABLE_PREFIX_TOKENS, ClaudeService
+
+
+def _service(mock_llm):
+    service = ClaudeService(api_key="test-key", base_url=mock_llm.url)
+    service.retry_wait = wait_none()
+    return service
+
+
+@pytest.mark.asyncio
+async def test_static_prefix_is_cached_and_hits_recorded(mock_llm):
+    requests = []
+    original = mock_llm.handle
+
+    def recording_handle(path, body):
+        requests.append(body)
+        return original(path, body)
+
+    mock_llm.handle = recording_handle
+    service = _service(mock_llm)
+
+    first = await service.summarize("First", "Body one")
+    second = await service.summarize("Second", "Body two")
+
+    system = requests[0]["system"]
+    assert system[0]["text"] == SYSTEM_PROMPT
+    assert system[0]["cache_control"] == {"type": "ephemeral"}
+    # The per-article text only appears in the user message
+    assert "First" in requests[0]["messages"][0]["content"]
+    assert requests[0]["system"] == requests[1]["system"]
+
+    assert first["cache_write_tokens"] > 0 and first["cache_read_tokens"] == 0
+    assert second["cache_read_tokens"] == first["cache_write_tokens"]
+    assert service.stats["cache_read_tokens"] == second["cache_read_tokens"]
+    assert mock_llm.counters.cache_hits == 1
+
+    # Accounting travels with the result so the processor can store it
+    assert second["input_tokens"] > 0 and second["output_tokens"] > 0
+    assert second["attempts"] == 1
+    assert second["latency_ms"] >= 0
+    assert second["cost_usd"] < first["cost_usd"]
+
+
+@pytest.mark.asyncio
+async def test_mock_faults_are_retried_or_repaired(mock_llm):
+    service = _service(mock_llm)
+
+    mock_llm.config.rate_500 = 1.0
+    service.max_attempts = 2
+    with pytest.raises(Exception):
+        await service.summarize("Title", "Body")
+    assert mock_llm.counters.server_errors == 2
+
+    mock_llm.config.rate_500 = 0.0
+    mock_llm.config.malformed_rate = 1.0
+    result = await service.summarize("Title", "Body")
+    assert result["repaired"] is True
+
+    mock_llm.config.malformed_rate = 0.0
+    mock_llm.config.unparseable_rate = 1.0
+    with pytest.raises(SummaryParseError) as excinfo:
+        await service.summarize("Title", "Body")
+    assert excinfo.value.usage["output_tokens"] > 0
+    assert mock_llm.counters.requests == 4
+
+
+def test_cache_usage_is_read_from_the_response():
+    service = ClaudeService(api_key="test-key")
+    tool_use = SimpleNamespace(type="tool_use", input={"summary": "摘要", "one_liner": "推荐", "keywords": ["a"]})
+    cached = SimpleNamespace(content=[tool_use], usage=SimpleNamespace(
+        input_tokens=40, output_tokens=60, cache_read_input_tokens=1500, cache_creation_input_tokens=0,
+    ))
+    uncached = SimpleNamespace(content=[tool_use], usage=SimpleNamespace(input_tokens=1540, output_tokens=60))
+
+    hit = service.result_from_message(cached, attempts=1, latency_ms=5)
+    miss = service.result_from_message(uncached, attempts=1, latency_ms=5)
+    assert hit["cache_read_tokens"] == 1500 and hit["cache_write_tokens"] == 0
+    # Endpoints without caching report no cache fields at all
+    assert miss["cache_read_tokens"] == 0
+    assert hit["cost_usd"] < miss["cost_usd"]
+
+
+def test_shipped_prefixes_are_long_enough_to_cache(monkeypatch):
+    monkeypatch.setattr(ClaudeService, "_prefix_checked", False)
+    with capture_logs() as logs:
+        service = ClaudeService(api_key="test-key")
+
+    assert service.cacheable_prefix_tokens() >= MIN_CACHEABLE_PREFIX_TOKENS
+    assert service.cacheable_prefix_tokens(one_liner_only=True) >= MIN_CACHEABLE_PREFIX_TOKENS
+    assert not [log for log in logs if log["event"] == "prompt_cache_prefix_too_short"]
+
+
+def test_short_prefix_is_reported(monkeypatch):
+    monkeypatch.setattr(ClaudeService, "_prefix_checked", False)
+    monkeypatch.setattr(base_module, "SYSTEM_PROMPT", "请总结这篇文章。")
+    monkeypatch.setattr(base_module, "ONE_LINER_SYSTEM_PROMPT", "请写一句推荐理由。")
+    with capture_logs() as logs:
+        service = ClaudeService(api_key="test-key")
+        ClaudeService(api_key="test-key")
+
+    warnings = [log for log in logs if log["event"] == "prompt_cache_prefix_too_short"]
+    # Warned once per process, for each prompt below Anthropic's minimum
+    assert [w["one_liner_only"] for w in warnings] == [False, True]
+    assert warnings[0]["prefix_tokens"] == service.cacheable_prefix_tokens() < MIN_CACHEABLE_PREFIX_TOKENS
@@ -0,0 +1,264 @@
+"""
+Query-plan regression tests: the hot read paths must stay on their indexes.
+
+Statements are captured as the API / processor actually issue them and fed
+back through EXPLAIN on the same connection. SQLite always runs; PostgreSQL
+runs when TEST_POSTGRES_URL points at a scratch database.
+"""
+import os
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.core import fts
+from app.core.cache import data_changed
+from app.core.db import Base, async_database_url, get_db
+from app.main import app
+from app.models import Article, ArticleKeyword, Feed, Summary
+from app.services.hot_window import HotWindow, hot_window
+from app.services.keywords import keyword_rows
+from app.tasks.priority import first_page_article_ids
+from app.tasks.processor import AIProcessor
+from app.utils.cursor import ArticleCursor, encode_cursor
+
+POSTGRES_URL = os.environ.get("TEST_POSTGRES_URL")
+
+BACKENDS = [
+    pytest.param("sqlite+aiosqlite:///./test_plans.db", id="sqlite"),
+    pytest.param(
+        async_database_url(POSTGRES_URL or "postgresql://"),
+        id="postgresql",
+        marks=pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL not set"),
+    ),
+]
+
+CATEGORIES = ["Security", "AI/ML", "Engineering", "Web"]
+
+
+@pytest_asyncio.fixture(params=BACKENDS)
+async def plan_engine(request):
+    engine = create_async_engine(request.param, poolclass=NullPool)
+    if engine.dialect.name == "sqlite":
+        fts.register_sqlite_functions(engine.sync_engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessions() as db:
+        now = datetime.utcnow()
+        feeds = [
+            Feed(url=f"https://plans.example/{i}", title=f"Feed {i}", category=CATEGORIES[i % len(CATEGORIES)])
+            for i in range(40)
+        ]
+        db.add_all(feeds)
+        await db.flush()
+        articles = [
+            Article(
+                content_hash=f"plan-{i}",
+                url=f"https://plans.example/a/{i}",
+                title=f"Article {i}",
+                published_at=now - timedelta(hours=i),
+                feed_id=feeds[i % len(feeds)].id,
+            )
+            for i in range(2000)
+        ]
+        db.add_all(articles)
+        await db.flush()
+        # A realistic queue: mostly completed history, a small pending tail
+        db.add_all(
+            Summary(article_id=a.id, status="pending" if i % 20 == 0 else "completed", priority=float(i))
+            for i, a in enumerate(articles)
+        )
+        db.add_all(
+            ArticleKeyword(**row)
+            for a in articles
+            for row in keyword_rows(a.id, a.feed_id, a.published_at, None, [f"topic-{a.id}", "news"])
+        )
+        await db.commit()
+
+    async with engine.begin() as conn:
+        await conn.execute(text("ANALYZE"))
+
+    yield engine, sessions
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+    if engine.dialect.name == "sqlite":
+        os.remove("./test_plans.db")
+
+
+class StatementRecorder:
+    """Collects (sql, params) for every statement the engine runs"""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.statements = []
+
+    def _record(self, conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            self.statements.append((statement, parameters))
+
+    def __enter__(self):
+        event.listen(self.engine.sync_engine, "before_cursor_execute", self._record)
+        return self
+
+    def __exit__(self, *exc):
+        event.remove(self.engine.sync_engine, "before_cursor_execute", self._record)
+
+    async def plans(self) -> list[str]:
+        plans = []
+        async with self.engine.connect() as conn:
+            if self.engine.dialect.name == "sqlite":
+                prefix = "EXPLAIN QUERY PLAN "
+            else:
+                # Tiny test tables would otherwise always be seq-scanned
+                await conn.execute(text("SET enable_seqscan = off"))
+                prefix = "EXPLAIN "
+            for statement, parameters in self.statements:
+                rows = await conn.exec_driver_sql(prefix + statement, parameters)
+                plans.append("\n".join(str(row[-1]) for row in rows))
+        return plans
+
+
+async def _api_statements(plan_engine, path: str) -> StatementRecorder:
+    engine, sessions = plan_engine
+
+    async def override_get_db():
+        async with sessions() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    # A cached response would issue no statements at all, and the plans
+    # wanted are the SQL paths, not the in-memory hot window in front of them
+    data_changed()
+    hours, hot_window.hours = hot_window.hours, 0
+    try:
+        with StatementRecorder(engine) as recorder:
+            async with AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver") as client:
+                response = await client.get(path)
+                assert response.status_code == 200
+    finally:
+        app.dependency_overrides.clear()
+        hot_window.hours = hours
+    return recorder
+
+
+async def _api_plans(plan_engine, path: str) -> list[str]:
+    return await (await _api_statements(plan_engine, path)).plans()
+
+
+def _uses(plans: list[str], index: str) -> bool:
+    return any(index in plan for plan in plans)
+
+
+@pytest.mark.asyncio
+async def test_list_articles_by_feed_uses_feed_published_index(plan_engine):
+    plans = await _api_plans(plan_engine, "/api/articles/?feed_id=3")
+    assert _uses(plans, "ix_articles_feed_id_published_at"), plans
+
+
+@pytest.mark.asyncio
+async def test_list_articles_by_category_uses_category_index(plan_engine):
+    plans = await _api_plans(plan_engine, "/api/articles/?category=Security")
+    assert _uses(plans, "ix_feeds_category"), plans
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("path", ["/api/articles/?category=Security", "/api/articles/latest"])
+async def test_list_queries_select_only_list_columns(plan_engine, path):
+    recorder = await _api_statements(plan_engine, path)
+    listing = [sql for sql, _ in recorder.statements if "ORDER BY" in sql]
+    assert listing
+    for sql in listing:
+        select_list = sql.split("FROM", 1)[0]
+        assert "articles.title" in select_list
+        for unused in ("content_hash", "author", "language", "summaries.status"):
+            assert unused not in select_list, sql
+
+
+@pytest.mark.asyncio
+async def test_latest_articles_range_scans_published_at(plan_engine):
+    plans = await _api_plans(plan_engine, "/api/articles/latest")
+    assert _uses(plans, "ix_articles_published_at"), plans
+
+
+@pytest.mark.asyncio
+async def test_hot_window_refresh_range_scans_published_at(plan_engine):
+    engine, sessions = plan_engine
+    window = HotWindow(hours=48, rebuild_minutes=30)
+    with StatementRecorder(engine) as recorder:
+        async with sessions() as db:
+            await window.refresh(db)
+    assert window.records
+    window_reads = [(sql, params) for sql, params in recorder.statements if "published_at >=" in sql]
+    recorder.statements = window_reads
+    assert window_reads
+    plans = await recorder.plans()
+    assert all(_uses([plan], "ix_articles_published_at") for plan in plans), plans
+
+
+@pytest.mark.asyncio
+async def test_deep_cursor_page_seeks_published_at_index(plan_engine):
+    engine, sessions = plan_engine
+    async with sessions() as db:
+        # A position far down the list, as the 60th page would reach
+        row = (await db.execute(text(
+            "SELECT published_at, id FROM articles ORDER BY published_at DESC, id DESC LIMIT 1 OFFSET 1200"
+        ))).one()
+    published_at = row[0] if isinstance(row[0], datetime) else datetime.fromisoformat(row[0])
+    cursor = encode_cursor(ArticleCursor(0, published_at, row[1]))
+    plans = await _api_plans(plan_engine, f"/api/articles/?cursor={cursor}")
+    # The unfiltered total comes from stats_counters; every page query seeks
+    page_plans = [plan for plan in plans if "stats_counters" not in plan]
+    assert page_plans and all("ix_articles_published_at_id" in plan for plan in page_plans), plans
+
+
+@pytest.mark.asyncio
+async def test_stats_is_one_counters_read(plan_engine):
+    plans = await _api_plans(plan_engine, "/api/stats/")
+    # Besides the HTTP cache's generation lookup, one statement reads both counter tables
+    assert sum("article_hourly_counts" in plan and "stats_counters" in plan for plan in plans) == 1, plans
+    assert not any(name in plan for plan in plans for name in ("summaries", "articles ", "feeds")), plans
+
+
+@pytest.mark.asyncio
+async def test_tag_filter_seeks_keyword_index(plan_engine):
+    plans = await _api_plans(plan_engine, "/api/articles/?tag=topic-7")
+    assert _uses(plans, "ix_article_keywords_keyword_published_at"), plans
+
+
+@pytest.mark.asyncio
+async def test_keyword_facets_range_scan_covering_index(plan_engine):
+    plans = await _api_plans(plan_engine, "/api/articles/keywords?hours=48")
+    assert _uses(plans, "ix_article_keywords_published_at_feed_id_keyword"), plans
+
+
+@pytest.mark.asyncio
+async def test_pending_queue_uses_partial_index(plan_engine):
+    engine, sessions = plan_engine
+    async with sessions() as db:
+        with StatementRecorder(engine) as recorder:
+            batch = await AIProcessor()._next_batch(db)
+    assert batch and all(s.status == "pending" for s in batch)
+
+    plans = await recorder.plans()
+    assert _uses(plans, "ix_summaries_pending_priority"), plans
+
+
+@pytest.mark.asyncio
+async def test_first_page_boost_never_scans_the_join(plan_engine):
+    engine, sessions = plan_engine
+    async with sessions() as db:
+        with StatementRecorder(engine) as recorder:
+            await first_page_article_ids(db)
+    plans = await recorder.plans()
+    # Every read seeks and stops after a page; nothing walks all articles or summaries
+    full_scans = ("SCAN articles", "SCAN summaries", "Seq Scan on articles", "Seq Scan on summaries")
+    assert plans and not any(scan in plan for plan in plans for scan in full_scans), plans
@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app.models import (
+    Article, ArticleBody, ArticleKeyword, ArchivedArticle, ArchivedSummary, Feed, Summary,
+)
+from app.tasks import retention as retention_module
+from app.tasks.fetcher import RSSFetcher
+from app.tasks.retention import Archiver
+from app.utils.url import content_hash
+from tests.conftest import TestingAsyncSessionLocal
+
+
+@pytest.fixture
+def history(db, monkeypatch):
+    monkeypatch.setattr(retention_module, "AsyncSessionLocal", TestingAsyncSessionLocal)
+    now = datetime.utcnow()
+    feeds = [Feed(url=f"https://retention.example/{i}", title=f"Feed {i}") for i in range(2)]
+    db.add_all(feeds)
+    db.flush()
+    ids = {}
+    # (name, feed, age in days, summary status)
+    for name, feed, age, status in [
+        ("ancient", feeds[0], 90, "completed"),
+        ("old", feeds[0], 45, "completed"),
+        ("in-batch", feeds[0], 60, "batched"),
+        ("recent-1", feeds[0], 2, "completed"),
+        ("recent-2", feeds[1], 1, "pending"),
+        ("newest", feeds[1], 100, "pending"),  # Highest id: never archived
+    ]:
+        url = f"https://retention.example/{name}"
+        article = Article(content_hash=content_hash(url, name), url=url, title=name,
+                          published_at=now - timedelta(days=age), feed_id=feed.id,
+                          body=ArticleBody(text=f"{name} body text"))
+        db.add(article)
+        db.flush()
+        db.add(Summary(article_id=article.id, status=status, summary_cn=f"{name} 摘要", keywords=[name]))
+        db.add(ArticleKeyword(article_id=article.id, keyword=name, feed_id=feed.id,
+                              published_at=article.published_at))
+        ids[name] = article.id
+    db.commit()
+    return ids
+
+
+def _live(db):
+    db.expire_all()
+    return {a.title for a in db.query(Article)}
+
+
+@pytest.mark.asyncio
+async def test_age_policy_moves_rows_to_archive(db, history):
+    result = await Archiver(days=30).run()
+    assert result["archived"] == 2
+    assert _live(db) == {"in-batch", "recent-1", "recent-2", "newest"}
+
+    archived = db.get(ArchivedArticle, history["old"])
+    assert archived.title == "old" and archived.body_codec
+    assert db.query(ArchivedSummary).filter_by(article_id=history["old"]).one().summary_cn == "old 摘要"
+    for model in (Summary, ArticleBody, ArticleKeyword):
+        assert db.query(model).filter_by(article_id=history["old"]).count() == 0
+
+    # Nothing left to do on a second run
+    assert (await Archiver(days=30).run())["archived"] == 0
+
+
+@pytest.mark.asyncio
+async def test_per_feed_cap_keeps_newest(db, history):
+    await Archiver(max_per_feed=1).run()
+    # feed 0 keeps only recent-1 (in-batch waits for its batch); feed 1 keeps newest by date
+    assert _live(db) == {"in-batch", "recent-1", "recent-2", "newest"}
+    assert db.get(ArchivedArticle, history["ancient"]) is not None
+
+
+@pytest.mark.asyncio
+async def test_archived_articles_stay_reachable_by_id(client, db, history):
+    await Archiver(days=30).run()
+
+    detail = (await client.get(f"/api/articles/{history['old']}")).json()
+    assert detail["archived"] is True
+    assert detail["content"] == "old body text"
+    assert detail["summary_cn"] == "old 摘要" and detail["keywords"] == ["old"]
+
+    listed = (await client.get("/api/articles/")).json()
+    assert history["old"] not in {item["id"] for item in listed["items"]}
+    assert (await client.get("/api/articles/search", params={"q": "ancient"})).json()["total"] == 0
+
+    assert (await client.get(f"/api/articles/{history['newest']}")).json()["archived"] is False
+    assert (await client.get("/api/articles/999999")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_fetcher_does_not_reingest_archived_entries(db, async_db, history):
+    await Archiver(days=30).run()
+    feed = db.query(Feed).first()
+    entry = {"link": "https://retention.example/old", "title": "old"}
+    assert await RSSFetcher()._process_entry(entry, feed, async_db) is False
+    assert "old" not in _live(db)
+
+
+@pytest.mark.asyncio
+async def test_incremental_vacuum_releases_pages_in_steps(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/vacuum.db", poolclass=NullPool)
+    async with engine.begin() as conn:
+        await conn.execute(text("PRAGMA auto_vacuum = INCREMENTAL"))
+        await conn.execute(text("CREATE TABLE filler (payload BLOB)"))
+        for _ in range(200):
+            await conn.execute(text("INSERT INTO filler VALUES (randomblob(4000))"))
+    async with engine.begin() as conn:
+        await conn.execute(text("DELETE FROM filler"))
+        free = (await conn.execute(text("PRAGMA freelist_count"))).scalar()
+    assert free > 100
+
+    monkeypatch.setattr(retention_module, "AsyncSessionLocal", async_sessionmaker(engine))
+    monkeypatch.setattr(retention_module, "VACUUM_STEP_PAUSE_SECONDS", 0)
+    assert await Archiver(days=1, vacuum_pages=16).vacuum() == free
+
+    async with engine.connect() as conn:
+        assert (await conn.execute(text("PRAGMA freelist_count"))).scalar() == 0
+    await engine.dispose()
@@ -0,0 +1,120 @@
+import pytest
+from sqlalchemy import text
+
+from app.models import Article, ArticleBody, Feed, Summary
+from app.services.search import highlight, parse_terms, to_tsquery_text
+
+
+@pytest.fixture
+def corpus(db):
+    feed = Feed(url="https://search.example/rss", title="Search", category="Engineering")
+    other = Feed(url="https://search.example/sec", title="Sec", category="Security")
+    db.add_all([feed, other])
+    db.flush()
+
+    articles = {
+        "indexing": Article(content_hash="s1", url="https://search.example/1", feed_id=feed.id,
+                            title="Postgres indexing deep dive",
+                            body=ArticleBody(text="We look at B-tree and GIN indexes. <script>alert(1)</script>")),
+        "mention": Article(content_hash="s2", url="https://search.example/2", feed_id=feed.id,
+                           title="Weekly links",
+                           body=ArticleBody(text="A long list of links; one of them covers indexing strategies.")),
+        "rust": Article(content_hash="s3", url="https://search.example/3", feed_id=other.id,
+                        title="Rust async runtimes", body=ArticleBody(text="Tokio internals and scheduling.")),
+    }
+    db.add_all(articles.values())
+    db.flush()
+    db.add_all([
+        Summary(article_id=articles["indexing"].id, status="completed",
+                summary_cn="本文深入介绍了数据库索引的原理，包括B树和倒排索引。",
+                one_liner="数据库索引入门", keywords=["数据库", "索引", "PostgreSQL"]),
+        Summary(article_id=articles["mention"].id, status="pending"),
+        Summary(article_id=articles["rust"].id, status="pending"),
+    ])
+    db.commit()
+    return {name: a.id for name, a in articles.items()}
+
+
+@pytest.mark.asyncio
+async def test_search_ranks_title_matches_first(client, corpus):
+    response = await client.get("/api/articles/search", params={"q": "indexing"})
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["total"] == 2
+    assert [item["id"] for item in payload["items"]] == [corpus["indexing"], corpus["mention"]]
+    assert payload["items"][0]["rank"] > payload["items"][1]["rank"]
+
+
+@pytest.mark.asyncio
+async def test_search_matches_chinese_summary_and_keywords(client, corpus):
+    # Two-character words are below the trigram minimum and take the LIKE path
+    for query in ("索引", "数据库索引", "PostgreSQL"):
+        payload = (await client.get("/api/articles/search", params={"q": query})).json()
+        assert [item["id"] for item in payload["items"]] == [corpus["indexing"]], query
+
+    snippet = (await client.get("/api/articles/search", params={"q": "倒排索引"})).json()["items"][0]["snippet"]
+    assert "<mark>倒排索引</mark>" in snippet
+
+
+@pytest.mark.asyncio
+async def test_snippets_are_html_escaped(client, corpus):
+    item = (await client.get("/api/articles/search", params={"q": "alert"})).json()["items"][0]
+    assert "<script>" not in item["snippet"]
+    assert "&lt;script&gt;" in item["snippet"] and "<mark>alert</mark>" in item["snippet"]
+
+
+@pytest.mark.asyncio
+async def test_index_follows_summary_updates_and_deletes(client, db, corpus):
+    summary = db.query(Summary).filter(Summary.article_id == corpus["rust"]).one()
+    summary.status = "completed"
+    summary.summary_cn = "介绍了异步运行时的调度器实现"
+    db.commit()
+    payload = (await client.get("/api/articles/search", params={"q": "调度器"})).json()
+    assert [item["id"] for item in payload["items"]] == [corpus["rust"]]
+
+    db.delete(summary)
+    db.delete(db.get(Article, corpus["rust"]))
+    db.commit()
+    assert (await client.get("/api/articles/search", params={"q": "Tokio"})).json()["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_index_keeps_no_copy_of_bodies(client, db, corpus):
+    if db.get_bind().dialect.name != "sqlite":
+        pytest.skip("SQLite FTS5 index")
+    # External content: no shadow table holding the text
+    assert db.execute(text("SELECT name FROM sqlite_master WHERE name = 'articles_fts_content'")).first() is None
+
+    db.get(ArticleBody, corpus["mention"]).text = "Rewritten: nothing about the old topic left."
+    db.commit()
+    assert (await client.get("/api/articles/search", params={"q": "strategies"})).json()["total"] == 0
+    item = (await client.get("/api/articles/search", params={"q": "Rewritten"})).json()["items"][0]
+    assert item["id"] == corpus["mention"] and "<mark>Rewritten</mark>" in item["snippet"]
+
+    # Every delete handed FTS5 the values the row was indexed with
+    db.execute(text("INSERT INTO articles_fts(articles_fts, rank) VALUES ('integrity-check', 1)"))
+
+
+@pytest.mark.asyncio
+async def test_search_filters_and_list_keyword(client, corpus):
+    payload = (await client.get("/api/articles/search", params={"q": "async", "category": "Engineering"})).json()
+    assert payload["total"] == 0
+
+    # The list endpoint's keyword filter uses the same index, not a title LIKE
+    listed = (await client.get("/api/articles/", params={"keyword": "倒排"})).json()
+    assert [item["id"] for item in listed["items"]] == [corpus["indexing"]]
+
+
+def test_query_parsing_and_postgres_tsquery():
+    assert parse_terms('rust "async runtime"  调度') == ["rust", "async runtime", "调度"]
+    assert to_tsquery_text(["async runtime", "数据库", "B-tree"]) == (
+        "(async <-> runtime) & (数 <-> 据 <-> 库) & (B <-> tree)"
+    )
+    assert to_tsquery_text(["!!"]) == ""
+
+
+def test_highlight_window():
+    text = "前言。" * 40 + "这里讨论倒排索引。"
+    snippet = highlight(text, ["倒排索引"], width=20)
+    assert snippet.startswith("…") and "<mark>倒排索引</mark>" in snippet
+    assert highlight("nothing here", ["missing"]) is None
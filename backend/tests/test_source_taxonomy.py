@@ -1,6 +1,6 @@
 import pytest
 
-from app.models import Article, Feed, Summary
+from app.models import Article, ArticleBody, Feed, Summary
 
 
 @pytest.mark.asyncio
@@ -20,7 +20,7 @@ async def test_article_detail_includes_source_type(client, db):
         content_hash="source-type-hash-1",
         url="https://source-type.example/post-1",
         title="Post 1",
-        content="hello",
+        body=ArticleBody(text="hello"),
         feed_id=feed.id,
     )
     db.add(article)
@@ -92,14 +92,14 @@ async def test_articles_filter_by_source_domain_category(client, db):
                 content_hash="security-hash-1",
                 url="https://security-source.example/post-1",
                 title="Security Post",
-                content="security content",
+                body=ArticleBody(text="security content"),
                 feed_id=security_feed.id,
             ),
             Article(
                 content_hash="ai-hash-1",
                 url="https://ai-source.example/post-1",
                 title="AI Post",
-                content="ai content",
+                body=ArticleBody(text="ai content"),
                 feed_id=ai_feed.id,
             ),
         ]
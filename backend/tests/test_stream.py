@@ -0,0 +1,138 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.api.articles import stream
+from app.models import Article, Feed, Summary
+from app.services import stream as stream_service
+from app.services.stream import (
+    ArticleEvent, Broadcaster, StreamPosition, current_position, decode_position, encode_position, events_after,
+)
+from tests.conftest import TestingAsyncSessionLocal
+
+
+@pytest.fixture
+def feed(db):
+    feed = Feed(url="https://stream.example/feed", title="Stream Feed", category="Web")
+    db.add(feed)
+    db.commit()
+    return feed
+
+
+def _article(db, feed, i, status=None, processed_at=None):
+    article = Article(content_hash=f"stream-{i}", url=f"https://stream.example/{i}", title=f"Story {i}",
+                      feed_id=feed.id, published_at=datetime.utcnow())
+    db.add(article)
+    db.flush()
+    if status:
+        db.add(Summary(article_id=article.id, status=status, one_liner=f"One liner {i}", keywords=["k"],
+                       processed_at=processed_at))
+    db.commit()
+    return article
+
+
+def test_position_round_trips():
+    position = StreamPosition(42, datetime(2026, 10, 19, 12, 30, 5, 123456), 7)
+    assert decode_position(encode_position(position)) == position
+    assert decode_position(encode_position(StreamPosition(3, None, 0))) == StreamPosition(3, None, 0)
+    with pytest.raises(ValueError):
+        decode_position("not-an-id")
+
+
+@pytest.mark.asyncio
+async def test_events_after_resumes_from_position(db, async_db, feed):
+    now = datetime.utcnow()
+    first = _article(db, feed, 1, "completed", now - timedelta(minutes=2))
+    start = await current_position(async_db)
+
+    second = _article(db, feed, 2)
+    db.add(Summary(article_id=second.id, status="completed", one_liner="Fresh", processed_at=now))
+    db.commit()
+
+    events, position = await events_after(async_db, start, limit=10)
+    assert [(e.kind, e.article_id) for e in events] == [("article", second.id), ("summary", second.id)]
+    assert events[1].data["one_liner"] == "Fresh" and events[1].data["feed_category"] == "Web"
+    assert position == StreamPosition(second.id, now, events[1].summary_id)
+    # Resuming from the article event replays only the summary after it
+    resumed, _ = await events_after(async_db, events[0].position, limit=10)
+    assert [(e.kind, e.article_id) for e in resumed] == [("summary", second.id)]
+    assert first.id not in {e.article_id for e in resumed}
+
+
+async def _next_event(events) -> bytes:
+    while True:
+        chunk = await asyncio.wait_for(events.__anext__(), 5)
+        if chunk.startswith(b"id:"):
+            return chunk
+
+
+@pytest.mark.asyncio
+async def test_one_producer_fans_out_to_every_client(db, feed):
+    broadcaster = Broadcaster(poll_seconds=0.05, client_buffer=16, batch_limit=100,
+                              sessions=TestingAsyncSessionLocal)
+    clients = [broadcaster.events(None, heartbeat_seconds=30) for _ in range(3)]
+    for client in clients:
+        assert (await client.__anext__()).startswith(b"retry:")
+    assert broadcaster.clients == 3
+    # Let the producer take its starting position before anything new lands
+    while broadcaster.position is None:
+        await asyncio.sleep(0.01)
+
+    article = _article(db, feed, 1)
+    broadcaster.notify()
+    received = [await _next_event(client) for client in clients]
+    assert len(set(received)) == 1
+    assert b"event: article" in received[0] and f'"id": {article.id}'.encode() in received[0]
+
+    for client in clients:
+        await client.aclose()
+    assert broadcaster.clients == 0
+
+
+@pytest.mark.asyncio
+async def test_slow_client_is_dropped_and_stream_ends():
+    broadcaster = Broadcaster(poll_seconds=60, client_buffer=2, batch_limit=100, sessions=TestingAsyncSessionLocal)
+    client = broadcaster.events(None, heartbeat_seconds=30)
+    await client.__anext__()
+    events = [ArticleEvent("article", i, {"id": i}, StreamPosition(i, None, 0)) for i in range(1, 5)]
+    broadcaster.publish(events)
+    assert broadcaster.clients == 0
+
+    # What was buffered still arrives, then the stream ends for the browser to resume
+    received = [chunk async for chunk in client if chunk.startswith(b"id:")]
+    assert received == [events[1].encode()]
+
+
+@pytest.mark.asyncio
+async def test_endpoint_replays_after_last_event_id(db, feed, monkeypatch):
+    monkeypatch.setattr(stream_service.broadcaster, "sessions", TestingAsyncSessionLocal)
+    first = _article(db, feed, 1)
+    second = _article(db, feed, 2)
+
+    response = await stream(last_event_id=encode_position(StreamPosition(first.id, None, 0)))
+    assert response.media_type == "text/event-stream"
+    body = response.body_iterator
+    try:
+        replayed = await _next_event(body)
+    finally:
+        await body.aclose()
+    assert replayed.startswith(f"id: {second.id}.0.0\n".encode())
+
+
+@pytest.mark.asyncio
+async def test_reconnect_misses_nothing_landing_after_the_replay(db, feed):
+    broadcaster = Broadcaster(poll_seconds=60, client_buffer=16, batch_limit=100, sessions=TestingAsyncSessionLocal)
+    first = _article(db, feed, 1)
+    second = _article(db, feed, 2)
+
+    client = broadcaster.events(StreamPosition(first.id, None, 0), heartbeat_seconds=30)
+    assert (await client.__anext__()).startswith(b"retry:")  # replay read, producer not yet polled
+    third = _article(db, feed, 3)
+    try:
+        received = [await _next_event(client) for _ in range(2)]
+    finally:
+        await client.aclose()
+    assert [chunk.split(b"\n", 1)[0] for chunk in received] == [
+        f"id: {second.id}.0.0".encode(), f"id: {third.id}.0.0".encode(),
+    ]
@@ -0,0 +1,108 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.cache import get_cache
+from app.models import Article, Feed, StatsCounters, Summary
+from app.services import totals
+from app.services.totals import Total, TotalsCache
+
+
+@pytest.fixture
+def counted(db, monkeypatch):
+    """Feeds with articles, plus a tally of the COUNT queries the totals service runs"""
+    totals.cache.clear()
+    calls = []
+    real_count = totals._count
+
+    async def spy(session, query):
+        calls.append(query)
+        return await real_count(session, query)
+
+    monkeypatch.setattr(totals, "_count", spy)
+    # Exercise the totals cache itself, not the response cache in front of it
+    monkeypatch.setattr(get_cache("articles"), "ttl", 0)
+    feeds = [Feed(url=f"https://totals.example/{i}", title=f"Feed {i}", category="Web") for i in range(2)]
+    db.add_all(feeds)
+    db.flush()
+    now = datetime.utcnow()
+    for i in range(12):
+        db.add(Article(content_hash=f"total-{i}", url=f"https://totals.example/a/{i}", title=f"T{i}",
+                       published_at=now - timedelta(hours=i), feed_id=feeds[0].id if i < 9 else feeds[1].id))
+    db.commit()
+    yield feeds, calls
+    totals.cache.clear()
+
+
+async def _list(client, **params):
+    response = await client.get("/api/articles/", params=params)
+    assert response.status_code == 200
+    return response.json()
+
+
+@pytest.mark.asyncio
+async def test_filtered_total_is_cached_until_next_ingest(client, db, counted):
+    feeds, calls = counted
+    assert (await _list(client, feed_id=feeds[0].id))["total"] == 9
+    assert (await _list(client, feed_id=feeds[0].id, page=2, page_size=5))["total"] == 9
+    assert len(calls) == 1
+
+    db.add(Article(content_hash="total-new", url="https://totals.example/new", title="new",
+                   feed_id=feeds[0].id))
+    db.commit()
+    assert (await _list(client, feed_id=feeds[0].id))["total"] == 10
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_status_change_invalidates_cached_totals(client, db, counted):
+    feeds, calls = counted
+    await _list(client, category="Web")
+    generation = db.get(StatsCounters, 1).ingest_generation
+
+    article = db.query(Article).first()
+    db.add(Summary(article_id=article.id, status="pending"))
+    db.commit()
+    db.query(Summary).update({"status": "completed"})
+    db.commit()
+    db.expire_all()
+    assert db.get(StatsCounters, 1).ingest_generation > generation
+
+    await _list(client, category="Web")
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_unfiltered_total_reads_counters(client, counted):
+    _, calls = counted
+    body = await _list(client)
+    assert body["total"] == 12 and body["total_approximate"] is False
+    assert calls == []
+
+
+@pytest.mark.asyncio
+async def test_large_totals_are_estimated_and_flagged(client, counted, monkeypatch):
+    feeds, _ = counted
+    monkeypatch.setattr(totals.settings, "articles_total_exact_limit", 5)
+
+    body = await _list(client, feed_id=feeds[0].id, page_size=5)
+    assert body["total_approximate"] is True
+    assert body["total"] > 5
+    assert body["has_next"] is True
+    # has_next comes from the rows themselves, not the estimate
+    assert (await _list(client, feed_id=feeds[0].id, page=2, page_size=5))["has_next"] is False
+
+    small = await _list(client, feed_id=feeds[1].id)
+    assert small["total"] == 3 and small["total_approximate"] is False
+
+
+def test_totals_cache_evicts_least_recently_used():
+    cache = TotalsCache(max_entries=2)
+    cache.put("a", 1, Total(1, False))
+    cache.put("b", 1, Total(2, False))
+    assert cache.get("a", 1) == Total(1, False)
+    cache.put("c", 1, Total(3, False))
+    assert cache.get("b", 1) is None
+    assert cache.get("a", 1) is not None and cache.get("c", 1) is not None
+    # A newer generation misses and drops the entry
+    assert cache.get("a", 2) is None and cache.get("a", 1) is None
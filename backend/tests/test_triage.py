@@ -0,0 +1,136 @@
+from datetime import datetime
+
+import pytest
+from tenacity import wait_none
+
+from app.models import Article, ArticleBody, Feed, Summary
+from app.services.claude import ClaudeService
+from app.tasks.fetcher import RSSFetcher
+from app.tasks.triage import (
+    ROUTE_ONE_LINER,
+    ROUTE_SKIPPED,
+    ROUTE_SUMMARIZE,
+    is_link_only,
+    triage_entry,
+)
+from app.utils.language import detect_language
+
+LONG_EN = "Database indexes trade write amplification for read latency. " * 20
+LONG_ZH = "本文介绍了数据库索引的设计原则以及在高并发场景下的性能取舍。" * 10
+
+
+@pytest.fixture
+def feed(db):
+    feed = Feed(url="https://triage.example/rss", title="Triage", category="Engineering", is_active=True)
+    db.add(feed)
+    db.flush()
+    return feed
+
+
+def test_detect_language():
+    assert detect_language(LONG_EN) == "en"
+    assert detect_language(LONG_ZH) == "zh"
+    assert detect_language("Kubernetes 调度器的工作原理与源码分析") == "zh"
+    assert detect_language("") == "unknown"
+
+
+def test_is_link_only():
+    assert is_link_only("", "https://news.example/item?id=1 Comments")
+    html = '<p><a href="https://x.example/post">Read the full post on x.example</a></p>'
+    assert is_link_only(html, "Read the full post on x.example")
+    assert not is_link_only("<p>" + LONG_EN + "</p>", LONG_EN)
+
+
+@pytest.mark.parametrize("title, text, route, reason", [
+    ("Indexes", LONG_EN, ROUTE_SUMMARIZE, None),
+    ("数据库索引", LONG_ZH, ROUTE_ONE_LINER, "already_chinese"),
+    ("Release notes", "Version 2.1 fixes a crash when parsing empty feeds. " * 3, ROUTE_ONE_LINER, "short"),
+    ("Nothing here", "See title.", ROUTE_SKIPPED, "empty"),
+    ("Show HN", "Article URL: https://a.example Comments URL: https://b.example", ROUTE_SKIPPED, "link_only"),
+])
+@pytest.mark.asyncio
+async def test_triage_routes(db, async_db, feed, title, text, route, reason):
+    db.commit()
+    decision = await triage_entry(async_db, f"https://triage.example/{title}", title, feed.id, text, text)
+    assert (decision.route, decision.reason) == (route, reason)
+
+
+@pytest.mark.asyncio
+async def test_duplicate_url_and_repost_are_skipped(db, async_db, feed):
+    db.add(Article(content_hash="dup", url="https://triage.example/a", title="Original", feed_id=feed.id,
+                   body=ArticleBody(text=LONG_EN)))
+    db.commit()
+
+    same_url = await triage_entry(async_db, "https://triage.example/a", "Retitled", feed.id, LONG_EN, LONG_EN)
+    tracked = await triage_entry(async_db, "https://triage.example/a?utm_source=rss", "Retitled", feed.id, "", "")
+    repost = await triage_entry(async_db, "https://triage.example/a-2", "Original", feed.id, LONG_EN, LONG_EN + "!")
+    assert same_url.route == ROUTE_SKIPPED and same_url.reason.startswith("duplicate")
+    assert tracked.route == ROUTE_SKIPPED and tracked.reason.startswith("duplicate")
+    assert repost.route == ROUTE_SKIPPED and repost.reason.startswith("duplicate")
+
+
+@pytest.mark.asyncio
+async def test_recurring_title_with_new_content_is_not_a_duplicate(db, async_db, feed):
+    db.add(Article(content_hash="weekly-1", url="https://triage.example/weekly/1", title="Weekly Roundup",
+                   feed_id=feed.id, body=ArticleBody(text=LONG_EN)))
+    db.commit()
+
+    text = "Compilers, garbage collectors and a new release of the storage engine. " * 20
+    decision = await triage_entry(async_db, "https://triage.example/weekly/2", "Weekly Roundup", feed.id, text, text)
+    assert (decision.route, decision.reason) == (ROUTE_SUMMARIZE, None)
+
+
+@pytest.mark.asyncio
+async def test_fetcher_stores_triage_on_summary(db, async_db, feed):
+    db.commit()
+    fetcher = RSSFetcher()
+    entries = [
+        {"link": "https://triage.example/long", "title": "Long read", "description": f"<p>{LONG_EN}</p>"},
+        {"link": "https://triage.example/zh", "title": "中文文章", "description": f"<p>{LONG_ZH}</p>"},
+        {"link": "https://triage.example/empty", "title": "Empty", "description": ""},
+    ]
+    for entry in entries:
+        assert await fetcher._process_entry(entry, feed, async_db)
+    await async_db.commit()
+
+    rows = {
+        article.url.rsplit("/", 1)[-1]: (summary.status, summary.triage, article.language)
+        for article, summary in db.query(Article, Summary).join(Summary, Summary.article_id == Article.id)
+    }
+    assert rows["long"] == ("pending", ROUTE_SUMMARIZE, "en")
+    assert rows["zh"] == ("pending", ROUTE_ONE_LINER, "zh")
+    assert rows["empty"] == ("skipped", ROUTE_SKIPPED, "en")
+
+
+@pytest.mark.asyncio
+async def test_fetcher_stores_published_at_as_naive_utc(db, async_db, feed):
+    db.commit()
+    entry = {"link": "https://triage.example/dated", "title": "Dated", "description": f"<p>{LONG_EN}</p>",
+             "published": "Mon, 19 Oct 2026 09:30:00 +0800"}
+    assert await RSSFetcher()._process_entry(entry, feed, async_db)
+    await async_db.commit()
+
+    published_at = db.query(Article).filter_by(url=entry["link"]).one().published_at
+    assert published_at == datetime(2026, 10, 19, 1, 30) and published_at.tzinfo is None
+    assert RSSFetcher()._parse_date("not a date") is None
+
+
+@pytest.mark.asyncio
+async def test_one_liner_path_uses_cheaper_request(mock_llm):
+    requests = []
+    original = mock_llm.handle
+
+    def recording_handle(path, body):
+        requests.append(body)
+        return original(path, body)
+
+    mock_llm.handle = recording_handle
+    service = ClaudeService(api_key="test-key", base_url=mock_llm.url)
+    service.retry_wait = wait_none()
+
+    result = await service.summarize("中文文章", LONG_ZH * 5, one_liner_only=True)
+
+    assert result["summary"] is None
+    assert result["one_liner"] and result["keywords"]
+    assert requests[0]["tool_choice"]["name"] == "record_one_liner"
+    assert requests[0]["max_tokens"] < 1000
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.models import Article, Feed, StatsCounters, Summary
+from app.tasks import budget
+from app.tasks.priority import FIRST_PAGE_SIZE, compute_priority
+from app.tasks.processor import AIProcessor
+
+
+def _seed(db, feed, name, published_at, status="pending", **fields):
+    article = Article(
+        content_hash=f"usage-{name}",
+        url=f"https://usage.example/{name}",
+        title=name,
+        published_at=published_at,
+        feed_id=feed.id,
+    )
+    db.add(article)
+    db.flush()
+    db.add(Summary(
+        article_id=article.id,
+        status=status,
+        priority=compute_priority(published_at),
+        **fields,
+    ))
+    return article
+
+
+@pytest.fixture
+def feed(db):
+    feed = Feed(url="https://usage.example/rss", title="Usage", is_active=True)
+    db.add(feed)
+    db.flush()
+    return feed
+
+
+@pytest.mark.asyncio
+async def test_budget_pauses_backlog_but_not_fresh_work(db, async_db, feed, monkeypatch):
+    monkeypatch.setattr(budget.settings, "ai_daily_token_budget", 1000)
+    now = datetime.utcnow()
+    # Completed rows fill page 1 (so nothing is boosted) and spend the budget
+    for i in range(FIRST_PAGE_SIZE):
+        _seed(db, feed, f"done-{i}", now, status="completed",
+              input_tokens=40, output_tokens=20, processed_at=now)
+    fresh = _seed(db, feed, "fresh", now - timedelta(hours=1))
+    _seed(db, feed, "backlog", now - timedelta(days=200))
+    db.commit()
+
+    batch = await AIProcessor()._next_batch(async_db)
+    assert [s.article_id for s in batch] == [fresh.id]
+
+    monkeypatch.setattr(budget.settings, "ai_daily_token_budget", 0)
+    assert len(await AIProcessor()._next_batch(async_db)) == 2
+
+
+@pytest.mark.asyncio
+async def test_usage_stats_aggregates_processed_summaries(client, db, feed):
+    now = datetime.utcnow()
+    for i, latency in enumerate([100, 200, 900]):
+        _seed(db, feed, f"s{i}", now, status="completed", input_tokens=100, output_tokens=50,
+              cache_read_tokens=10, latency_ms=latency, attempts=1 + (i == 2),
+              cost_usd=0.01, processed_at=now)
+    _seed(db, feed, "old", now, status="completed", input_tokens=999,
+          processed_at=now - timedelta(days=3))
+    db.commit()
+
+    response = await client.get("/api/stats/usage?hours=24")
+    assert response.status_code == 200
+    payload = response.json()
+    assert payload["summaries_processed"] == 3
+    assert payload["input_tokens"] == 300
+    assert payload["output_tokens"] == 150
+    assert payload["estimated_cost_usd"] == pytest.approx(0.03)
+    assert payload["p95_latency_ms"] == 900
+    assert payload["avg_attempts"] == pytest.approx(4 / 3)
+    assert payload["tokens_used_today"] >= 480
+
+
+@pytest.mark.asyncio
+async def test_claims_in_flight_are_not_processed(client, db, async_db, feed):
+    now = datetime.utcnow()
+    _seed(db, feed, "done", now, status="completed", input_tokens=100, processed_at=now)
+    claimed = _seed(db, feed, "claimed", now)
+    db.commit()
+    summary_id = db.query(Summary.id).filter_by(article_id=claimed.id).scalar()
+    generation = db.get(StatsCounters, 1).ingest_generation
+
+    assert await AIProcessor()._claim(async_db, summary_id)
+    db.expire_all()
+    row = db.get(Summary, summary_id)
+    assert row.status == "batched" and row.claimed_at is not None and row.processed_at is None
+    # Bookkeeping only: cached reads and ETags stay valid
+    assert db.get(StatsCounters, 1).ingest_generation == generation
+
+    assert (await client.get("/api/stats/usage?hours=24")).json()["summaries_processed"] == 1
@@ -2,10 +2,12 @@ import { useState } from 'react'
 import { Layout } from './components/Layout'
 import { Sidebar } from './components/Sidebar'
 import { ArticleList } from './components/ArticleList'
+import { useArticleStream } from './hooks/useArticleStream'
 
 function App() {
   const [selectedFeedId, setSelectedFeedId] = useState<number | null>(null)
   const [searchKeyword, setSearchKeyword] = useState('')
+  useArticleStream()
 
   return (
     <Layout onSearch={setSearchKeyword}>
@@ -1,7 +1,7 @@
-import { useQuery } from '@tanstack/react-query'
+import { useQuery, useQueryClient } from '@tanstack/react-query'
 import { articlesApi } from '../lib/api'
 import { ArticleCard } from './ArticleCard'
-import { useState } from 'react'
+import { useEffect, useState } from 'react'
 
 interface ArticleListProps {
   feedId?: number | null
@@ -9,18 +9,37 @@ interface ArticleListProps {
 }
 
 export function ArticleList({ feedId, keyword }: ArticleListProps) {
-  const [page, setPage] = useState(1)
+  // Cursor of every page visited so far; '' starts keyset paging from the top
+  const [cursors, setCursors] = useState<string[]>([''])
+  const page = cursors.length
+  const cursor = cursors[cursors.length - 1]
+
+  useEffect(() => {
+    setCursors([''])
+  }, [feedId, keyword])
 
   const { data, isLoading, error } = useQuery({
-    queryKey: ['articles', page, feedId, keyword],
+    queryKey: ['articles', cursor, feedId, keyword],
     queryFn: () => articlesApi.list({
-      page,
+      cursor,
       page_size: 20,
       feed_id: feedId || undefined,
       keyword: keyword || undefined,
     }).then(res => res.data),
   })
 
+  // Prefetch the page's details in one request so expanding a card is instant
+  const queryClient = useQueryClient()
+  useEffect(() => {
+    const ids = (data?.items ?? []).map(a => a.id).filter(id => !queryClient.getQueryData(['article', id]))
+    if (ids.length === 0) return
+    articlesApi.getBatch(ids).then(res => {
+      res.data.forEach(detail => queryClient.setQueryData(['article', detail.id], detail))
+    }).catch(() => {
+      // Cards still fetch their own detail when expanded
+    })
+  }, [data, queryClient])
+
   if (isLoading) {
     return (
       <div className="p-8">
@@ -72,7 +91,7 @@ export function ArticleList({ feedId, keyword }: ArticleListProps) {
       <div className="px-4 sm:px-6 py-3 flex items-center justify-between">
         <div className="flex items-center gap-2">
           <span className="text-sm font-medium" style={{ color: 'var(--fg-secondary)' }}>
-            共 {data.total} 篇文章
+            共 {data.total_approximate ? '约 ' : ''}{data.total} 篇文章
           </span>
           {keyword && (
             <span className="tag" style={{ background: 'var(--accent-soft)', color: 'var(--accent)' }}>
@@ -95,7 +114,7 @@ export function ArticleList({ feedId, keyword }: ArticleListProps) {
       {/* Pagination */}
       <div className="flex justify-center items-center gap-4 py-8">
         <button
-          onClick={() => setPage(p => Math.max(1, p - 1))}
+          onClick={() => setCursors(c => (c.length > 1 ? c.slice(0, -1) : c))}
           disabled={page === 1}
           className="btn-ghost flex items-center gap-2 disabled:opacity-40 disabled:cursor-not-allowed"
         >
@@ -108,7 +127,7 @@ export function ArticleList({ feedId, keyword }: ArticleListProps) {
         <div className="flex items-center gap-1.5">
           {page > 2 && (
             <button
-              onClick={() => setPage(1)}
+              onClick={() => setCursors([''])}
               className="w-8 h-8 rounded-lg text-sm transition-colors"
               style={{ color: 'var(--fg-tertiary)' }}
             >
@@ -125,7 +144,7 @@ export function ArticleList({ feedId, keyword }: ArticleListProps) {
         </div>
 
         <button
-          onClick={() => setPage(p => (data.has_next ? p + 1 : p))}
+          onClick={() => data.next_cursor && setCursors(c => [...c, data.next_cursor!])}
           disabled={!data.has_next}
           className="btn-ghost flex items-center gap-2 disabled:opacity-40 disabled:cursor-not-allowed"
         >
@@ -0,0 +1,27 @@
+import { useEffect } from 'react'
+import { useQueryClient } from '@tanstack/react-query'
+import { articlesApi } from '../lib/api'
+
+// Refresh article lists when the server reports new articles or summaries,
+// instead of polling. Bursts are folded into one refetch per `delay` ms.
+export function useArticleStream(delay = 1000) {
+  const queryClient = useQueryClient()
+
+  useEffect(() => {
+    const source = new EventSource(articlesApi.streamUrl)
+    let timer: ReturnType<typeof setTimeout> | undefined
+    const refresh = () => {
+      if (timer) return
+      timer = setTimeout(() => {
+        timer = undefined
+        queryClient.invalidateQueries({ queryKey: ['articles'] })
+      }, delay)
+    }
+    source.addEventListener('article', refresh)
+    source.addEventListener('summary', refresh)
+    return () => {
+      source.close()
+      if (timer) clearTimeout(timer)
+    }
+  }, [queryClient, delay])
+}
@@ -1,5 +1,5 @@
 import axios from 'axios'
-import { PaginatedResponse, Article, ArticleDetail, Feed, Stats } from '../types'
+import { PaginatedResponse, Article, ArticleDetail, Feed, Stats, KeywordFacets } from '../types'
 
 const API_BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000/api'
 
@@ -9,14 +9,24 @@ const api = axios.create({
 })
 
 export const articlesApi = {
-  list: (params: { page?: number; page_size?: number; feed_id?: number; category?: string; keyword?: string }) =>
+  list: (params: { page?: number; page_size?: number; feed_id?: number; category?: string; keyword?: string; tag?: string; cursor?: string }) =>
     api.get<PaginatedResponse<Article>>('/articles/', { params }),
 
   getLatest: (limit = 20) =>
     api.get<Article[]>('/articles/latest', { params: { limit } }),
 
+  getKeywords: (params: { hours?: number; category?: string; limit?: number } = {}) =>
+    api.get<KeywordFacets>('/articles/keywords', { params }),
+
   get: (id: number) =>
     api.get<ArticleDetail>(`/articles/${id}`),
+
+  // Many details in one request (at most 100 ids); unknown ids are left out
+  getBatch: (ids: number[]) =>
+    api.get<ArticleDetail[]>('/articles/batch', { params: { ids: ids.join(',') } }),
+
+  // Server-Sent Events: `article` and `summary` events as they land
+  streamUrl: `${API_BASE_URL}/articles/stream`,
 }
 
 export const feedsApi = {
@@ -23,9 +23,23 @@ export interface ArticleDetail extends Article {
 export interface PaginatedResponse<T> {
   items: T[]
   total: number
+  total_approximate?: boolean  // total is an estimate for very large filtered lists
   page: number
   page_size: number
   has_next: boolean
+  next_cursor?: string | null
+}
+
+export interface KeywordFacet {
+  keyword: string
+  count: number
+  categories: Record<string, number>
+}
+
+export interface KeywordFacets {
+  window_hours: number
+  category: string | null
+  items: KeywordFacet[]
 }
 
 export interface Feed {
@@ -48,6 +62,7 @@ export interface Stats {
   summaries_pending: number
   summaries_failed: number
   summaries_completed: number
+  summaries_skipped: number
   last_fetch_at: string | null
   completion_rate: number
 }